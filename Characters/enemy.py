@@ -1,20 +1,25 @@
 import pygame
-import os
 import math
 import sys
 import random
-from asset_manager import get_asset_path
+import sprite_cache
+import profiler
+import counters
 
 
 class Enemy:
     image_path = None
     speed = 120
     max_health = 30
+    # Wobble angle quantization in degrees (None uses sprite_cache.ROTATION_STEP)
+    tilt_step = None
 
     def __init__(self, pos):
         self.pos = pygame.Vector2(pos)
         self._image = None
         self._mask = None
+        self._rotations = None
+        self._collision_radius = None
         self._image_loaded = False
         self.dead = False
         self.health = self.max_health
@@ -29,21 +34,12 @@ class Enemy:
     def _load_image(self):
         if self._image_loaded:
             return
-        if self.image_path:
-            try:
-                load_path = self.image_path
-                if (not os.path.isabs(load_path)) and (not os.path.exists(load_path)):
-                    load_path = get_asset_path(os.path.basename(load_path))
-                img = pygame.image.load(load_path).convert_alpha()
-            except Exception:
-                img = None
-        else:
-            img = None
+        img, mask = sprite_cache.get_sprite(self.image_path)
         if img is None:
-            img = pygame.Surface((32, 32), pygame.SRCALPHA)
-            pygame.draw.circle(img, (255, 0, 0), (16, 16), 16)
+            img, mask = sprite_cache.get_placeholder(32, (255, 0, 0))
         self._image = img
-        self._mask = pygame.mask.from_surface(self._image)
+        self._mask = mask
+        self._collision_radius = max(img.get_width(), img.get_height()) / 2
         self._image_loaded = True
 
     def get_image(self):
@@ -56,9 +52,15 @@ class Enemy:
             self._load_image()
         return self._mask
 
+    def get_collision_radius(self):
+        """Radius used for circular hit tests (half the sprite's larger side)."""
+        if not self._image_loaded:
+            self._load_image()
+        return self._collision_radius
+
     def draw(self, surface, camera):
         screen_pos = camera.apply(self.pos)
-        img = self.get_tilted_image()
+        img = camera.scaled(self.get_tilted_image())
         rect = img.get_rect(center=(int(screen_pos.x), int(screen_pos.y)))
         surface.blit(img, rect)
 
@@ -66,23 +68,83 @@ class Enemy:
         """
         Returns a smoothly tilted version of the enemy sprite.
         Rotation oscillates between -tilt_amplitude and +tilt_amplitude.
+        Frames come from a rotation table shared by every enemy using the same sprite.
         """
-        base_image = self.get_image()
+        if self._rotations is None:
+            self._rotations = sprite_cache.get_rotation_table(
+                self.get_image(), self.tilt_amplitude, self.tilt_step)
 
         # Sinusoidal oscillation
         angle = math.sin(self.tilt_time * self.tilt_speed) * self.tilt_amplitude
 
-        rotated = pygame.transform.rotate(base_image, angle)
-        return rotated
+        return self._rotations.lookup(angle)
 
-    def update(self, dt, player, world_objects, spatial_grid=None, enemies=None):
+    def _hits_obstacle(self, test_pos, nearby, enemy_mask, obstacle_map=None):
+        """True if this enemy at `test_pos` would overlap a tree or bush base."""
+        if obstacle_map is not None:
+            return obstacle_map.enemy_blocked(enemy_mask, test_pos)
+        for obj in nearby:
+            # Only collide with trees and bushes using their bottom-third mask so enemies can go behind
+            if obj.__class__.__name__ in ("Tree", "Bush"):
+                try:
+                    if obj.overlaps_partial(test_pos, enemy_mask, use_self_partial=True):
+                        return True
+                except Exception:
+                    # Fallback to full overlap check
+                    if obj.overlaps(test_pos, enemy_mask):
+                        return True
+        return False
+
+    def _hits_enemy(self, test_pos, others):
+        """True if this enemy at `test_pos` would overlap another live enemy."""
+        if others is None:
+            return False
+        from collision import objects_overlap
+        for other in others:
+            if other is self or other.dead:
+                continue
+            # quick distance check to avoid expensive mask ops
+            if (self.pos - other.pos).length_squared() > ((self.get_image().get_width() + other.get_image().get_width())) ** 2:
+                continue
+            if objects_overlap(self, test_pos, other, other.pos):
+                return True
+        return False
+
+    def update(self, dt, player, world_objects, spatial_grid=None, enemies=None, enemy_grid=None,
+               obstacle_map=None, flow_field=None):
         """Basic enemy update: seek towards player with simple obstacle avoidance.
+
+        If `enemy_grid` (a DynamicSpatialGrid holding the live enemies) is given,
+        separation only considers enemies in nearby cells instead of scanning
+        the whole `enemies` list. If `obstacle_map` (an ObstacleMap) is given,
+        tree/bush collision is a single bitmap overlap per tested position.
+        If `flow_field` (a navigation.FlowField toward the player) is given, a
+        blocked enemy first follows the field's precomputed direction and only
+        falls back to probing slide directions if that step is blocked too.
         """
         if self.dead:
             return
 
-        # Desired velocity towards player
         self.tilt_time += dt
+        if counters.enabled:
+            counters.incr("enemy.updates")
+        with profiler.zone("enemy.steer"):
+            to_player, nearby, new_pos = self._steer(dt, player, world_objects, spatial_grid)
+
+        # Candidate enemies for separation checks
+        others = enemies
+        if enemy_grid is not None:
+            others = enemy_grid.get_nearby(self.pos, radius=1)
+
+        with profiler.zone("enemy.collide"):
+            self._resolve_move(dt, to_player, nearby, new_pos, others, obstacle_map, flow_field)
+
+    def _steer(self, dt, player, world_objects, spatial_grid):
+        """Seek the player plus repulsion from nearby static objects.
+
+        Returns (to_player, nearby static objects, unobstructed new position).
+        """
+        # Desired velocity towards player
         to_player = (player.pos - self.pos)
         dist = to_player.length()
         if dist > 0:
@@ -115,41 +177,36 @@ class Enemy:
         else:
             movement = pygame.Vector2(0, 0)
 
-        new_pos = self.pos + movement
+        return to_player, nearby, self.pos + movement
 
+    def _resolve_move(self, dt, to_player, nearby, new_pos, others, obstacle_map=None, flow_field=None):
+        """Move to `new_pos` unless blocked; otherwise try the flow field, a tangent slide and angle probes."""
         # Collision with static objects: prevent overlap using bottom-third partial masks
         # Check potential collisions; if colliding, attempt simple steering adjustments
-        collision = False
         enemy_mask = self.get_mask()
-        for obj in nearby:
-            # Only collide with trees and bushes using their bottom-third mask so enemies can go behind
-            if obj.__class__.__name__ in ("Tree", "Bush"):
-                try:
-                    if obj.overlaps_partial(new_pos, enemy_mask, use_self_partial=True):
-                        collision = True
-                        break
-                except Exception:
-                    # Fallback to full overlap check
-                    if obj.overlaps(new_pos, enemy_mask):
-                        collision = True
-                        break
+        collision = self._hits_obstacle(new_pos, nearby, enemy_mask, obstacle_map)
 
         # Also check collisions with other enemies (prevent stacking)
-        if not collision and enemies is not None:
-            from collision import objects_overlap
-            for other in enemies:
-                if other is self or other.dead:
-                    continue
-                # quick distance check to avoid expensive mask ops
-                if (self.pos - other.pos).length_squared() > ((self.get_image().get_width() + other.get_image().get_width())) ** 2:
-                    continue
-                if objects_overlap(self, new_pos, other, other.pos):
-                    collision = True
-                    break
+        if not collision:
+            collision = self._hits_enemy(new_pos, others)
 
         if not collision:
             self.pos = new_pos
             return
+        if counters.enabled:
+            counters.incr("enemy.blocked")
+
+        # Follow the precomputed flow field around obstacles when available
+        if flow_field is not None:
+            flow_dir = flow_field.direction(self.pos)
+            if flow_dir is not None:
+                test_pos = self.pos + flow_dir * self.speed * dt
+                if counters.enabled:
+                    counters.incr("enemy.retries")
+                if (not self._hits_obstacle(test_pos, nearby, enemy_mask, obstacle_map)
+                        and not self._hits_enemy(test_pos, others)):
+                    self.pos = test_pos
+                    return
 
         # Try a lightweight tangent-slide around the blocking object(s) first
         blockers = []
@@ -175,25 +232,11 @@ class Enemy:
                 for sign in (1, -1):
                     test_move = tangent * sign * self.speed * dt
                     test_pos = self.pos + test_move
-                    blocked = False
-                    for obj in nearby:
-                        if obj.__class__.__name__ in ("Tree", "Bush"):
-                            try:
-                                if obj.overlaps_partial(test_pos, enemy_mask, use_self_partial=True):
-                                    blocked = True
-                                    break
-                            except Exception:
-                                if obj.overlaps(test_pos, enemy_mask):
-                                    blocked = True
-                                    break
-                    if not blocked and enemies is not None:
-                        from collision import objects_overlap
-                        for other in enemies:
-                            if other is self or other.dead:
-                                continue
-                            if objects_overlap(self, test_pos, other, other.pos):
-                                blocked = True
-                                break
+                    if counters.enabled:
+                        counters.incr("enemy.retries")
+                    blocked = self._hits_obstacle(test_pos, nearby, enemy_mask, obstacle_map)
+                    if not blocked:
+                        blocked = self._hits_enemy(test_pos, others)
                     if not blocked:
                         self.pos = test_pos
                         return
@@ -207,26 +250,12 @@ class Enemy:
             rotated = pygame.Vector2(dir_vec.x * cos - dir_vec.y * sin, dir_vec.x * sin + dir_vec.y * cos)
             test_move = rotated.normalize() * self.speed * dt
             test_pos = self.pos + test_move
-            blocked = False
-            for obj in nearby:
-                if obj.__class__.__name__ in ("Tree", "Bush"):
-                    try:
-                        if obj.overlaps_partial(test_pos, enemy_mask, use_self_partial=True):
-                            blocked = True
-                            break
-                    except Exception:
-                        if obj.overlaps(test_pos, enemy_mask):
-                            blocked = True
-                            break
+            if counters.enabled:
+                counters.incr("enemy.retries")
+            blocked = self._hits_obstacle(test_pos, nearby, enemy_mask, obstacle_map)
             # check test_pos vs other enemies
-            if not blocked and enemies is not None:
-                from collision import objects_overlap
-                for other in enemies:
-                    if other is self or other.dead:
-                        continue
-                    if objects_overlap(self, test_pos, other, other.pos):
-                        blocked = True
-                        break
+            if not blocked:
+                blocked = self._hits_enemy(test_pos, others)
             if not blocked:
                 self.pos = test_pos
                 return
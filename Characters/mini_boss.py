@@ -1,7 +1,6 @@
 from .enemy import Enemy
 from asset_manager import get_asset_path
-import pygame
-import os
+import sprite_cache
 
 
 class MiniBoss(Enemy):
@@ -36,27 +35,15 @@ class MiniBoss(Enemy):
         """Load image and scale attack_robot sprite by 50%."""
         if self._image_loaded:
             return
-        
-        if self.image_path:
-            try:
-                load_path = self.image_path
-                if (not os.path.isabs(load_path)) and (not os.path.exists(load_path)):
-                    load_path = get_asset_path(os.path.basename(load_path))
-                img = pygame.image.load(load_path).convert_alpha()
-            except Exception:
-                img = None
-        else:
-            img = None
-        
-        if img is None:
-            img = pygame.Surface((32, 32), pygame.SRCALPHA)
-            pygame.draw.circle(img, (200, 100, 0), (16, 16), 16)
-        
+
         # Scale attack_robot sprite by 50% (1.5x)
-        if self.type == "attack_robot":
-            w, h = img.get_size()
-            img = pygame.transform.smoothscale(img, (int(w * 1.5), int(h * 1.5)))
-        
+        scale = 1.5 if self.type == "attack_robot" else None
+        img, mask = sprite_cache.get_sprite(self.image_path, scale=scale, smooth=True)
+
+        if img is None:
+            img, mask = sprite_cache.get_placeholder(int(32 * (scale or 1)), (200, 100, 0))
+
         self._image = img
-        self._mask = pygame.mask.from_surface(self._image)
+        self._mask = mask
+        self._collision_radius = max(img.get_width(), img.get_height()) / 2
         self._image_loaded = True
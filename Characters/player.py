@@ -1,7 +1,6 @@
 import pygame
-import os
 import math
-from asset_manager import get_asset_path
+import sprite_cache
 from inventory import Inventory
 
 
@@ -66,68 +65,43 @@ class Player:
             return
         # Prefer multi-frame sprite fields if provided by subclass
         # Load standing + moving frames, else fall back to legacy single image
-        def _resolve(path):
-            if not path:
-                return None
-            load_path = path
-            if (not os.path.isabs(load_path)) and (not os.path.exists(load_path)):
-                load_path = get_asset_path(os.path.basename(load_path))
-            try:
-                return pygame.image.load(load_path).convert_alpha()
-            except Exception:
-                return None
+        def _sprite(path, fallback=None):
+            # (image, flipped image, mask), all shared through sprite_cache so that
+            # render-scaled copies (Camera.scaled) are shared across runs too
+            img = sprite_cache.get_surface(path) if path else None
+            if img is None:
+                if fallback is not None:
+                    return fallback
+                # Fallback: a red circle, which reads the same flipped
+                img, mask = sprite_cache.get_placeholder(self.radius * 2, (255, 0, 0))
+                return img, img, mask
+            return img, sprite_cache.get_surface(path, flip_x=True), sprite_cache.get_mask(path)
 
         if self.standing_image_path or self.moving_image_paths:
             # Load standing image
-            s_img = _resolve(self.standing_image_path) or None
-            if s_img is None:
-                s_img = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(s_img, (255, 0, 0), (self.radius, self.radius), self.radius)
-            self._standing_img = s_img
-            self._standing_img_flipped = pygame.transform.flip(s_img, True, False)
+            standing = _sprite(self.standing_image_path)
+            self._standing_img, self._standing_img_flipped, mask = standing
 
             # Load moving images list
             self._moving_imgs = []
             self._moving_imgs_flipped = []
             if self.moving_image_paths:
                 for p in self.moving_image_paths:
-                    m = _resolve(p)
-                    if m is None:
-                        m = s_img.copy()
+                    m, m_flipped, _ = _sprite(p, fallback=standing)
                     self._moving_imgs.append(m)
-                    self._moving_imgs_flipped.append(pygame.transform.flip(m, True, False))
+                    self._moving_imgs_flipped.append(m_flipped)
 
             # For collision and legacy use, keep _image/_mask referencing standing image
             self._image = self._standing_img
             self._image_flipped = self._standing_img_flipped
-            self._mask = pygame.mask.from_surface(self._image)
+            self._mask = mask
             self._image_loaded = True
             # initialize animation frame index
             self.current_moving_frame = 0
             return
 
         # Legacy single-image path: keep previous behavior
-        if self.image_path:
-            try:
-                load_path = self.image_path
-                # Resolve relative paths when running from PyInstaller bundle
-                if (not os.path.isabs(load_path)) and (not os.path.exists(load_path)):
-                    load_path = get_asset_path(os.path.basename(load_path))
-                img = pygame.image.load(load_path).convert_alpha()
-            except Exception:
-                img = None
-        else:
-            img = None
-
-        if img is None:
-            # fallback to a simple circle surface
-            img = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(img, (255, 0, 0), (self.radius, self.radius), self.radius)
-
-        self._image = img
-        self._image_flipped = pygame.transform.flip(self._image, True, False)
-        # Create mask from non-transparent pixels for collision detection
-        self._mask = pygame.mask.from_surface(self._image)
+        self._image, self._image_flipped, self._mask = _sprite(self.image_path)
         self._image_loaded = True
 
     def get_image(self):
@@ -145,9 +119,7 @@ class Player:
     def get_mask(self):
         if not self._image_loaded:
             self._load_image()
-        # Prefer standing-image mask if available
-        if self._standing_img is not None:
-            return pygame.mask.from_surface(self._standing_img)
+        # The standing image's mask when there are animation frames
         return self._mask
 
     def get_partial_mask_bottom_third(self):
@@ -158,27 +130,13 @@ class Player:
         if not self._image_loaded:
             self._load_image()
 
-        # Use standing image as the base for partial mask when available
-        base_img = self._standing_img if self._standing_img is not None else self._image
-        base_mask = pygame.mask.from_surface(base_img)
-        w, h = base_mask.get_size()
-        third_h = max(1, h // 3)
-        
-        # Create a new mask for the bottom third
-        partial = pygame.mask.Mask((w, third_h))
-        
-        # Copy pixels from bottom third of original mask
-        for y in range(third_h):
-            for x in range(w):
-                src_y = h - third_h + y  # Bottom third starts here
-                if base_mask.get_at((x, src_y)):
-                    partial.set_at((x, y), True)
-
-        self._partial_mask = partial
+        # Bottom third of the standing (or only) image's mask, shared and possibly baked
+        self._partial_mask = sprite_cache.get_partial_mask(self._mask)
         return self._partial_mask
 
-    def handle_input(self, dt, world_objects=None, spatial_grid=None):
-        keys = pygame.key.get_pressed()
+    def handle_input(self, dt, world_objects=None, spatial_grid=None, obstacle_map=None, keys=None):
+        if keys is None:
+            keys = pygame.key.get_pressed()
         movement = pygame.Vector2(0, 0)
         if keys[pygame.K_w]:
             movement.y -= 1
@@ -220,7 +178,13 @@ class Player:
 
             # Check collision with nearby objects only (using spatial grid if available)
             collision = False
-            if world_objects:
+            if obstacle_map is not None:
+                # Static trees/bushes pre-rasterized into world bitmaps
+                collision = obstacle_map.player_blocked(
+                    self.get_partial_mask_bottom_third(), self.get_mask(), new_pos)
+                if not collision:
+                    self.pos = new_pos
+            elif world_objects:
                 player_mask = self.get_mask()
                 player_partial_mask = self.get_partial_mask_bottom_third()
                 
@@ -251,14 +215,15 @@ class Player:
 
     def draw(self, surface, camera):
         screen_pos = camera.apply(self.pos)
-        img = self.get_image()
+        img = camera.scaled(self.get_image())
         rect = img.get_rect(center=(int(screen_pos.x), int(screen_pos.y)))
         surface.blit(img, rect)
         # Draw health bar above player
-        bar_width = max(40, img.get_width())
-        bar_height = 6
+        scale = camera.scale
+        bar_width = max(int(40 * scale), img.get_width())
+        bar_height = max(1, int(6 * scale))
         bar_x = int(screen_pos.x - bar_width / 2)
-        bar_y = int(screen_pos.y - img.get_height() / 2) - 10
+        bar_y = int(screen_pos.y - img.get_height() / 2) - int(10 * scale)
         # Background (red for missing health)
         pygame.draw.rect(surface, (100, 0, 0), (bar_x, bar_y, bar_width, bar_height))
         # Foreground (green for current health)
@@ -340,34 +305,33 @@ class Player:
             image_path=self.weapon_image
         )
 
-    def get_closest_enemy(self, enemies, max_range=None):
-        """Return the closest enemy object from `enemies` or None if empty/not in range."""
-        best = None
-        best_d = None
-        for e in enemies:
-            if e.dead:
-                continue
-            d = (e.pos - self.pos).length()
-            if max_range is not None and d > max_range:
-                continue
-            if best is None or d < best_d:
-                best = e
-                best_d = d
-        return best
-
-    def auto_fire(self, dt, enemies, projectiles_or_weapons):
+    def get_closest_enemy(self, enemies, max_range=None, targeting=None):
+        """Return the closest enemy object from `enemies` or None if empty/not in range.
+
+        Pass the frame's TargetingService as `targeting` to reuse its index.
+        """
+        if targeting is None:
+            from targeting import TargetingService
+            targeting = TargetingService(enemies)
+        return targeting.nearest(self.pos, max_range)
+
+    def auto_fire(self, dt, enemies, projectiles_or_weapons, targeting=None):
         """Fire all active weapons at enemies.
         
         Each weapon in active_weapons is fired independently with its own cooldown.
+        All weapons share one TargetingService (built here if not passed in).
         """
         if not enemies:
             return
+        if targeting is None:
+            from targeting import TargetingService
+            targeting = TargetingService(enemies)
         
         # Fire all active weapons
         if hasattr(self, 'active_weapons') and self.active_weapons:
             for weapon in self.active_weapons:
                 try:
-                    weapon.fire(self, enemies, projectiles_or_weapons)
+                    weapon.fire(self, enemies, projectiles_or_weapons, targeting)
                 except Exception as e:
                     # Gracefully handle weapon firing errors
                     pass
@@ -379,7 +343,7 @@ class Player:
             if self.weapon_last_fire < interval:
                 return
             # Ready to fire
-            target = self.get_closest_enemy(enemies)
+            target = self.get_closest_enemy(enemies, targeting=targeting)
             if not target:
                 return
             
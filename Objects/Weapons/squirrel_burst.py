@@ -28,7 +28,7 @@ class SquirrelBurst(Weapon):
             weapon_range=self.WEAPON_RANGE
         )
     
-    def fire(self, player, enemies, projectiles_list):
+    def fire(self, player, enemies, projectiles_list, targeting=None):
         """Fire squirrel burst radius weapon."""
         if not self.can_fire():
             return
@@ -107,25 +107,29 @@ class Weapon(Item):
             return False
         return self.last_fire_time >= (1.0 / self.fire_rate)
     
-    def fire(self, player, enemies, projectiles_list):
+    def find_target(self, player, enemies, targeting=None):
+        """Return the live enemy closest to the player, or None.
+
+        Uses the frame's shared TargetingService when one is passed in;
+        otherwise builds a throwaway one over `enemies`.
+        """
+        if targeting is None:
+            from targeting import TargetingService
+            targeting = TargetingService(enemies)
+        return targeting.nearest(player.pos)
+
+    def fire(self, player, enemies, projectiles_list, targeting=None):
         """Fire this weapon at the closest enemy.
         
         Override in subclasses to implement specific firing behavior.
         This is the default projectile implementation.
+        `targeting` is the frame's shared TargetingService (optional).
         """
         if not self.can_fire() or not enemies:
             return
         
         # Find closest enemy
-        closest_enemy = None
-        closest_distance = float('inf')
-        for enemy in enemies:
-            if enemy.dead:
-                continue
-            distance = (enemy.pos - player.pos).length()
-            if distance < closest_distance:
-                closest_distance = distance
-                closest_enemy = enemy
+        closest_enemy = self.find_target(player, enemies, targeting)
         
         if not closest_enemy:
             return
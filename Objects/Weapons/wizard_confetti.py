@@ -25,21 +25,13 @@ class WizardConfetti(Weapon):
             weapon_range=self.WEAPON_RANGE
         )
     
-    def fire(self, player, enemies, projectiles_list):
+    def fire(self, player, enemies, projectiles_list, targeting=None):
         """Fire wizard confetti projectiles."""
         if not self.can_fire() or not enemies:
             return
         
         # Find closest enemy
-        closest_enemy = None
-        closest_distance = float('inf')
-        for enemy in enemies:
-            if enemy.dead:
-                continue
-            distance = (enemy.pos - player.pos).length()
-            if distance < closest_distance:
-                closest_distance = distance
-                closest_enemy = enemy
+        closest_enemy = self.find_target(player, enemies, targeting)
         
         if not closest_enemy:
             return
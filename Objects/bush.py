@@ -4,4 +4,4 @@ import os
 
 class Bush(GameObject):
     """A bush object that blocks the player."""
-    image_path = os.path.join("assets", "bush2.png")
+    image_path = os.path.join("assets", "Bush2.png")
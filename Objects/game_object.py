@@ -1,7 +1,5 @@
 import pygame
-import os
-import sys
-from asset_manager import get_asset_path
+import sprite_cache
 
 
 class GameObject:
@@ -23,26 +21,15 @@ class GameObject:
         if self._image_loaded:
             return
 
-        if self.image_path:
-            try:
-                load_path = self.image_path
-                # Resolve relative paths when running from PyInstaller bundle
-                if (not os.path.isabs(load_path)) and (not os.path.exists(load_path)):
-                    load_path = get_asset_path(os.path.basename(load_path))
-                img = pygame.image.load(load_path).convert_alpha()
-            except Exception:
-                img = None
-        else:
-            img = None
+        # Shared across every instance using the same sprite
+        img, mask = sprite_cache.get_sprite(self.image_path)
 
         if img is None:
-            # Fallback: create a simple gray circle
-            img = pygame.Surface((40, 40), pygame.SRCALPHA)
-            pygame.draw.circle(img, (150, 150, 150), (20, 20), 20)
+            # Fallback: a simple gray circle (also shared)
+            img, mask = sprite_cache.get_placeholder(40, (150, 150, 150))
 
         self._image = img
-        # Create mask from non-transparent pixels for collision detection
-        self._mask = pygame.mask.from_surface(self._image)
+        self._mask = mask
         self._image_loaded = True
 
     def get_image(self):
@@ -67,26 +54,14 @@ class GameObject:
         if not self._image_loaded:
             self._load_image()
 
-        w, h = self._mask.get_size()
-        third_h = max(1, h // 3)
-        
-        # Create a new mask for the bottom third
-        partial = pygame.mask.Mask((w, third_h))
-        
-        # Copy pixels from bottom third of original mask
-        for y in range(third_h):
-            for x in range(w):
-                src_y = h - third_h + y  # Bottom third starts here
-                if self._mask.get_at((x, src_y)):
-                    partial.set_at((x, y), True)
-        
-        self._partial_mask = partial
+        # Shared per sprite, so only the first tree/bush pays for building it
+        self._partial_mask = sprite_cache.get_partial_mask(self._mask)
         return self._partial_mask
 
     def draw(self, surface, camera):
         """Draw the object on the surface using camera coordinates."""
         screen_pos = camera.apply(self.pos)
-        img = self.get_image()
+        img = camera.scaled(self.get_image())
         rect = img.get_rect(center=(int(screen_pos.x), int(screen_pos.y)))
         surface.blit(img, rect)
 
@@ -2,6 +2,19 @@
 import pygame
 import math
 
+# Name label fonts by size; creating a Font reads the font file
+_fonts = {}
+
+
+def name_font(scale=1.0):
+    """Font for item names at a render scale (shared; created on first use)."""
+    size = max(8, int(16 * scale))
+    font = _fonts.get(size)
+    if font is None:
+        font = pygame.font.Font(None, size)
+        _fonts[size] = font
+    return font
+
 
 class GroundItem:
     """
@@ -57,26 +70,27 @@ class GroundItem:
     def draw(self, surface, camera):
         """Draw the item drop on screen."""
         screen_pos = camera.apply(self.pos)
+        scale = camera.scale
         
         # Draw glow effect with gentle pulsing
-        glow_radius = self._get_glow_radius()
+        glow_radius = self._get_glow_radius() * scale
         pygame.draw.circle(surface, (100, 150, 255, 50), 
                          (int(screen_pos.x), int(screen_pos.y)), int(glow_radius), 1)
         
         # Get and rotate item image
-        item_img = self.item.get_image(self.ITEM_DISPLAY_SIZE)
+        item_img = camera.scaled(self.item.get_image(self.ITEM_DISPLAY_SIZE))
         rotated = pygame.transform.rotate(item_img, self.rotation)
         
         # Draw with bob animation
-        bob_offset = self._get_bob_offset()
+        bob_offset = self._get_bob_offset() * scale
         adjusted_y = int(screen_pos.y) + int(bob_offset)
         rect = rotated.get_rect(center=(int(screen_pos.x), adjusted_y))
         surface.blit(rotated, rect)
         
         # Draw item name above
-        font = pygame.font.Font(None, 16)
+        font = name_font(scale)
         name_text = font.render(self.item.name, True, (200, 200, 200))
-        name_rect = name_text.get_rect(centerx=int(screen_pos.x), bottom=int(screen_pos.y) - 40)
+        name_rect = name_text.get_rect(centerx=int(screen_pos.x), bottom=int(screen_pos.y) - int(40 * scale))
         surface.blit(name_text, name_rect)
     
     def can_pickup(self, player_pos):
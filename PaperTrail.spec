@@ -7,11 +7,27 @@ import os
 
 block_cipher = None
 
+# Ship one pre-decoded, zlib-compressed image archive instead of the loose PNGs
+# (see asset_pack.py); asset_manager finds it at the bundle root
+sys.path.insert(0, SPECPATH)
+from asset_pack import build as build_asset_pack
+ASSET_PACK = os.path.join(workpath, 'assets.pak')
+os.makedirs(workpath, exist_ok=True)
+# Fails the build on image references that don't match an asset file
+build_asset_pack(os.path.join(SPECPATH, 'assets'), ASSET_PACK, compress=True, source_dir=SPECPATH)
+
+# Pre-scaled sprite variants and collision masks (see asset_bake.py)
+from game_session import init_headless
+import asset_bake
+init_headless()
+BAKE_CACHE = os.path.join(workpath, asset_bake.DEFAULT_NAME)
+asset_bake.bake(BAKE_CACHE)
+
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('assets', 'assets')],  # Include assets folder
+    datas=[(ASSET_PACK, '.'), (BAKE_CACHE, '.')],  # Packed assets archive and bake cache
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,256 @@
+"""Offline bake of scaled sprites and collision masks, loaded at startup.
+
+Some sprite work used to happen the first time a sprite was needed, often
+mid-game: the 1.5x attack robot smoothscale, item icon rescales, and every
+full and bottom-third footprint mask.
+`python asset_bake.py` builds all of them through sprite_cache (so they are
+exactly what the game would build) and writes them to a versioned cache
+file, baked.cache by default:
+
+    header: b"PTBK", u16 BAKE_VERSION, u32 entry count
+    index:  per entry: u16 key length + key (utf-8), 20-byte sha1 of the
+            source image file, u8 kind (0 RGB, 1 RGBA, 2 mask, 3 footprint mask),
+            u16 width, u16 height, u64 data offset, u64 data length
+    data:   zlib-compressed pixels; masks one byte per pixel (1 = set)
+
+Keys are the asset name plus the variant, e.g. "attack_robot_1.png@x1.5s"
+or "Pencil-card.png@34x34". `load()` seeds sprite_cache with every entry
+whose source still hashes the same (entries for changed images are skipped
+and rebuilt at runtime as before); a cache from another BAKE_VERSION is
+ignored with a warning. Where the loose source files are absent (a packed
+build), entries are trusted, since the build bakes and packs from the same
+sources.
+
+The title image is not baked: it is only scaled on the title screen, and
+inflating a pre-scaled copy costs more than the scale itself.
+"""
+import hashlib
+import os
+import struct
+import warnings
+import zlib
+from collections import namedtuple
+
+import pygame
+import sprite_cache
+from asset_manager import asset_names, get_asset_path, get_bundle_path
+
+BAKE_VERSION = 1
+MAGIC = b"PTBK"
+DEFAULT_NAME = "baked.cache"
+
+# Icon sizes Item.get_image is called with: ground drops, HUD slots, pause inventory
+ITEM_ICON_SIZES = (30, 34, 35)
+# Never collides, and is only scaled on the title screen
+TITLE_IMAGE = "Title_Screen.png"
+
+KIND_RGB = 0
+KIND_RGBA = 1
+KIND_MASK = 2
+KIND_FOOTPRINT = 3
+_FORMATS = {KIND_RGB: "RGB", KIND_RGBA: "RGBA"}
+
+_HEADER = struct.Struct("<4sHI")
+_NAME_LEN = struct.Struct("<H")
+_ENTRY = struct.Struct("<20sBHHQQ")
+
+# A transformed sprite: asset name plus sprite_cache's size/scale/smooth
+Variant = namedtuple("Variant", "name size scale smooth")
+
+
+def default_path():
+    """Where the game looks for the bake cache: next to the assets directory."""
+    return get_bundle_path(DEFAULT_NAME)
+
+
+def variant_key(variant):
+    key = variant.name
+    if variant.scale is not None:
+        key += f"@x{variant.scale:g}"
+    if variant.size is not None:
+        key += f"@{variant.size[0]}x{variant.size[1]}"
+    if variant.smooth:
+        key += "s"
+    return key
+
+
+def _parse_key(key):
+    name, _, rest = key.partition("@")
+    size = scale = None
+    smooth = False
+    for part in rest.split("@") if rest else ():
+        if part.endswith("s"):
+            smooth = True
+            part = part[:-1]
+        if part.startswith("x"):
+            scale = float(part[1:])
+        else:
+            w, h = part.split("x")
+            size = (int(w), int(h))
+    return Variant(name, size, scale, smooth)
+
+
+def sprite_variants():
+    """Every sprite variant the game builds at runtime beyond the plain images."""
+    from Characters.mini_boss import MiniBoss
+    from Objects.Equipment.quicks import Quicks
+    from Objects.Weapons.ninja_stars import NinjaStars
+    from Objects.Weapons.wizard_confetti import WizardConfetti
+    from Objects.Weapons.squirrel_burst import SquirrelBurst
+
+    variants = []
+    # MiniBoss._load_image scales the attack robot up by half
+    robot = os.path.basename(MiniBoss.MINIBOSS_SPRITES["attack_robot"])
+    variants.append(Variant(robot, None, 1.5, True))
+    # Item icons, at every size they are drawn (Item.get_image scales without smoothing)
+    for item in (NinjaStars(), WizardConfetti(), SquirrelBurst(), Quicks()):
+        if item.image_path:
+            for size in ITEM_ICON_SIZES:
+                variants.append(Variant(os.path.basename(item.image_path), (size, size), None, False))
+    return variants
+
+
+def _file_hash(name):
+    try:
+        with open(get_asset_path(name), "rb") as f:
+            return hashlib.sha1(f.read()).digest()
+    except OSError:
+        return None
+
+
+def _mask_pixels(mask):
+    surface = mask.to_surface(setcolor=(1, 1, 1, 255), unsetcolor=(0, 0, 0, 255))
+    return pygame.image.tobytes(surface, "RGBA")[0::4]
+
+
+def _mask_from_pixels(pixels, size):
+    # An 8-bit surface keyed on 0: from_surface sets every non-key pixel
+    surface = pygame.image.frombuffer(pixels, size, "P")
+    surface.set_colorkey(0)
+    return pygame.mask.from_surface(surface)
+
+
+def bake(out_path=None):
+    """Build every variant and mask through sprite_cache and write them to `out_path`.
+
+    Needs an initialized display (convert_alpha). Returns the number of entries.
+    """
+    out_path = out_path or default_path()
+    entries = []  # (key, source hash, kind, size, pixels)
+    hashes = {}
+
+    def source_hash(name):
+        if name not in hashes:
+            hashes[name] = _file_hash(name) or b"\0" * 20
+        return hashes[name]
+
+    def add_masks(key, name, variant):
+        mask = sprite_cache.get_mask(get_asset_path(name), variant.size, variant.scale, variant.smooth)
+        if mask is None:
+            return
+        entries.append((key, source_hash(name), KIND_MASK, mask.get_size(), _mask_pixels(mask)))
+        partial = sprite_cache.get_partial_mask(mask)
+        entries.append((key, source_hash(name), KIND_FOOTPRINT, partial.get_size(), _mask_pixels(partial)))
+
+    # Masks of every plain sprite (the title and background images never collide)
+    for name in asset_names():
+        if name == TITLE_IMAGE or name.lower().endswith((".jpg", ".jpeg")):
+            continue
+        add_masks(name, name, Variant(name, None, None, False))
+
+    for variant in sprite_variants():
+        source = get_asset_path(variant.name)
+        surface = sprite_cache.get_surface(source, variant.size, variant.scale, variant.smooth)
+        if surface is None or surface is sprite_cache.get_surface(source):
+            continue  # missing, or already the plain image's size
+        key = variant_key(variant)
+        entries.append((key, source_hash(variant.name), KIND_RGBA, surface.get_size(),
+                        pygame.image.tobytes(surface, "RGBA")))
+        add_masks(key, variant.name, variant)
+
+    blobs = [zlib.compress(pixels, 6) for *_, pixels in entries]
+    index = [_HEADER.pack(MAGIC, BAKE_VERSION, len(entries))]
+    offset = _HEADER.size + sum(_NAME_LEN.size + len(key.encode("utf-8")) + _ENTRY.size for key, *_ in entries)
+    for (key, digest, kind, size, _), blob in zip(entries, blobs):
+        encoded = key.encode("utf-8")
+        index.append(_NAME_LEN.pack(len(encoded)) + encoded)
+        index.append(_ENTRY.pack(digest, kind, size[0], size[1], offset, len(blob)))
+        offset += len(blob)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(b"".join(index))
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, out_path)
+    return len(entries)
+
+
+def load(path=None):
+    """Seed sprite_cache from a bake cache. Returns the number of entries used (0 if none)."""
+    path = path or default_path()
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return 0
+    if len(data) < _HEADER.size:
+        return 0
+    magic, version, count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        warnings.warn(f"ignoring {path}: not a bake cache")
+        return 0
+    if version != BAKE_VERSION:
+        warnings.warn(f"ignoring bake cache {path} (version {version}, expected {BAKE_VERSION}); "
+                      f"rebuild it with asset_bake.py")
+        return 0
+
+    hashes = {}
+    used = 0
+    offset = _HEADER.size
+    for _ in range(count):
+        (key_len,) = _NAME_LEN.unpack_from(data, offset)
+        offset += _NAME_LEN.size
+        key = data[offset:offset + key_len].decode("utf-8")
+        offset += key_len
+        digest, kind, width, height, data_offset, length = _ENTRY.unpack_from(data, offset)
+        offset += _ENTRY.size
+
+        variant = _parse_key(key)
+        if variant.name not in hashes:
+            hashes[variant.name] = _file_hash(variant.name)
+        current = hashes[variant.name]
+        if current is not None and current != digest:
+            continue  # the source image changed since the bake
+        pixels = zlib.decompress(data[data_offset:data_offset + length])
+        source = get_asset_path(variant.name)
+        if kind == KIND_MASK:
+            sprite_cache.add_mask(source, _mask_from_pixels(pixels, (width, height)),
+                                  variant.size, variant.scale, variant.smooth)
+        elif kind == KIND_FOOTPRINT:
+            mask = sprite_cache.get_mask(source, variant.size, variant.scale, variant.smooth)
+            if mask is None:
+                continue
+            sprite_cache.add_partial_mask(mask, _mask_from_pixels(pixels, (width, height)))
+        else:
+            surface = pygame.image.frombuffer(pixels, (width, height), _FORMATS[kind])
+            sprite_cache.add_surface(source, surface, variant.size, variant.scale, variant.smooth)
+        used += 1
+    return used
+
+
+def main(argv=None):
+    import argparse
+    from game_session import init_headless
+
+    parser = argparse.ArgumentParser(description="Bake scaled sprites and collision masks into a startup cache.")
+    parser.add_argument("--out", default=None, help=f"cache path (default: {DEFAULT_NAME} next to assets/)")
+    args = parser.parse_args(argv)
+
+    init_headless()
+    out_path = args.out or default_path()
+    count = bake(out_path)
+    print(f"baked {count} entries into {out_path} ({os.path.getsize(out_path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,108 @@
-"""Asset manager for handling asset paths in both dev and PyInstaller bundle environments."""
+"""Asset manager for handling asset paths in both dev and PyInstaller bundle environments.
+
+Images are served from the packed archive (see asset_pack) when one is
+present next to the assets directory, and from the loose files otherwise.
+PAPERTRAIL_ASSET_PACK=0 ignores the archive; a value other than 0 or 1 is
+the path of the archive to use. Archive names match case-insensitively.
+"""
 import os
 import sys
+import warnings
+
+_pack = None
+_pack_checked = False
+
+
+def _base_dir():
+    if getattr(sys, 'frozen', False):
+        # Running as PyInstaller bundle
+        return sys._MEIPASS
+    # Running in development
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def get_bundle_path(name):
+    """Path of a file shipped alongside the assets directory (e.g. the asset pack)."""
+    return os.path.join(_base_dir(), name)
 
 
 def get_asset_path(asset_name):
     """
     Get the correct path for an asset, handling both development and PyInstaller bundle modes.
-    
+
     Args:
         asset_name: Name or relative path of the asset (e.g., "Circle-Ninja.png" or just the filename)
-    
+
     Returns:
         Full path to the asset file
     """
-    if getattr(sys, 'frozen', False):
-        # Running as PyInstaller bundle
-        asset_dir = os.path.join(sys._MEIPASS, 'assets')
-    else:
-        # Running in development
-        asset_dir = os.path.join(os.path.dirname(__file__), 'assets')
-    
-    return os.path.join(asset_dir, asset_name)
+    return os.path.join(_base_dir(), 'assets', asset_name)
+
+
+def get_asset_pack():
+    """The open AssetPack, or None when there is no archive (or it is disabled)."""
+    global _pack, _pack_checked
+    if not _pack_checked:
+        _pack_checked = True
+        setting = os.environ.get("PAPERTRAIL_ASSET_PACK", "1")
+        if setting != "0":
+            from asset_pack import AssetPack, DEFAULT_NAME
+            path = get_bundle_path(DEFAULT_NAME) if setting == "1" else setting
+            if os.path.exists(path):
+                try:
+                    _pack = AssetPack(path)
+                except (OSError, ValueError) as e:
+                    if not os.path.isdir(os.path.dirname(get_asset_path("x"))):
+                        # A packed build ships no loose files to fall back on
+                        raise RuntimeError(f"cannot open asset pack {path}: {e}") from e
+                    warnings.warn(f"ignoring asset pack {path} ({e}); using the loose asset files")
+    return _pack
+
+
+def _packed_name(path):
+    """Archive entry name for `path` if it points into the assets directory."""
+    pack = get_asset_pack()
+    if pack is None:
+        return None
+    path = os.path.abspath(path)
+    if os.path.normcase(os.path.dirname(path)) != os.path.normcase(os.path.dirname(get_asset_path("x"))):
+        return None
+    name = os.path.basename(path)
+    return name if name in pack else None
+
+
+def get_asset_buffer(path):
+    """(pixels, (width, height), format) for a packed image, or None if it isn't packed.
+
+    Raw entries are zero-copy views of the mapped archive.
+    """
+    name = _packed_name(path)
+    if name is None:
+        return None
+    return get_asset_pack().pixels(name)
+
+
+def load_image(path):
+    """Load an image as an unconverted Surface: from the archive if packed, else from disk.
+
+    Raises like pygame.image.load if it can't be loaded.
+    """
+    import pygame
+    packed = get_asset_buffer(path)
+    if packed is not None:
+        pixels, size, fmt = packed
+        return pygame.image.frombuffer(pixels, size, fmt)
+    return pygame.image.load(path)
+
+
+def asset_names():
+    """Names of every image available (the archive's entries, else the assets directory's files)."""
+    pack = get_asset_pack()
+    if pack is not None:
+        return pack.names()
+    from asset_pack import IMAGE_EXTENSIONS
+    try:
+        names = os.listdir(os.path.dirname(get_asset_path("x")))
+    except OSError:
+        return []
+    return sorted(n for n in names if n.lower().endswith(IMAGE_EXTENSIONS))
@@ -0,0 +1,248 @@
+"""Single-file archive of pre-decoded asset pixels, read through mmap.
+
+A onefile build used to extract every loose PNG to a temp dir on launch and
+then decode each one. `python asset_pack.py` decodes the images under
+assets/ once and writes them to one indexed archive (assets.pak by
+default):
+
+    header: b"PTPK", u16 version, u32 entry count
+    index:  per entry: u16 name length + name (utf-8), u8 pixel format
+            (0 RGB, 1 RGBA), u8 codec (0 raw, 1 zlib), u16 width, u16 height,
+            u64 data offset, u64 data length
+    data:   each entry's pixels (rows top to bottom), 16-byte aligned
+
+Raw entries are served as memoryview slices of the mapped file, so turning
+one into a Surface (`pygame.image.frombuffer`) copies nothing until
+`convert_alpha()`. `--compress` stores zlib-compressed pixels instead: a
+sixth of the size for builds where archive size matters more, at the cost
+of one inflate per image. Both are lossless.
+
+Entry names are matched case-insensitively, like the loose files on
+Windows, so a reference that only differs in case from the file still
+resolves in a packed build. `build` refuses names that differ only in case
+and, given the game's source directory, image references that don't match
+an asset file exactly (see `check_references`).
+
+asset_manager opens the archive when it exists and falls back to the loose
+files otherwise (e.g. in development without a packed build).
+"""
+import ast
+import mmap
+import os
+import struct
+import zlib
+from collections import namedtuple
+
+MAGIC = b"PTPK"
+VERSION = 1
+DEFAULT_NAME = "assets.pak"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+_HEADER = struct.Struct("<4sHI")
+_ENTRY = struct.Struct("<BBHHQQ")
+_NAME_LEN = struct.Struct("<H")
+_ALIGN = 16
+
+FORMATS = ("RGB", "RGBA")
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+
+PackEntry = namedtuple("PackEntry", "name format codec size offset length")
+
+
+class AssetPack:
+    """Read-only view of an asset archive; the file stays mapped while the pack is open."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        try:
+            self._read_index()
+        except struct.error:
+            self.close()
+            raise ValueError(f"{path} is truncated") from None
+        except ValueError:
+            self.close()
+            raise
+
+    def _read_index(self):
+        magic, version, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a PaperTrail asset pack")
+        if version != VERSION:
+            raise ValueError(f"unsupported asset pack version {version}")
+        self.entries = {}  # lower-cased name -> PackEntry
+        offset = _HEADER.size
+        for _ in range(count):
+            (name_len,) = _NAME_LEN.unpack_from(self._mmap, offset)
+            offset += _NAME_LEN.size
+            name = bytes(self._mmap[offset:offset + name_len]).decode("utf-8")
+            offset += name_len
+            fmt, codec, width, height, data_offset, length = _ENTRY.unpack_from(self._mmap, offset)
+            offset += _ENTRY.size
+            if data_offset + length > len(self._mmap):
+                raise ValueError(f"{self.path} is truncated")
+            self.entries[name.lower()] = PackEntry(name, FORMATS[fmt], codec, (width, height),
+                                                   data_offset, length)
+
+    def __contains__(self, name):
+        return name.lower() in self.entries
+
+    def names(self):
+        return sorted(entry.name for entry in self.entries.values())
+
+    def pixels(self, name):
+        """(pixels, size, format) for `name` (any case), or None.
+
+        Raw entries return a memoryview into the mapped file (zero-copy);
+        zlib entries return freshly inflated bytes.
+        """
+        entry = self.entries.get(name.lower())
+        if entry is None:
+            return None
+        data = self._view[entry.offset:entry.offset + entry.length]
+        if entry.codec == CODEC_ZLIB:
+            data = zlib.decompress(data)
+        return data, entry.size, entry.format
+
+    def close(self):
+        self._view.release()
+        self._mmap.close()
+
+
+def _is_image_name(name):
+    stem, ext = os.path.splitext(name)
+    return bool(stem) and ext.lower() in IMAGE_EXTENSIONS
+
+
+def image_references(source_dir):
+    """{image file name: ["file.py:line", ...]} for every image named in the game's code.
+
+    Collects string literals (docstrings and other bare strings excluded)
+    whose last path component is an image file name, from every .py file
+    under `source_dir` except hidden, build, test and virtualenv directories.
+    """
+    skip_dirs = {"build", "dist", "tests", "venv", ".venv", "__pycache__"}
+    refs = {}
+    for root, dirs, files in os.walk(source_dir):
+        dirs[:] = sorted(d for d in dirs if d not in skip_dirs and not d.startswith("."))
+        for file_name in sorted(files):
+            if not file_name.endswith(".py"):
+                continue
+            path = os.path.join(root, file_name)
+            with open(path, "rb") as f:
+                tree = ast.parse(f.read(), path)
+            bare = {id(node.value) for node in ast.walk(tree) if isinstance(node, ast.Expr)}
+            for node in ast.walk(tree):
+                if not (isinstance(node, ast.Constant) and isinstance(node.value, str)) or id(node) in bare:
+                    continue
+                name = node.value.replace("\\", "/").rsplit("/", 1)[-1]
+                if _is_image_name(name):
+                    where = f"{os.path.relpath(path, source_dir)}:{node.lineno}"
+                    refs.setdefault(name, []).append(where)
+    return refs
+
+
+def check_references(asset_dir, source_dir):
+    """Problems with the image references under `source_dir`, as messages (empty if none).
+
+    A reference must name an asset file exactly: one that only matches in
+    a different case works from the archive and on Windows, but not from
+    loose files on case-sensitive filesystems.
+    """
+    files = {n.lower(): n for n in os.listdir(asset_dir) if _is_image_name(n)}
+    problems = []
+    for name, places in sorted(image_references(source_dir).items()):
+        actual = files.get(name.lower())
+        if actual == name:
+            continue
+        where = ", ".join(places)
+        if actual is None:
+            problems.append(f"{name} ({where}): no such file in {asset_dir}")
+        else:
+            problems.append(f"{name} ({where}): the file is named {actual}")
+    return problems
+
+
+def build(asset_dir, out_path, compress=False, source_dir=None):
+    """Decode every image in `asset_dir` and write them to an archive at `out_path`.
+
+    With `source_dir`, first checks the game's image references against
+    `asset_dir` (see `check_references`). Raises ValueError on a bad
+    reference or on file names that differ only in case. Returns the list
+    of PackEntry written.
+    """
+    import pygame
+
+    names = sorted(n for n in os.listdir(asset_dir) if _is_image_name(n))
+    seen = {}
+    for name in names:
+        other = seen.setdefault(name.lower(), name)
+        if other != name:
+            raise ValueError(f"asset names {other} and {name} differ only in case")
+    if source_dir is not None:
+        problems = check_references(asset_dir, source_dir)
+        if problems:
+            raise ValueError("unresolved image references:\n  " + "\n  ".join(problems))
+    items = []
+    for name in names:
+        surface = pygame.image.load(os.path.join(asset_dir, name))
+        # Keep per-pixel alpha (and colorkey transparency); everything else is stored opaque
+        alpha = bool(surface.get_flags() & pygame.SRCALPHA) or surface.get_colorkey() is not None
+        if alpha and not surface.get_flags() & pygame.SRCALPHA:
+            converted = pygame.Surface(surface.get_size(), pygame.SRCALPHA, 32)
+            converted.fill((0, 0, 0, 0))
+            converted.blit(surface, (0, 0))
+            surface = converted
+        fmt = "RGBA" if alpha else "RGB"
+        pixels = pygame.image.tobytes(surface, fmt)
+        codec = CODEC_RAW
+        if compress:
+            pixels = zlib.compress(pixels, 6)
+            codec = CODEC_ZLIB
+        items.append((name, FORMATS.index(fmt), codec, surface.get_size(), pixels))
+
+    index_size = _HEADER.size + sum(_NAME_LEN.size + len(n.encode("utf-8")) + _ENTRY.size for n, *_ in items)
+    offset = -(-index_size // _ALIGN) * _ALIGN
+    entries = []
+    index = [_HEADER.pack(MAGIC, VERSION, len(items))]
+    for name, fmt, codec, size, pixels in items:
+        encoded = name.encode("utf-8")
+        index.append(_NAME_LEN.pack(len(encoded)) + encoded)
+        index.append(_ENTRY.pack(fmt, codec, size[0], size[1], offset, len(pixels)))
+        entries.append(PackEntry(name, FORMATS[fmt], codec, size, offset, len(pixels)))
+        offset = -(-(offset + len(pixels)) // _ALIGN) * _ALIGN
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(b"".join(index))
+        for entry, (_, _, _, _, pixels) in zip(entries, items):
+            f.write(b"\0" * (entry.offset - f.tell()))
+            f.write(pixels)
+    os.replace(tmp_path, out_path)
+    return entries
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Pack the game's images into one pre-decoded archive.")
+    parser.add_argument("--assets", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets"),
+                        help="directory of images to pack")
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), DEFAULT_NAME))
+    parser.add_argument("--compress", action="store_true", help="zlib-compress the pixel data")
+    parser.add_argument("--source", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="game source directory whose image references are checked")
+    args = parser.parse_args(argv)
+    try:
+        entries = build(args.assets, args.out, args.compress, args.source)
+    except ValueError as e:
+        parser.exit(1, f"{parser.prog}: {e}\n")
+    raw = sum(e.size[0] * e.size[1] * len(e.format) for e in entries)
+    print(f"packed {len(entries)} images into {args.out} "
+          f"({os.path.getsize(args.out) / 1e6:.1f} MB, {raw / 1e6:.1f} MB of pixels)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Decode the game's images in a background thread while the menus are up.
+
+Sprites used to be decoded on their first `get_image()`, i.e. inside the
+game loop, so the first wave stalled while minion and mini boss PNGs were
+read. An AssetPreloader loads every image (from the asset pack when there
+is one, see asset_pack) in a worker thread; the main thread finalizes each one with `convert_alpha()`
+(which needs the display) and seeds sprite_cache with it:
+
+    preloader = AssetPreloader()
+    preloader.start()
+    while showing_menus:
+        preloader.pump()             # a few ms of finalizing per frame
+        preloader.draw_progress(screen)
+    preloader.finish()               # block for whatever is left
+    warm_sprites()                   # scaled variants, masks, rotation tables
+
+After that, entity loaders only hit sprite_cache and gameplay never reads
+from disk.
+"""
+import queue
+import threading
+import time
+import pygame
+import sprite_cache
+from asset_manager import asset_names, get_asset_path, load_image
+
+
+def asset_files():
+    """Paths of every game image, sorted."""
+    return [get_asset_path(name) for name in asset_names()]
+
+
+class AssetPreloader:
+    def __init__(self, paths=None):
+        """
+        Args:
+            paths: Images to preload (default: every game image);
+                ones sprite_cache already holds are skipped
+        """
+        if paths is None:
+            paths = asset_files()
+        self.paths = [p for p in paths if not sprite_cache.is_cached(p)]
+        self.total = len(self.paths)
+        self.loaded = 0
+        self._decoded = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        """Start decoding in a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._decode_all, name="asset-preloader", daemon=True)
+            self._thread.start()
+        return self
+
+    def _decode_all(self):
+        for path in self.paths:
+            try:
+                surface = load_image(path)
+            except Exception:
+                surface = None
+            self._decoded.put((path, surface))
+
+    def _finalize(self, path, surface):
+        sprite_cache.add_surface(path, surface)
+        self.loaded += 1
+
+    def pump(self, budget=0.004):
+        """Finalize decoded images for up to `budget` seconds. Returns True when done."""
+        start = time.perf_counter()
+        while self.loaded < self.total:
+            try:
+                path, surface = self._decoded.get_nowait()
+            except queue.Empty:
+                break
+            self._finalize(path, surface)
+            if time.perf_counter() - start >= budget:
+                break
+        return self.done
+
+    def finish(self):
+        """Block until every image is decoded and finalized."""
+        self.start()
+        while self.loaded < self.total:
+            self._finalize(*self._decoded.get())
+
+    @property
+    def done(self):
+        return self.loaded >= self.total
+
+    @property
+    def progress(self):
+        """Fraction (0..1) of the images finalized."""
+        return self.loaded / self.total if self.total else 1.0
+
+    def draw_progress(self, screen, height=6, color=(90, 90, 90)):
+        """Thin loading bar along the bottom of `screen` (nothing once done)."""
+        if self.done:
+            return
+        w, h = screen.get_size()
+        pygame.draw.rect(screen, color, (0, h - height, int(w * self.progress), height))
+
+
+def warm_sprites(camera_scales=None):
+    """Build the derived sprites enemies and scenery need on first use.
+
+    Covers every MINION_SPRITES / MINIBOSS_SPRITES type (including the
+    scaled attack robot), their masks and wobble rotation tables, the
+    tree/bush footprint masks, and the item drop label font at each of
+    `camera_scales`: the camera scales the world will be drawn at (world
+    surface width / view width; default RENDER_SCALES, which only matches
+    a display as tall as the view).
+    """
+    from Characters.minion import Minion
+    from Characters.mini_boss import MiniBoss
+    from Objects.tree import Tree
+    from Objects.bush import Bush
+    from Objects.item_drop import name_font
+    from render_target import RENDER_SCALES
+    for scale in camera_scales or RENDER_SCALES:
+        name_font(scale)
+    for cls, types in ((Minion, Minion.MINION_SPRITES), (MiniBoss, MiniBoss.MINIBOSS_SPRITES)):
+        for kind in types:
+            enemy = cls((0, 0), kind)
+            enemy.get_mask()
+            enemy.get_tilted_image()
+    for cls in (Tree, Bush):
+        cls((0, 0)).get_partial_mask_bottom_third()
@@ -0,0 +1,118 @@
+import math
+import pygame
+from collections import OrderedDict
+
+
+class BackgroundRenderer:
+    """Draws the tiled paper background from pre-baked chunk surfaces.
+
+    Each chunk is a block of whole tiles (tile image plus its faint grid border)
+    rendered once into a single Surface. Chunks are at least as large as the
+    screen, so a frame blits between 1 and 4 of them, and recently used chunks
+    are kept in a small LRU so walking back and forth doesn't re-bake them.
+    When the camera has a render scale, chunks are baked at that scale (and
+    re-baked if it changes).
+    """
+
+    def __init__(self, tile, world_size, view_size, max_chunks=9,
+                 border_color=(0, 0, 0, 50)):
+        """
+        Args:
+            tile: Background tile Surface (drawn unscaled)
+            world_size: (world_w, world_h); tiles past these bounds are skipped.
+                None tiles an unbounded (endless) world
+            view_size: (screen_w, screen_h) visible area, used to size chunks
+            max_chunks: Number of baked chunks kept in the LRU
+            border_color: RGBA color of the 1px border around each tile
+        """
+        self.tile = tile
+        self.tile_w, self.tile_h = tile.get_size()
+        self.bounded = world_size is not None
+        self.world_w, self.world_h = world_size if self.bounded else (0, 0)
+        self.max_chunks = max(4, max_chunks)
+
+        # Whole tiles per chunk, enough to cover the view in each direction
+        view_w, view_h = view_size
+        self.tiles_x = max(1, -(-int(view_w) // self.tile_w))
+        self.tiles_y = max(1, -(-int(view_h) // self.tile_h))
+        self.chunk_w = self.tiles_x * self.tile_w
+        self.chunk_h = self.tiles_y * self.tile_h
+
+        # Semi-transparent 1px border drawn over every tile (built once)
+        self.border = pygame.Surface((self.tile_w, self.tile_h), pygame.SRCALPHA)
+        pygame.draw.rect(self.border, border_color, (0, 0, self.tile_w, self.tile_h), 1)
+
+        self._chunks = OrderedDict()  # (cx, cy) -> Surface
+        self.chunks_baked = 0
+        self.scale = 1.0
+
+    def _bake_chunk(self, cx, cy):
+        """Render all tiles of chunk (cx, cy) into one surface."""
+        chunk = pygame.Surface((self.chunk_w, self.chunk_h)).convert()
+        chunk.fill((0, 0, 0))
+        base_x = cx * self.chunk_w
+        base_y = cy * self.chunk_h
+        for iy in range(self.tiles_y):
+            tile_y = base_y + iy * self.tile_h
+            # Skip tiles outside the defined world bounds
+            if self.bounded and (tile_y + self.tile_h < 0 or tile_y > self.world_h):
+                continue
+            for ix in range(self.tiles_x):
+                tile_x = base_x + ix * self.tile_w
+                if self.bounded and (tile_x + self.tile_w < 0 or tile_x > self.world_w):
+                    continue
+                pos = (ix * self.tile_w, iy * self.tile_h)
+                chunk.blit(self.tile, pos)
+                chunk.blit(self.border, pos)
+        if self.scale != 1.0:
+            size = (math.ceil(self.chunk_w * self.scale), math.ceil(self.chunk_h * self.scale))
+            chunk = pygame.transform.smoothscale(chunk, size)
+        self.chunks_baked += 1
+        return chunk
+
+    def get_chunk(self, cx, cy):
+        """Return the baked surface for chunk (cx, cy), baking it on first use."""
+        key = (cx, cy)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+        chunk = self._bake_chunk(cx, cy)
+        self._chunks[key] = chunk
+        while len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)
+        return chunk
+
+    def clear(self):
+        """Drop all baked chunks (e.g. after the tile image changes)."""
+        self._chunks.clear()
+
+    def set_scale(self, scale):
+        """Bake chunks at `scale` pixels per world unit from now on."""
+        if scale != self.scale:
+            self.scale = scale
+            self.clear()
+
+    def draw(self, surface, camera):
+        """Blit the chunks covering the camera view onto `surface`."""
+        self.set_scale(camera.scale)
+        scale = self.scale
+        offset = camera.offset
+        view_w, view_h = camera.screen_w, camera.screen_h
+
+        first_cx = int(offset.x) // self.chunk_w
+        first_cy = int(offset.y) // self.chunk_h
+        last_cx = int(offset.x + view_w) // self.chunk_w
+        last_cy = int(offset.y + view_h) // self.chunk_h
+
+        for cy in range(first_cy, last_cy + 1):
+            chunk_y = cy * self.chunk_h
+            if self.bounded and (chunk_y + self.chunk_h < 0 or chunk_y > self.world_h):
+                continue
+            for cx in range(first_cx, last_cx + 1):
+                chunk_x = cx * self.chunk_w
+                if self.bounded and (chunk_x + self.chunk_w < 0 or chunk_x > self.world_w):
+                    continue
+                surface.blit(self.get_chunk(cx, cy),
+                             (math.floor((chunk_x - offset.x) * scale),
+                              math.floor((chunk_y - offset.y) * scale)))
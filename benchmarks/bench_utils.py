@@ -0,0 +1,98 @@
+"""Shared helpers for the benchmark scripts: percentiles, JSON output, baselines."""
+import json
+import os
+import platform
+import sys
+import time
+
+# Make the game modules importable when a script is run as `python benchmarks/<script>.py`
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (pct in 0..100)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples_ms):
+    """p50/p95/p99/mean/max of a list of millisecond samples."""
+    values = sorted(samples_ms)
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "max": values[-1] if values else 0.0,
+        "samples": len(values),
+    }
+
+
+def environment():
+    """Basic machine/library info stored alongside results."""
+    import pygame
+    info = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    try:
+        import numpy
+        info["numpy"] = numpy.__version__
+    except ImportError:
+        info["numpy"] = None
+    return info
+
+
+def write_json(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(results, baseline, metric="p95"):
+    """Compare two result files with the same `{group: {name: {metric: ms}}}` layout.
+
+    Returns a list of (group, name, baseline_ms, current_ms, change) for every
+    entry present in both, where change is the relative difference
+    (0.25 = 25% slower); see `regressions`.
+    """
+    rows = []
+    for group, entries in results.items():
+        base_entries = baseline.get(group)
+        if not isinstance(entries, dict) or not isinstance(base_entries, dict):
+            continue
+        for name, stats in entries.items():
+            base = base_entries.get(name)
+            if not isinstance(stats, dict) or not isinstance(base, dict):
+                continue
+            if metric not in stats or metric not in base:
+                continue
+            old, new = base[metric], stats[metric]
+            change = (new - old) / old if old > 0 else 0.0
+            rows.append((group, name, old, new, change))
+    return rows
+
+
+def regressions(rows, threshold=0.10):
+    return [row for row in rows if row[4] > threshold]
+
+
+def print_comparison(rows, threshold=0.10, metric="p95"):
+    unit = "us" if metric.endswith("_us") else "ms"
+    width = max([len(name) for _, name, _, _, _ in rows] + [5]) + 2
+    print(f"\n{'':<28}{'entry':<{width}}{'base ' + metric:>14}{'now ' + metric:>14}{'change':>10}")
+    for group, name, old, new, change in rows:
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{group:<28}{name:<{width}}{old:>12.3f}{unit}{new:>12.3f}{unit}{change:>+10.1%}{flag}")
@@ -0,0 +1,102 @@
+"""Cold-start benchmark: time from process start until every image is usable.
+
+Each sample is a fresh `python` process that initializes the display and
+loads every game image into sprite_cache (AssetPreloader.finish), once per
+mode:
+
+    loose       the PNG/JPG files under assets/ (PAPERTRAIL_ASSET_PACK=0)
+    pack        a raw asset pack (zero-copy from the mmap)
+    pack-zlib   a zlib-compressed asset pack (what PaperTrail.spec ships)
+
+The packs are built into a temp dir first. Where the OS allows it (Linux,
+as root) the page cache is dropped before every sample so file reads are
+really cold; otherwise the numbers are warm-cache and say so.
+
+    python benchmarks/coldstart.py [--runs 10] [--out coldstart.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import bench_utils
+
+import asset_pack
+
+CHILD = r"""
+import time
+start = time.perf_counter()
+import os, sys, json
+sys.path.insert(0, ROOT)
+from game_session import init_headless
+init_headless()
+imported = time.perf_counter()
+from asset_preloader import AssetPreloader
+preloader = AssetPreloader()
+preloader.finish()
+done = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "assets_ms": (done - imported) * 1000,
+                  "total_ms": (done - start) * 1000, "images": preloader.total}))
+"""
+
+
+def _drop_caches():
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except OSError:
+        return False
+
+
+def _sample(pack_setting):
+    env = dict(os.environ, PAPERTRAIL_ASSET_PACK=pack_setting, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    code = CHILD.replace("ROOT", repr(bench_utils.ROOT))
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--out", default="benchmarks/results/coldstart.json", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    asset_dir = os.path.join(bench_utils.ROOT, "assets")
+    with tempfile.TemporaryDirectory() as tmp:
+        modes = {"loose": "0"}
+        for name, compress in (("pack", False), ("pack-zlib", True)):
+            path = os.path.join(tmp, f"{name}.pak")
+            asset_pack.build(asset_dir, path, compress)
+            modes[name] = path
+
+        cold = _drop_caches()
+        print(f"{'cold' if cold else 'warm'} page cache, {args.runs} runs per mode")
+        samples = {mode: [] for mode in modes}
+        for _ in range(args.runs):
+            # Interleave modes so drift affects them equally
+            for mode, setting in modes.items():
+                _drop_caches()
+                samples[mode].append(_sample(setting))
+
+        results = {}
+        for mode, runs in samples.items():
+            entry = {key: bench_utils.summarize([r[key] for r in runs]) for key in ("assets_ms", "total_ms")}
+            entry["images"] = runs[0]["images"]
+            if modes[mode] != "0":
+                entry["archive_bytes"] = os.path.getsize(modes[mode])
+            results[mode] = entry
+            print(f"  {mode:<10} assets p50 {entry['assets_ms']['p50']:7.1f}ms   "
+                  f"startup p50 {entry['total_ms']['p50']:7.1f}ms   ({entry['images']} images)")
+
+    bench_utils.write_json(args.out, {"environment": bench_utils.environment(), "cold_cache": cold,
+                                      "modes": results})
+    print(f"wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+"""Microbenchmarks for the hot helpers: spatial grids, collision.py and Enemy.update.
+
+Each benchmark is run over a small parameter sweep (e.g. objects per cell
+1..100) and reports the per-call cost in microseconds (best and median of
+several repeats). Results are written as JSON:
+
+    {"environment": {...},
+     "benchmarks": {"spatial_grid.get_nearby": {"cell=256 radius=1 per_cell=10": {"median_us": ...}}}}
+
+Usage:
+    python benchmarks/micro.py                          # everything
+    python benchmarks/micro.py spatial_grid collision   # names starting with these prefixes
+    python benchmarks/micro.py --quick --out micro.json --baseline benchmarks/micro_baseline.json
+"""
+import argparse
+import random
+import sys
+import time
+
+import bench_utils
+
+from game_session import init_headless
+
+PER_CELL = (1, 10, 25, 50, 100)
+GRID_CELLS = 16  # grids are GRID_CELLS x GRID_CELLS cells
+
+# name -> function(quick) yielding (label, fn, calls_per_fn)
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+class _Point:
+    """Minimal positioned object for grid benchmarks."""
+
+    def __init__(self, x, y):
+        import pygame
+        self.pos = pygame.Vector2(x, y)
+
+
+class _Sprite:
+    """Weak-referenceable object with a filled-circle image (no partial-mask helper)."""
+
+    def __init__(self, size, pos=(0, 0)):
+        import pygame
+        self.pos = pygame.Vector2(pos)
+        self._image = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(self._image, (255, 0, 0), (size // 2, size // 2), size // 2)
+
+    def get_image(self):
+        return self._image
+
+
+def _points(count, extent, rng):
+    return [_Point(rng.uniform(0, extent), rng.uniform(0, extent)) for _ in range(count)]
+
+
+def time_call(fn, calls, repeat, min_time=0.05):
+    """Return per-call seconds (best, median) over `repeat` timed runs of fn().
+
+    fn() performs `calls` operations; it is run enough times per repeat to
+    take at least `min_time` seconds.
+    """
+    start = time.perf_counter()
+    fn()
+    once = max(time.perf_counter() - start, 1e-7)
+    number = max(1, int(min_time / once))
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        results.append((time.perf_counter() - start) / (number * calls))
+    results.sort()
+    return results[0], results[len(results) // 2]
+
+
+@benchmark("spatial_grid.insert")
+def bench_grid_insert(quick):
+    from spatial_grid import SpatialGrid
+    for cell in ((256,) if quick else (64, 128, 256, 512)):
+        extent = cell * GRID_CELLS
+        for per_cell in PER_CELL:
+            objs = _points(per_cell * GRID_CELLS * GRID_CELLS, extent, random.Random(per_cell))
+
+            def run(objs=objs, cell=cell, extent=extent):
+                grid = SpatialGrid(extent, extent, cell_size=cell)
+                for obj in objs:
+                    grid.insert(obj)
+            yield f"cell={cell} per_cell={per_cell}", run, len(objs)
+
+
+@benchmark("spatial_grid.get_nearby")
+def bench_grid_nearby(quick):
+    from spatial_grid import SpatialGrid
+    for cell in ((256,) if quick else (64, 256, 512)):
+        extent = cell * GRID_CELLS
+        for per_cell in PER_CELL:
+            rng = random.Random(per_cell)
+            grid = SpatialGrid(extent, extent, cell_size=cell)
+            for obj in _points(per_cell * GRID_CELLS * GRID_CELLS, extent, rng):
+                grid.insert(obj)
+            queries = [_Point(rng.uniform(0, extent), rng.uniform(0, extent)).pos for _ in range(200)]
+            for radius in (1, 2, 5):
+                def run(grid=grid, queries=queries, radius=radius):
+                    for q in queries:
+                        grid.get_nearby(q, radius)
+                yield f"cell={cell} radius={radius} per_cell={per_cell}", run, len(queries)
+
+
+@benchmark("dynamic_grid.move")
+def bench_dynamic_move(quick):
+    from spatial_grid import DynamicSpatialGrid
+    cell = 256
+    extent = cell * GRID_CELLS
+    for per_cell in PER_CELL:
+        rng = random.Random(per_cell)
+        objs = _points(per_cell * GRID_CELLS * GRID_CELLS, extent, rng)
+        grid = DynamicSpatialGrid(cell)
+        for obj in objs:
+            grid.insert(obj)
+        steps = [(rng.uniform(-3, 3), rng.uniform(-3, 3)) for _ in objs]
+
+        def run(grid=grid, objs=objs, steps=steps):
+            for obj, (dx, dy) in zip(objs, steps):
+                obj.pos.x += dx
+                obj.pos.y += dy
+                grid.move(obj)
+            for obj, (dx, dy) in zip(objs, steps):
+                obj.pos.x -= dx
+                obj.pos.y -= dy
+                grid.move(obj)
+        yield f"cell={cell} per_cell={per_cell}", run, 2 * len(objs)
+
+
+@benchmark("dynamic_grid.get_nearby")
+def bench_dynamic_nearby(quick):
+    from spatial_grid import DynamicSpatialGrid
+    cell = 256
+    extent = cell * GRID_CELLS
+    for per_cell in PER_CELL:
+        rng = random.Random(per_cell)
+        grid = DynamicSpatialGrid(cell)
+        for obj in _points(per_cell * GRID_CELLS * GRID_CELLS, extent, rng):
+            grid.insert(obj)
+        queries = [_Point(rng.uniform(0, extent), rng.uniform(0, extent)).pos for _ in range(200)]
+
+        def run(grid=grid, queries=queries):
+            for q in queries:
+                grid.get_nearby(q, 1)
+        yield f"cell={cell} radius=1 per_cell={per_cell}", run, len(queries)
+
+
+@benchmark("collision.get_partial_mask")
+def bench_partial_mask(quick):
+    import collision
+    import sprite_cache
+    for size in ((64,) if quick else (32, 64, 128, 256)):
+        obj = _Sprite(size)
+
+        def uncached(obj=obj):
+            collision._partial_cache.pop(obj, None)
+            sprite_cache._partial_masks.pop((id(collision.get_mask(obj)), 1/3), None)
+            collision.get_partial_mask(obj)
+        yield f"uncached size={size}", uncached, 1
+
+        collision.get_partial_mask(obj)
+
+        def cached(obj=obj):
+            collision.get_partial_mask(obj)
+        yield f"cached size={size}", cached, 1
+
+
+def _overlap_cases(size):
+    """Positions of a second sprite relative to one at the origin: rect miss, pixel miss, hit."""
+    return {
+        "rect_miss": (size * 2, 0),
+        # Bounding boxes overlap at the corner but the circles don't
+        "pixel_miss": (int(size * 0.9), int(size * 0.9)),
+        "hit": (size // 4, 0),
+    }
+
+
+@benchmark("collision.mask_vs_object")
+def bench_mask_vs_object(quick):
+    import pygame
+    import collision
+    for size in ((64,) if quick else (32, 64, 128)):
+        obj = _Sprite(size)
+        other_mask = pygame.mask.from_surface(_Sprite(size).get_image())
+        for case, offset in _overlap_cases(size).items():
+            pos = pygame.Vector2(offset)
+            for partial in (False, True):
+                def run(obj=obj, other_mask=other_mask, pos=pos, partial=partial):
+                    collision.mask_vs_object(other_mask, pos, obj, use_obj_partial=partial)
+                yield f"size={size} {case} partial={partial}", run, 1
+
+
+@benchmark("collision.objects_overlap")
+def bench_objects_overlap(quick):
+    import pygame
+    import collision
+    for size in ((64,) if quick else (32, 64, 128)):
+        a = _Sprite(size)
+        b = _Sprite(size)
+        origin = pygame.Vector2(0, 0)
+        for case, offset in _overlap_cases(size).items():
+            pos = pygame.Vector2(offset)
+
+            def run(a=a, b=b, origin=origin, pos=pos):
+                collision.objects_overlap(a, origin, b, pos)
+            yield f"size={size} {case}", run, 1
+
+
+class _Target:
+    def __init__(self, pos):
+        import pygame
+        self.pos = pygame.Vector2(pos)
+
+
+def _enemy_setup(blocked, others_count, use_bitmap):
+    """One minion walking toward a target, optionally with a tree in the way, plus crowd."""
+    import pygame
+    from Characters.minion import Minion
+    from Objects.tree import Tree
+    from spatial_grid import SpatialGrid, DynamicSpatialGrid
+    from obstacle_map import ObstacleMap
+
+    rng = random.Random(others_count)
+    start = pygame.Vector2(1000, 1000)
+    target = _Target((1000, 600))
+    objects = []
+    if blocked:
+        tree = Tree((0, 0))
+        # Put the tree's bottom-third footprint right on the enemy's path
+        tree.pos = pygame.Vector2(start.x, start.y - tree.get_image().get_height() / 3 - 20)
+        objects.append(tree)
+    grid = SpatialGrid(2048, 2048, cell_size=256)
+    for obj in objects:
+        grid.insert(obj)
+    obstacle_map = ObstacleMap.from_objects(objects) if use_bitmap else None
+
+    enemy = Minion(start)
+    enemies = [enemy]
+    enemy_grid = DynamicSpatialGrid(256)
+    enemy_grid.insert(enemy)
+    for _ in range(others_count):
+        other = Minion((start.x + rng.uniform(-128, 128), start.y + rng.uniform(-128, 128)))
+        enemies.append(other)
+        enemy_grid.insert(other)
+    return enemy, start, target, objects, grid, enemies, enemy_grid, obstacle_map
+
+
+@benchmark("enemy.update")
+def bench_enemy_update(quick):
+    for blocked in (False, True):
+        for use_bitmap in ((True,) if quick else (False, True)):
+            for others in ((0, 10) if quick else (0, 1, 10, 25, 50, 100)):
+                (enemy, start, target, objects, grid, enemies,
+                 enemy_grid, obstacle_map) = _enemy_setup(blocked, others, use_bitmap)
+
+                def run(enemy=enemy, start=start, target=target, objects=objects, grid=grid,
+                        enemies=enemies, enemy_grid=enemy_grid, obstacle_map=obstacle_map):
+                    enemy.pos = start.copy()
+                    enemy.update(1 / 60, target, objects, grid, enemies, enemy_grid, obstacle_map)
+                field = "blocked" if blocked else "open"
+                collision_kind = "bitmap" if use_bitmap else "per_object"
+                yield f"{field} {collision_kind} others={others}", run, 1
+
+
+@benchmark("world_gen.scatter")
+def bench_scatter(quick):
+    import world_gen
+    tile_w, tile_h = 626, 417
+    for side in ((2, 10) if quick else (2, 10, 30)):
+        def run(side=side):
+            world_gen.scatter_region(0, 0, side * tile_w, side * tile_h, world_gen.region_key(side, 0), 2 * side * side)
+        yield f"tiles={side}x{side}", run, 1
+
+
+def run_benchmarks(prefixes=None, quick=False, repeat=5):
+    results = {}
+    for name, func in BENCHMARKS.items():
+        if prefixes and not any(name.startswith(p) for p in prefixes):
+            continue
+        print(name)
+        entries = {}
+        for label, fn, calls in func(quick):
+            best, median = time_call(fn, calls, repeat)
+            entries[label] = {"min_us": best * 1e6, "median_us": median * 1e6, "calls": calls}
+            print(f"  {label:<40}{median * 1e6:>12.3f}us")
+        results[name] = entries
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("prefixes", nargs="*", help="only run benchmarks whose name starts with one of these")
+    parser.add_argument("--quick", action="store_true", help="smaller sweeps")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", default="benchmarks/results/micro.json", help="JSON results path")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--metric", default="min_us", choices=["min_us", "median_us"],
+                        help="statistic compared against the baseline (min is least noisy)")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="relative slowdown that counts as a regression (default 0.15)")
+    args = parser.parse_args(argv)
+
+    init_headless()
+    results = {
+        "environment": bench_utils.environment(),
+        "benchmarks": run_benchmarks(args.prefixes, args.quick, args.repeat),
+    }
+    bench_utils.write_json(args.out, results)
+    print(f"wrote {args.out}")
+
+    if args.baseline:
+        baseline = bench_utils.load_json(args.baseline)
+        rows = bench_utils.compare(results["benchmarks"], baseline.get("benchmarks", {}), args.metric)
+        bench_utils.print_comparison(rows, args.threshold, args.metric)
+        if bench_utils.regressions(rows, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
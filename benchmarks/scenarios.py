@@ -0,0 +1,209 @@
+"""Scenario benchmarks: run whole game frames headless and report per-subsystem cost.
+
+Every scenario builds a real GameSession (seeded), so the measured work is
+the actual Enemy.update, projectile loop, Player.auto_fire and render pass.
+Each frame's time is split into the GameSession phases plus "render" and
+"frame" (the total), and reported as p50/p95/p99 in milliseconds.
+
+Usage:
+    python benchmarks/scenarios.py                      # all scenarios
+    python benchmarks/scenarios.py horde_500 waves      # a subset
+    python benchmarks/scenarios.py --out results.json --baseline benchmarks/baseline.json
+    python benchmarks/scenarios.py --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import os
+import sys
+import time
+
+import bench_utils
+
+import counters
+
+from game_session import init_headless, GameSession, BG_TILE_PATH, WAVES, WAVE_SPAWN_DURATION
+
+DT = 1.0 / 60.0
+WARMUP_FRAMES = 30
+
+
+def _player_class():
+    from Characters.ninjircle import Ninjircle
+    return Ninjircle
+
+
+def _horde(count):
+    def setup(session):
+        for _ in range(count):
+            session.spawn_minion()
+    return setup
+
+
+def _all_weapons(session):
+    """Equip every weapon item and keep the manual attack firing each frame."""
+    from Objects.Weapons.ninja_stars import NinjaStars
+    from Objects.Weapons.wizard_confetti import WizardConfetti
+    from Objects.Weapons.squirrel_burst import SquirrelBurst
+    player = session.player
+    for weapon_class in (NinjaStars, WizardConfetti, SquirrelBurst):
+        if not any(isinstance(w, weapon_class) for w in player.active_weapons):
+            weapon = weapon_class()
+            player.inventory.add_item(weapon)
+            weapon.apply_effect(player)
+    for _ in range(300):
+        session.spawn_minion()
+
+
+def _attack_nearest(session):
+    """Per-frame hook for the weapons scenario: click-attack toward the nearest enemy."""
+    target = session.player.get_closest_enemy(session.enemies)
+    if target is not None:
+        session.attack(target.pos - session.player.pos, DT)
+
+
+def _bosses_in_trees(session):
+    """Place 20 mini bosses on the trees nearest the player so they path through foliage."""
+    from Characters.mini_boss import MiniBoss
+    import pygame
+    player_pos = session.player.pos
+    trees = [o for o in session.world.obstacles() if o.__class__.__name__ == "Tree"]
+    trees.sort(key=lambda t: (t.pos - player_pos).length_squared())
+    kinds = ["starficer", "attack_robot", "illuminawty"]
+    # Skip the closest few so bosses start outside contact range
+    for i, tree in enumerate(trees[5:25]):
+        boss = MiniBoss(tree.pos + pygame.Vector2(0, 60), miniboss_type=kinds[i % len(kinds)])
+        session.add_enemy(boss)
+
+
+# name -> (setup(session), frames, extra session kwargs, per-frame hook)
+SCENARIOS = {
+    "horde_500": (_horde(500), 300, {"waves": []}, None),
+    "horde_2000": (_horde(2000), 120, {"waves": []}, None),
+    "horde_5000": (_horde(5000), 60, {"waves": []}, None),
+    "all_weapons": (_all_weapons, 600, {"waves": []}, _attack_nearest),
+    "bosses_in_trees": (_bosses_in_trees, 600, {"waves": []}, None),
+    # The full wave table, run until the last wave has finished spawning
+    "waves": (None, int((WAVES[-1][0] + WAVE_SPAWN_DURATION + 5.0) / DT), {}, None),
+}
+
+
+def run_scenario(name, frames=None, seed=1, render=True, counters_csv=None):
+    """Run one scenario and return {"frames": n, "subsystems": {phase: stats}}.
+
+    With `counters_csv`, work counters are recorded too: their per-frame
+    means go into the result under "counters" and every frame is written to
+    that CSV path.
+    """
+    import pygame
+    from background import BackgroundRenderer
+
+    setup, default_frames, kwargs, hook = SCENARIOS[name]
+    frames = frames or default_frames
+    session = GameSession(_player_class(), seed=seed, **kwargs)
+    if setup is not None:
+        setup(session)
+
+    screen = background = None
+    if render:
+        screen = pygame.Surface((session.view_w, session.view_h))
+        tile = pygame.image.load(BG_TILE_PATH).convert()
+        background = BackgroundRenderer(tile, session.world.size, (session.view_w, session.view_h))
+
+    if counters_csv:
+        counters.clear()
+        counters.enable(capacity=frames)
+
+    samples = {}
+    for frame in range(WARMUP_FRAMES + frames):
+        timings = {}
+        start = time.perf_counter()
+        if hook is not None:
+            hook(session)
+        session.step(DT, timings)
+        if render:
+            render_start = time.perf_counter()
+            session.draw(screen, background)
+            timings["render"] = time.perf_counter() - render_start
+        timings["frame"] = time.perf_counter() - start
+        counters.end_frame()
+        if frame < WARMUP_FRAMES:
+            continue
+        for key, seconds in timings.items():
+            samples.setdefault(key, []).append(seconds * 1000.0)
+
+    result = {
+        "frames": frames,
+        "seed": seed,
+        "enemies_end": len(session.enemies),
+        "subsystems": {key: bench_utils.summarize(values) for key, values in samples.items()},
+    }
+    if counters_csv:
+        # The ring buffer holds exactly the measured frames (warmup rolled out)
+        history = counters.history()
+        totals = {}
+        for _, counts in history:
+            for key, value in counts.items():
+                totals[key] = totals.get(key, 0) + value
+        result["counters"] = {key: value / len(history) for key, value in totals.items()}
+        counters.dump_csv(counters_csv)
+        counters.disable()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--frames", type=int, help="override the number of measured frames")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-render", action="store_true", help="skip the render pass")
+    parser.add_argument("--out", default="benchmarks/results/scenarios.json", help="JSON results path")
+    parser.add_argument("--counters", metavar="DIR",
+                        help="record work counters; writes DIR/<scenario>_counters.csv")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--save-baseline", metavar="PATH", help="also write the results to PATH as a baseline")
+    parser.add_argument("--metric", default="p95", choices=["p50", "p95", "p99", "mean"])
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown that counts as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    init_headless()
+    results = {"environment": bench_utils.environment(), "scenarios": {}}
+    for name in names:
+        print(f"{name}...", end=" ", flush=True)
+        counters_csv = None
+        if args.counters:
+            os.makedirs(args.counters, exist_ok=True)
+            counters_csv = os.path.join(args.counters, f"{name}_counters.csv")
+        result = run_scenario(name, args.frames, args.seed, render=not args.no_render,
+                              counters_csv=counters_csv)
+        results["scenarios"][name] = result
+        frame = result["subsystems"]["frame"]
+        print(f"frame p50 {frame['p50']:.2f}ms p95 {frame['p95']:.2f}ms p99 {frame['p99']:.2f}ms")
+
+    bench_utils.write_json(args.out, results)
+    print(f"wrote {args.out}")
+    if args.save_baseline:
+        bench_utils.write_json(args.save_baseline, results)
+        print(f"wrote baseline {args.save_baseline}")
+
+    if args.baseline:
+        baseline = bench_utils.load_json(args.baseline)
+        rows = []
+        for name, result in results["scenarios"].items():
+            base = baseline.get("scenarios", {}).get(name)
+            if base is None:
+                continue
+            rows.extend(bench_utils.compare(
+                {name: result["subsystems"]}, {name: base["subsystems"]}, args.metric))
+        bench_utils.print_comparison(rows, args.threshold, args.metric)
+        if bench_utils.regressions(rows, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
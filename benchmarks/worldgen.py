@@ -0,0 +1,86 @@
+"""World generation benchmark: serial vs parallel chunk layouts.
+
+Generates every chunk layout of square bounded worlds with
+world_gen.generate_layouts, serially and with each worker count, checks the
+parallel output is identical to the serial one and reports wall time and
+speedup:
+
+    python benchmarks/worldgen.py                       # default sizes / workers
+    python benchmarks/worldgen.py --tiles 100 400 --workers 2 4 8 --out worldgen.json
+"""
+import argparse
+import os
+import sys
+import time
+
+import bench_utils
+
+import world_gen
+
+TILE_SIZE = (626, 417)
+
+
+def _layouts_equal(a, b):
+    if a.keys() != b.keys():
+        return False
+    return all(tuple(x.tolist() for x in a[key]) == tuple(x.tolist() for x in b[key]) for key in a)
+
+
+def _time(keys, bounds, workers, repeat):
+    best = None
+    layouts = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        layouts = world_gen.generate_layouts(keys, TILE_SIZE, 0, bounds, workers)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, layouts
+
+
+def run(tiles_per_side, worker_counts, repeat):
+    results = {}
+    for side in tiles_per_side:
+        bounds = (side * TILE_SIZE[0], side * TILE_SIZE[1])
+        world = world_gen.World(bounds, TILE_SIZE, (1920, 1080))
+        keys = world.all_chunks()
+        serial, expected = _time(keys, bounds, 0, repeat)
+        obstacles = sum(len(layout.kinds) for layout in expected.values())
+        print(f"{side}x{side} tiles: {len(keys)} chunks, {obstacles} obstacles")
+        print(f"  serial      {serial * 1000:>9.1f}ms")
+        entry = {"chunks": len(keys), "obstacles": obstacles, "serial_ms": serial * 1000, "workers": {}}
+        for workers in worker_counts:
+            elapsed, layouts = _time(keys, bounds, workers, repeat)
+            identical = _layouts_equal(layouts, expected)
+            print(f"  workers={workers:<3} {elapsed * 1000:>9.1f}ms  x{serial / elapsed:.2f}"
+                  f"{'' if identical else '  MISMATCH'}")
+            entry["workers"][str(workers)] = {"ms": elapsed * 1000, "speedup": serial / elapsed,
+                                              "identical": identical}
+        results[f"{side}x{side}"] = entry
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tiles", type=int, nargs="+", default=[12, 50, 200],
+                        help="world sizes, in tiles per side")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({2, 4, os.cpu_count() or 1} - {0, 1}))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default="benchmarks/results/worldgen.json", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    results = {
+        "environment": bench_utils.environment(),
+        "numpy": world_gen.HAS_NUMPY,
+        "cpu_count": os.cpu_count(),
+        "sizes": run(args.tiles, args.workers, args.repeat),
+    }
+    bench_utils.write_json(args.out, results)
+    print(f"wrote {args.out}")
+    if any(not w["identical"] for size in results["sizes"].values() for w in size["workers"].values()):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,32 @@
 import pygame
+import sprite_cache
 
 class Camera:
 	def __init__(self, screen_size, world_size):
 		self.screen_w, self.screen_h = screen_size
-		self.world_w, self.world_h = world_size
+		# None: unbounded (endless) world, the camera is never clamped
+		self.world_w, self.world_h = world_size if world_size is not None else (None, None)
 		self.offset = pygame.Vector2(0, 0)
+		# Render scale: drawing surface pixels per world unit (below 1 renders at a lower resolution)
+		self.scale = 1.0
 
 	def update(self, target_pos: pygame.Vector2):
 		x = target_pos.x - self.screen_w / 2
 		y = target_pos.y - self.screen_h / 2
 
 		# Clamp to world bounds so camera doesn't show outside the world
-		x = max(0, min(x, self.world_w - self.screen_w))
-		y = max(0, min(y, self.world_h - self.screen_h))
+		if self.world_w is not None:
+			x = max(0, min(x, self.world_w - self.screen_w))
+			y = max(0, min(y, self.world_h - self.screen_h))
 
 		self.offset.update(x, y)
 
 	def apply(self, pos: pygame.Vector2) -> pygame.Vector2:
-		return pygame.Vector2(pos.x - self.offset.x, pos.y - self.offset.y)
\ No newline at end of file
+		scale = self.scale
+		return pygame.Vector2((pos.x - self.offset.x) * scale, (pos.y - self.offset.y) * scale)
+
+	def scaled(self, image):
+		"""`image` at the render scale; only pass shared (sprite_cache or long-lived) surfaces."""
+		if self.scale == 1.0 or image is None:
+			return image
+		return sprite_cache.get_scaled(image, self.scale)
@@ -1,7 +1,7 @@
 import pygame
-import os
 from weakref import WeakKeyDictionary
-from asset_manager import get_asset_path
+import sprite_cache
+import counters
 
 # Cache masks and partial masks per object to avoid regenerating each frame
 _mask_cache = WeakKeyDictionary()
@@ -21,24 +21,30 @@ def _load_surface_from(obj):
     if hasattr(obj, '_image') and obj._image is not None:
         return obj._image
     if hasattr(obj, 'image_path') and obj.image_path:
-        path = obj.image_path
-        if (not os.path.isabs(path)) and (not os.path.exists(path)):
-            path = get_asset_path(os.path.basename(path))
-        try:
-            return pygame.image.load(path).convert_alpha()
-        except Exception:
-            return None
+        return sprite_cache.get_surface(obj.image_path)
     return None
 
 
 def get_mask(obj):
     """Return a pygame.mask.Mask for `obj`, caching the result."""
     if obj in _mask_cache:
+        if counters.enabled:
+            counters.incr("collision.mask_cache_hit")
         return _mask_cache[obj]
-    surf = _load_surface_from(obj)
-    if surf is None:
-        return None
-    mask = pygame.mask.from_surface(surf)
+    if counters.enabled:
+        counters.incr("collision.mask_cache_miss")
+    # Entities expose their (shared) sprite mask directly
+    mask = None
+    if hasattr(obj, 'get_mask'):
+        try:
+            mask = obj.get_mask()
+        except Exception:
+            mask = None
+    if mask is None:
+        surf = _load_surface_from(obj)
+        if surf is None:
+            return None
+        mask = pygame.mask.from_surface(surf)
     _mask_cache[obj] = mask
     return mask
 
@@ -48,17 +54,13 @@ def get_partial_mask(obj, fraction=1/3):
     d = _partial_cache.setdefault(obj, {})
     if fraction in d:
         return d[fraction]
+    if fraction == 1/3 and hasattr(obj, 'get_partial_mask_bottom_third'):
+        d[fraction] = obj.get_partial_mask_bottom_third()
+        return d[fraction]
     full = get_mask(obj)
     if full is None:
         return None
-    w, h = full.get_size()
-    part_h = max(1, int(h * fraction))
-    partial = pygame.mask.Mask((w, part_h))
-    for y in range(part_h):
-        for x in range(w):
-            src_y = h - part_h + y
-            if full.get_at((x, src_y)):
-                partial.set_at((x, y), True)
+    partial = sprite_cache.get_partial_mask(full, fraction)
     d[fraction] = partial
     return partial
 
@@ -96,8 +98,12 @@ def mask_vs_object(other_mask, other_pos, obj, use_obj_partial=False, fraction=1
                              other_size[0], other_size[1])
 
     if not rect_obj.colliderect(rect_other):
+        if counters.enabled:
+            counters.incr("collision.rect_reject")
         return False
 
+    if counters.enabled:
+        counters.incr("collision.mask_overlap")
     offset = (rect_other.x - rect_obj.x, rect_other.y - rect_obj.y)
     try:
         return obj_mask.overlap(other_mask, offset) is not None
@@ -128,10 +134,45 @@ def objects_overlap(a, pos_a, b, pos_b, use_a_partial=False, use_b_partial=False
         rect_b.y = int(pos_b.y + surf_b.get_height() / 3)
 
     if not rect_a.colliderect(rect_b):
+        if counters.enabled:
+            counters.incr("collision.rect_reject")
         return False
 
+    if counters.enabled:
+        counters.incr("collision.mask_overlap")
     offset = (rect_b.x - rect_a.x, rect_b.y - rect_a.y)
     try:
         return mask_a.overlap(mask_b, offset) is not None
     except Exception:
         return True
+
+
+def find_projectile_hits(projectiles, enemies, enemy_grid):
+    """Broadphase projectile-vs-enemy pass. Returns a list of (projectile, enemy) hits.
+
+    Each projectile only tests enemies from nearby cells of `enemy_grid` (a
+    DynamicSpatialGrid holding `enemies`), using the circle test from
+    `check_collision_with_enemy`. Like the old nested loop, each projectile
+    reports at most one hit: the first colliding enemy in `enemies` order.
+    """
+    hits = []
+    if not projectiles or not enemies:
+        return hits
+
+    max_enemy_radius = max(e.get_collision_radius() for e in enemies)
+    order = None
+
+    for p in projectiles:
+        if getattr(p, 'active', True) is False:
+            continue
+        reach = p.get_collision_radius() + max_enemy_radius
+        candidates = [e for e in enemy_grid.get_in_range(p.pos, reach)
+                      if p.check_collision_with_enemy(e)]
+        if not candidates:
+            continue
+        if len(candidates) > 1:
+            if order is None:
+                order = {e: i for i, e in enumerate(enemies)}
+            candidates.sort(key=lambda e: order.get(e, len(order)))
+        hits.append((p, candidates[0]))
+    return hits
@@ -0,0 +1,107 @@
+"""Per-frame work counters (mask overlaps, grid cells scanned, cache hits, ...).
+
+Hot code counts events with a guarded increment, so a disabled registry
+costs one attribute check:
+
+    import counters
+    if counters.enabled:
+        counters.incr("collision.rect_reject")
+
+`end_frame()` moves the current counts into a ring buffer of per-frame
+snapshots that the performance overlay reads and `dump_csv` writes out.
+Comparing counts with frame times tells algorithmic blowups (counts grow)
+from constant-factor slowness (counts flat, time up).
+
+Counter names used in the game:
+    collision.mask_overlap    Mask.overlap calls in collision.py
+    collision.rect_reject     overlap tests rejected by bounding rects
+    collision.mask_cache_hit / collision.mask_cache_miss
+    grid.queries / grid.cells_scanned / grid.objects_returned
+    bitmap.queries            ObstacleMap bitmap overlap queries
+    sprite_cache.hit / sprite_cache.miss
+    sprite_cache.rotation_hit / sprite_cache.rotation_miss
+                              shared rotation tables reused / built
+    enemy.updates / enemy.blocked / enemy.retries
+"""
+import atexit
+import csv
+import os
+from collections import deque
+
+enabled = False
+
+_counts = {}
+_history = deque(maxlen=600)  # (frame, {name: count})
+_frame = 0
+
+
+def enable(capacity=None):
+    """Start counting. `capacity` resizes the ring buffer (frames kept)."""
+    global enabled, _history
+    if capacity is not None and capacity != _history.maxlen:
+        _history = deque(_history, maxlen=capacity)
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+    _counts.clear()
+
+
+def incr(name, amount=1):
+    _counts[name] = _counts.get(name, 0) + amount
+
+
+def end_frame():
+    """Snapshot this frame's counts into the ring buffer and start a new frame."""
+    global _frame
+    if not enabled:
+        return
+    _history.append((_frame, dict(_counts)))
+    _counts.clear()
+    _frame += 1
+
+
+def current():
+    """Counts accumulated so far in the current frame."""
+    return dict(_counts)
+
+
+def latest():
+    """Counts of the most recent completed frame ({} if none)."""
+    return _history[-1][1] if _history else {}
+
+
+def history():
+    """List of (frame, counts) snapshots, oldest first."""
+    return list(_history)
+
+
+def clear():
+    global _frame
+    _counts.clear()
+    _history.clear()
+    _frame = 0
+
+
+def dump_csv(path):
+    """Write the ring buffer as CSV: one row per frame, one column per counter."""
+    rows = list(_history)
+    names = sorted({name for _, counts in rows for name in counts})
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["frame"] + names)
+        for frame, counts in rows:
+            writer.writerow([frame] + [counts.get(name, 0) for name in names])
+    return path
+
+
+def start_from_env():
+    """If PAPERTRAIL_COUNTERS=<csv path> is set, count from startup and dump the CSV at exit."""
+    path = os.environ.get("PAPERTRAIL_COUNTERS")
+    if not path:
+        return False
+    enable()
+    atexit.register(dump_csv, path)
+    return True
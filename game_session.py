@@ -0,0 +1,679 @@
+"""Game state and per-frame simulation, independent of the window.
+
+A GameSession is one run of the game: the generated World, the player,
+enemies, waves, pickups and projectiles. `step(dt)` advances it by an
+explicit time step and never touches the display, the event queue or the
+real clock, so a session can be driven headless (see `init_headless`) by
+benchmarks or a server. Drawing is a separate, optional `draw(surface)`.
+
+main() owns the window, menus and HUD and wraps a GameSession per run.
+"""
+import os
+import random
+import time
+import pygame
+import profiler
+from camera import Camera
+from Objects.pie import Pie
+from Objects.item_drop import ItemDrop
+from Objects.Equipment.quicks import Quicks
+from Objects.Weapons.ninja_stars import NinjaStars
+from Objects.Weapons.wizard_confetti import WizardConfetti
+from Objects.Weapons.squirrel_burst import SquirrelBurst
+from Objects.Weapons.weapon import Weapon
+from spatial_grid import LayeredSpatialGrid
+from world_gen import World, CHUNK_OVERHANG
+from horde import HordeEngine, HAS_NUMPY
+from Characters.minion import Minion
+from Characters.mini_boss import MiniBoss
+from radius_weapon import RadiusWeapon
+from collision import find_projectile_hits
+from targeting import TargetingService
+from asset_manager import get_asset_path, load_image
+
+
+# Sizes and distances below are in world units, independent of the display: a 4K
+# monitor shows the same part of the same world as a 1080p one, drawn at a larger
+# Camera.scale, so simulation cost doesn't depend on the display.
+
+# Visible area; its height is fixed and the width follows the display's aspect
+# ratio (see view_size_for_display). Also the view used by headless runs.
+DEFAULT_VIEW_SIZE = (1920, 1080)
+
+# World size (3.75 default views, so the player can move through the environment)
+WORLD_SIZE = (7200, 4050)
+
+# Pies and item drops spawn at least this far from the world center
+PICKUP_SPAWN_DISTANCE = 960
+# Enemies spawn at least this far from the world center (outside the starting view)
+ENEMY_SPAWN_DISTANCE = 1920
+
+# Border distance from world edge (player radius = 40)
+BORDER_DISTANCE = 40
+
+# Background tile; trees and bushes are generated per tile (see world_gen)
+BG_TILE_PATH = get_asset_path("paper_bg_3.png")
+
+# Wave system: list of (wave_time_seconds, wave_minion_count, wave_miniboss_count)
+WAVES = [
+    (0.0, 30, 0),      # Initial wave at 0:00 with 30 minions
+    (10.0, 50, 0),     # Second wave at 0:10 with 50 minions
+    (25.0, 50, 5),     # Third wave at 0:25 with 50 minions and 5 mini bosses
+]
+WAVE_SPAWN_DURATION = 10.0  # Spawn each wave over 10 seconds
+
+MAX_GAME_TIME = 20 * 60  # 20 minutes in seconds
+PIE_COUNT = 3
+ITEM_DROP_COUNT = 6
+
+# Move minions with the vectorized NumPy horde engine (opt-in: PAPERTRAIL_HORDE=1)
+USE_HORDE_ENGINE = HAS_NUMPY and os.environ.get("PAPERTRAIL_HORDE", "0") == "1"
+
+# Worker processes that pregenerate a bounded world's chunk layouts up front
+# (PAPERTRAIL_GEN_WORKERS; 0 generates each chunk lazily when it is first loaded)
+try:
+    GEN_WORKERS = int(os.environ.get("PAPERTRAIL_GEN_WORKERS", "0"))
+except ValueError:
+    GEN_WORKERS = 0
+
+
+def init_headless(size=(1, 1)):
+    """Initialize pygame without a real window (SDL dummy video driver).
+
+    A tiny display surface is still created because image loading uses
+    convert()/convert_alpha(). Returns that surface.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    return pygame.display.set_mode(size)
+
+
+def get_player_class(name):
+    """Playable character class by class name (e.g. "Ninjircle"), as stored in replays."""
+    from Characters.ninjircle import Ninjircle
+    from Characters.triangle_wizard import Tridolf
+    from Characters.sqwerewolf import Sqwerewolf
+    from Characters.starficer import Starficer
+    classes = {cls.__name__: cls for cls in (Ninjircle, Tridolf, Sqwerewolf, Starficer)}
+    return classes[name]
+
+
+def view_size_for_display(display_size):
+    """World-unit view size for a display: DEFAULT_VIEW_SIZE's height at the display's aspect ratio."""
+    display_w, display_h = display_size
+    view_h = DEFAULT_VIEW_SIZE[1]
+    return (max(1, round(view_h * display_w / display_h)), view_h)
+
+
+def get_tile_size():
+    """Size of the background tile, read without needing a display."""
+    return load_image(BG_TILE_PATH).get_size()
+
+
+class GameSession:
+    """One run of the game, advanced with an explicit `dt`.
+
+    Attributes mirror the old locals of main(): `player`, `enemies`,
+    `projectiles`, `pies`, `item_drops`, `game_timer`, plus the `world`,
+    `entity_grid` (LayeredSpatialGrid) and `camera`.
+    """
+
+    # Order in which step() runs the update phases (`_update_<phase>` methods);
+    # the names double as profiler zones
+    PHASES = ("waves", "player_move", "pickups", "projectiles", "auto_fire", "item_drops", "enemy_ai", "cleanup")
+
+    def __init__(self, player_class, view_size=DEFAULT_VIEW_SIZE, world_size=None, tile_size=None,
+                 seed=None, waves=None, use_horde=None, on_item_pickup=None, interpolate=False,
+                 endless=False):
+        """
+        Args:
+            player_class: Player subclass to play as
+            view_size: (width, height) of the visible area in world units
+            world_size: (width, height) of the world (default: WORLD_SIZE); for
+                an endless world, the area around the player where enemies spawn
+            tile_size: Generation tile size (default: the background tile's size)
+            seed: If given, seeds the global `random` module and the world layout for a reproducible run
+            waves: Wave table (default: WAVES)
+            use_horde: Drive minions with HordeEngine (default: USE_HORDE_ENGINE)
+            on_item_pickup: Optional callback(item) when an item drop is picked up
+            interpolate: Remember positions before each step so draw() can
+                interpolate between steps (for fixed-timestep loops)
+            endless: Generate scenery in every direction with no world edges
+        """
+        if seed is not None:
+            random.seed(seed)
+        self.seed = seed
+        self.view_w, self.view_h = view_size
+        if world_size is None:
+            world_size = WORLD_SIZE
+        if tile_size is None:
+            tile_size = get_tile_size()
+        self.on_item_pickup = on_item_pickup
+        self.interpolate = interpolate
+
+        # The scenery follows the run's seed (an unseeded run gets a random world)
+        world_seed = seed if seed is not None else random.getrandbits(63)
+        self.world = World(world_size, tile_size, view_size, seed_offset=world_seed, endless=endless)
+        if GEN_WORKERS and not endless:
+            self.world.pregenerate(GEN_WORKERS)
+        # Place player at center of the world so they appear centered on the world
+        self.player = player_class((self.world.width / 2, self.world.height / 2))
+        # Generate the scenery around the player
+        self.world.update(self.player.pos)
+        self._world_revision = self.world.revision
+        # An endless world has no bounds to clamp the camera to
+        self.camera = Camera(view_size, None if endless else world_size)
+        self.camera.update(self.player.pos)
+
+        # Dynamic spatial hash for moving/removable entities, one layer per kind
+        self.entity_grid = LayeredSpatialGrid(cell_size=256)
+
+        # Optional batched movement for minions
+        if use_horde is None:
+            use_horde = USE_HORDE_ENGINE
+        self.horde = None
+        self.use_horde = use_horde
+        if use_horde:
+            self.horde = HordeEngine()
+            self.horde.set_obstacles(self.world.obstacles(), self.world.obstacle_map)
+
+        self.enemies = []
+        self.projectiles = []
+        self.pies = []
+        self.item_drops = []
+        self._spawn_pies()
+        self._spawn_item_drops()
+
+        self.waves = WAVES if waves is None else waves
+        self.wave_index = 0
+        self.enemies_spawned = 0
+        self.minibosses_spawned = 0
+
+        # Simulated seconds since the session started (used instead of the wall clock)
+        self.time = 0.0
+        self.game_timer = 0.0
+        self.frame = 0
+        # Movement keys for the current step (None: read the keyboard)
+        self.keys = None
+        # Entries drawn by the last draw() call
+        self.visible_count = 0
+
+    # ------------------------------------------------------------------ setup
+
+    @property
+    def world_objects(self):
+        return self.world.objects
+
+    @property
+    def spatial_grid(self):
+        return self.world.spatial_grid
+
+    def _far_from_center(self, pos, distance):
+        return pos.distance_to(self.world.center) >= distance
+
+    def _spawn_pies(self):
+        """Spawn pie health items scattered randomly around the world."""
+        attempts = 0
+        while len(self.pies) < PIE_COUNT and attempts < 200:
+            attempts += 1
+            pos = self.world.random_point()
+            # Avoid spawning too close to center so player has to find them
+            if not self._far_from_center(pos, PICKUP_SPAWN_DISTANCE):
+                continue
+            pie = Pie((pos.x, pos.y))
+            self.pies.append(pie)
+            self.world.add_object(pie)
+            self.entity_grid.insert("pickups", pie)
+
+    def _spawn_item_drops(self):
+        """Spawn sample items for pickup, excluding the player's starting weapon."""
+        all_items = [
+            NinjaStars(),
+            WizardConfetti(),
+            SquirrelBurst(),
+            Quicks(),
+        ]
+        starting_weapon_type = getattr(self.player, 'starting_weapon_class', None)
+        if starting_weapon_type:
+            sample_items = [item for item in all_items if type(item) != starting_weapon_type]
+        else:
+            sample_items = all_items
+
+        attempts = 0
+        while len(self.item_drops) < ITEM_DROP_COUNT and attempts < 200:
+            attempts += 1
+            pos = self.world.random_point()
+            # Avoid spawning too close to center
+            if not self._far_from_center(pos, PICKUP_SPAWN_DISTANCE):
+                continue
+            item = random.choice(sample_items)
+            item_drop = ItemDrop((pos.x, pos.y), item)
+            self.item_drops.append(item_drop)
+            self.world.add_object(item_drop)
+            self.entity_grid.insert("pickups", item_drop)
+
+    def spawn_minion(self):
+        """Spawn a single minion outside player's view."""
+        attempts = 0
+        while attempts < 50:
+            attempts += 1
+            pos = self.world.random_point()
+            # Require spawn outside player's view (at least one screen away)
+            if pos.distance_to(self.world.center) > ENEMY_SPAWN_DISTANCE:
+                minion_type = random.choice(["multiply", "positive", "divisive"])
+                minion = Minion((pos.x, pos.y), minion_type=minion_type)
+                mask = minion.get_mask()
+                # Endless spawns are usually outside the loaded chunks
+                self.world.ensure_loaded(minion.pos, max(mask.get_size()) / 2)
+                if self.world.obstacle_map.enemy_blocked(mask, minion.pos):
+                    continue  # would start stuck inside a tree or bush
+                self.add_enemy(minion)
+                return minion
+        return None
+
+    def spawn_miniboss(self):
+        """Spawn a single mini boss outside player's view."""
+        attempts = 0
+        while attempts < 50:
+            attempts += 1
+            pos = self.world.random_point()
+            # Require spawn outside player's view (at least one screen away)
+            if pos.distance_to(self.world.center) > ENEMY_SPAWN_DISTANCE:
+                miniboss_type = random.choice(["starficer", "attack_robot", "illuminawty"])
+                miniboss = MiniBoss((pos.x, pos.y), miniboss_type=miniboss_type)
+                mask = miniboss.get_mask()
+                # Endless spawns are usually outside the loaded chunks
+                self.world.ensure_loaded(miniboss.pos, max(mask.get_size()) / 2)
+                if self.world.obstacle_map.enemy_blocked(mask, miniboss.pos):
+                    continue  # would start stuck inside a tree or bush
+                self.add_enemy(miniboss)
+                return miniboss
+        return None
+
+    def add_enemy(self, enemy):
+        """Register an enemy with the session (list, grid and horde engine)."""
+        self.enemies.append(enemy)
+        self.entity_grid.insert("enemies", enemy)
+        if self.horde is not None and isinstance(enemy, Minion):
+            self.horde.add(enemy)
+
+    # ----------------------------------------------------------------- actions
+
+    def attack(self, direction, dt):
+        """Manual attack toward `direction` (a non-zero Vector2), as on mouse click."""
+        player = self.player
+        if direction.length() == 0:
+            return False
+        direction = direction.normalize()
+        if not (player.try_attack(dt) and player.can_fire_weapon()):
+            return False
+        weapon_type = getattr(player, 'weapon_type', None)
+        if weapon_type == 'radius':
+            weapon = player.fire_radius_weapon()
+            if not weapon:
+                return False
+            self.projectiles.append(weapon)
+        else:
+            self.projectiles.append(player.fire_projectile(direction))
+        player.weapon_last_fire = 0.0
+        return True
+
+    # ----------------------------------------------------------------- update
+
+    def step(self, dt, timings=None, keys=None):
+        """Advance the simulation by `dt` seconds.
+
+        If `timings` (a dict) is given, the seconds spent in each phase are
+        added to `timings[phase]`. `keys` overrides pygame.key.get_pressed()
+        for player movement (used by replays).
+        """
+        self.keys = keys
+        if self.interpolate:
+            self._store_previous_positions()
+        self.time += dt
+        # Update game timer
+        self.game_timer = min(self.game_timer + dt, MAX_GAME_TIME)
+        for phase in self.PHASES:
+            update = getattr(self, "_update_" + phase)
+            with profiler.zone(phase):
+                if timings is None:
+                    update(dt)
+                else:
+                    start = time.perf_counter()
+                    update(dt)
+                    timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
+        profiler.counter("count.enemies", len(self.enemies))
+        profiler.counter("count.projectiles", len(self.projectiles))
+        self.frame += 1
+
+    def _update_waves(self, dt):
+        """Spawn the current wave's minions and mini bosses spread over WAVE_SPAWN_DURATION."""
+        if self.wave_index >= len(self.waves):
+            return
+        wave_data = self.waves[self.wave_index]
+        wave_start_time = wave_data[0]
+        wave_minion_count = wave_data[1]
+        wave_miniboss_count = wave_data[2] if len(wave_data) > 2 else 0
+        if self.game_timer < wave_start_time:
+            return
+
+        time_into_wave = self.game_timer - wave_start_time
+        # Spawn minions
+        target_minions_spawned = int((time_into_wave / WAVE_SPAWN_DURATION) * wave_minion_count)
+        while self.enemies_spawned < target_minions_spawned and self.enemies_spawned < wave_minion_count:
+            self.spawn_minion()
+            self.enemies_spawned += 1
+
+        # Spawn mini bosses
+        target_minibosses_spawned = int((time_into_wave / WAVE_SPAWN_DURATION) * wave_miniboss_count)
+        while self.minibosses_spawned < target_minibosses_spawned and self.minibosses_spawned < wave_miniboss_count:
+            self.spawn_miniboss()
+            self.minibosses_spawned += 1
+
+        # Check if wave is complete
+        if (self.enemies_spawned >= wave_minion_count and self.minibosses_spawned >= wave_miniboss_count
+                and time_into_wave > WAVE_SPAWN_DURATION):
+            self.wave_index += 1
+            self.enemies_spawned = 0
+            self.minibosses_spawned = 0
+
+    def _update_player_move(self, dt):
+        player = self.player
+        world = self.world
+        player.handle_input(dt, world.objects, world.spatial_grid, world.obstacle_map, self.keys)
+
+        if not world.endless:
+            # Apply border collision - keep player within map bounds
+            player.pos.x = max(BORDER_DISTANCE, min(world.width - BORDER_DISTANCE, player.pos.x))
+            player.pos.y = max(BORDER_DISTANCE, min(world.height - BORDER_DISTANCE, player.pos.y))
+
+        # Stream scenery chunks in (and out) around the player
+        world.update(player.pos)
+        self._free_enemies(world.take_loaded_chunks())
+        self.camera.update(player.pos)
+        # Advance player's weapon cooldown timer
+        player.update_weapon_timer(dt)
+
+    def _free_enemies(self, chunk_keys):
+        """Move enemies that scenery of newly loaded chunks now covers to the nearest free spot.
+
+        Spawns load their chunks first, but an endless world evicts chunks
+        and enemies keep walking through them; those chunks load back later.
+        """
+        if not chunk_keys or not self.enemies:
+            return
+        world = self.world
+        # A chunk's footprints reach up to CHUNK_OVERHANG outside it
+        rects = [pygame.Rect(world.chunk_rect(key)).inflate(2 * CHUNK_OVERHANG, 2 * CHUNK_OVERHANG)
+                 for key in chunk_keys]
+        for e in self.enemies:
+            mask = e.get_mask()
+            if mask.get_rect(center=(int(e.pos.x), int(e.pos.y))).collidelist(rects) < 0:
+                continue
+            if not world.obstacle_map.enemy_blocked(mask, e.pos):
+                continue
+            pos = world.obstacle_map.free_enemy_position(mask, e.pos)
+            if pos is None:
+                continue
+            if self.horde is not None and isinstance(e, Minion):
+                self.horde.move_to(e, pos)
+            else:
+                e.pos.update(pos)
+
+    def _remove_pickup(self, obj):
+        self.entity_grid.remove("pickups", obj)
+        self.world.remove_object(obj)
+
+    def _update_pickups(self, dt):
+        """Check for nearby Pie and item drop pickups."""
+        player = self.player
+        try:
+            for obj in self.entity_grid.get_nearby("pickups", player.pos, radius=1):
+                if isinstance(obj, Pie) and not getattr(obj, 'picked', False):
+                    if obj.overlaps(player.pos, player.get_mask()):
+                        # Pickup: increase health by 10, capped at max_health
+                        player.health = min(player.max_health, player.health + 10)
+                        obj.picked = True
+                        self._remove_pickup(obj)
+                        if obj in self.pies:
+                            self.pies.remove(obj)
+
+                if isinstance(obj, ItemDrop) and not obj.picked:
+                    if obj.can_pickup(player.pos):
+                        self._pick_up_item(obj)
+        except Exception:
+            pass
+
+    def _pick_up_item(self, obj):
+        player = self.player
+        # Check if weapon uniqueness constraint is met
+        if isinstance(obj.item, Weapon):
+            weapon_name = obj.item.name
+            if any(w.name == weapon_name for w in player.inventory.weapons):
+                # Player already has this weapon type; don't pick up
+                return
+
+        # Try to add to inventory
+        if not player.inventory.add_item(obj.item):
+            return
+        if self.on_item_pickup is not None:
+            self.on_item_pickup(obj.item)
+        obj.picked = True
+
+        # Apply equipment/weapon effects immediately
+        if hasattr(obj.item, 'apply_effect'):
+            try:
+                obj.item.apply_effect(player)
+            except Exception:
+                pass
+
+        # If this is a weapon, remove all duplicates from the ground
+        if isinstance(obj.item, Weapon):
+            weapon_name = obj.item.name
+            for drop in self.item_drops[:]:
+                if not drop.picked and isinstance(drop.item, Weapon) and drop.item.name == weapon_name:
+                    drop.picked = True
+                    self._remove_pickup(drop)
+
+        # Remove from world
+        self._remove_pickup(obj)
+        if obj in self.item_drops:
+            self.item_drops.remove(obj)
+
+    def _update_projectiles(self, dt):
+        """Move projectiles/radius weapons, apply hits and drop dead ones."""
+        player = self.player
+        projectiles = self.projectiles
+        for p in projectiles:
+            # Handle radius weapons vs projectiles
+            if isinstance(p, RadiusWeapon):
+                p.update(dt, player.pos)
+            else:
+                p.update(dt)
+
+        # Check collisions with nearby enemies only (one batch for all projectiles)
+        for p, e in find_projectile_hits(projectiles, self.enemies, self.entity_grid["enemies"]):
+            e.take_damage(p.damage)
+            # Only mark as dead on collision for projectiles
+            if not isinstance(p, RadiusWeapon):
+                p.dead = True
+
+        # Remove dead projectiles/weapons
+        for p in projectiles:
+            if p.dead:
+                self.entity_grid.remove("projectiles", p)
+            else:
+                self.entity_grid.move("projectiles", p)
+        projectiles[:] = [p for p in projectiles if not p.dead]
+
+    def _update_auto_fire(self, dt):
+        # Auto-fire player weapons (one shared target index per frame)
+        targeting = TargetingService(self.enemies)
+        self.player.auto_fire(dt, self.enemies, self.projectiles, targeting)
+
+    def _update_item_drops(self, dt):
+        for item_drop in self.item_drops:
+            if not item_drop.picked:
+                item_drop.update(dt)
+
+    def _update_enemy_ai(self, dt):
+        player = self.player
+        world = self.world
+        enemy_grid = self.entity_grid["enemies"]
+        world.flow_field.update(player.pos)
+        horde = self.horde
+        if horde is not None:
+            if world.revision != self._world_revision:
+                # Loaded scenery changed; rebuild the horde's avoidance field
+                self._world_revision = world.revision
+                horde.set_obstacles(world.obstacles(), world.obstacle_map)
+            horde.step(dt, player.pos, world.obstacle_map, world.flow_field)
+        for e in self.enemies:
+            if horde is None or not isinstance(e, Minion):
+                e.update(dt, player, world.objects, world.spatial_grid, self.enemies, enemy_grid,
+                         world.obstacle_map, world.flow_field)
+            enemy_grid.move(e)
+
+        # check collision with player (mask-based); only enemies in nearby cells can touch
+        for e in enemy_grid.get_nearby(player.pos, radius=1):
+            try:
+                if e.overlaps(player.pos, player.get_mask()):
+                    # Apply contact damage with cooldown per enemy
+                    if self.time - getattr(e, 'last_contact_time', -9999.0) >= getattr(e, 'contact_cooldown', 0.7):
+                        e.last_contact_time = self.time
+                        player.take_damage(getattr(e, 'contact_damage', 1))
+            except Exception:
+                pass
+
+    def _update_cleanup(self, dt):
+        """Remove dead enemies."""
+        for en in self.enemies:
+            if en.dead:
+                self.entity_grid.remove("enemies", en)
+        self.enemies[:] = [en for en in self.enemies if not en.dead]
+
+    # ----------------------------------------------------------------- drawing
+
+    @staticmethod
+    def _position_attr(entity):
+        # A radius weapon's position is derived from the player position it orbits
+        return "player_pos" if isinstance(entity, RadiusWeapon) else "pos"
+
+    def _store_previous_positions(self):
+        """Copy the moving entities' positions before a step (see `interpolate`)."""
+        self.player.prev_pos = self.player.pos.copy()
+        for e in self.enemies:
+            e.prev_pos = e.pos.copy()
+        for p in self.projectiles:
+            p.prev_pos = getattr(p, self._position_attr(p)).copy()
+
+    def _interpolate_positions(self, alpha):
+        """Move entities `alpha` of the way from their previous to their current position.
+
+        Returns [(entity, attribute, current position)] for `_restore_positions`.
+        """
+        saved = []
+        for entities in ((self.player,), self.enemies, self.projectiles):
+            for e in entities:
+                prev = getattr(e, "prev_pos", None)
+                if prev is None:
+                    continue
+                attr = self._position_attr(e)
+                current = getattr(e, attr)
+                saved.append((e, attr, current))
+                setattr(e, attr, prev.lerp(current, alpha))
+        self.camera.update(self.player.pos)
+        return saved
+
+    def _restore_positions(self, saved):
+        for e, attr, current in saved:
+            setattr(e, attr, current)
+        self.camera.update(self.player.pos)
+
+    def draw(self, surface, background=None, timings=None, alpha=1.0):
+        """Draw the world (background, scenery, player, enemies, projectiles) to `surface`.
+
+        Args:
+            surface: Target surface (the display or a render target); the
+                view is drawn scaled to its width (Camera.scale)
+            background: Optional BackgroundRenderer; otherwise the surface is filled white
+            timings: Optional dict; seconds spent in "background", "depth_sort"
+                and "draw" are added to it, as in `step`
+            alpha: With `interpolate`, how far (0..1) between the previous and
+                the latest step to draw moving entities
+        """
+        if self.interpolate and alpha < 1.0:
+            saved = self._interpolate_positions(alpha)
+            try:
+                self._draw(surface, background, timings)
+            finally:
+                self._restore_positions(saved)
+        else:
+            self._draw(surface, background, timings)
+
+    def _draw(self, surface, background, timings):
+        camera = self.camera
+        camera.scale = surface.get_width() / self.view_w
+        start = time.perf_counter()
+        with profiler.zone("background"):
+            if background is not None:
+                # Pre-baked background chunks covering the visible area
+                background.draw(surface, camera)
+            else:
+                surface.fill((255, 255, 255))
+        sorted_at = time.perf_counter()
+
+        with profiler.zone("depth_sort"):
+            render_list = self._render_list()
+        self.visible_count = len(render_list)
+        drawn_at = time.perf_counter()
+
+        with profiler.zone("draw"):
+            for depth, entity in render_list:
+                entity.draw(surface, camera)
+
+        if timings is not None:
+            timings["background"] = timings.get("background", 0.0) + sorted_at - start
+            timings["depth_sort"] = timings.get("depth_sort", 0.0) + drawn_at - sorted_at
+            timings["draw"] = timings.get("draw", 0.0) + time.perf_counter() - drawn_at
+
+    def _render_list(self):
+        """Visible scenery, player, enemies and projectiles as (depth, entity), sorted by depth."""
+        offset = self.camera.offset
+        view_w, view_h = self.view_w, self.view_h
+        render_list = []
+
+        # Get nearby objects for rendering (larger radius for better render distance)
+        nearby_render_objs = self.world.spatial_grid.get_nearby(
+            offset + pygame.Vector2(view_w / 2, view_h / 2), radius=5)
+        for obj in nearby_render_objs:
+            # Only include if on-screen
+            if getattr(obj, 'picked', False):
+                continue
+            screen_x = obj.pos.x - offset.x
+            screen_y = obj.pos.y - offset.y
+            if -200 < screen_x < view_w + 200 and -200 < screen_y < view_h + 200:
+                render_list.append((obj.get_bottom_y(), obj))
+
+        # Add player to render list
+        player = self.player
+        render_list.append((player.pos.y + player.get_image().get_height() / 2, player))
+
+        # Include visible enemies in render list
+        for e in self.enemies:
+            screen_x = e.pos.x - offset.x
+            screen_y = e.pos.y - offset.y
+            if -200 < screen_x < view_w + 200 and -200 < screen_y < view_h + 200:
+                render_list.append((e.pos.y + e.get_image().get_height() / 2, e))
+
+        # Include projectiles in render list
+        for p in self.projectiles:
+            screen_x = p.pos.x - offset.x
+            screen_y = p.pos.y - offset.y
+            if -200 < screen_x < view_w + 200 and -200 < screen_y < view_h + 200:
+                render_list.append((p.pos.y, p))
+
+        # Sort by depth (y-coordinate of bottom edge)
+        render_list.sort(key=lambda x: x[0])
+        return render_list
@@ -0,0 +1,283 @@
+"""Optional NumPy structure-of-arrays movement engine for large minion hordes.
+
+Regular enemies each run `Enemy.update`, which is fine for a few hundred but
+not for thousands. A HordeEngine keeps the movement state of the enemies
+registered with it in flat NumPy arrays and computes seek, obstacle avoidance
+and separation for all of them in a handful of vectorized operations per
+frame. Results are written back to each Enemy's `pos`/`tilt_time`, so
+rendering, projectiles, targeting and contact damage keep using the normal
+Enemy API.
+
+NumPy is optional: check `HAS_NUMPY` before creating an engine.
+"""
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+import pygame
+
+HAS_NUMPY = np is not None
+
+
+class HordeEngine:
+    """Vectorized seek / avoidance / separation for many enemies at once.
+
+    Unlike `Enemy.update`, enemies in the horde don't test exact mask overlaps
+    against each other; a density-gradient separation force keeps them apart
+    instead. Exact tree/bush collision is still applied, but only to the few
+    enemies whose bounding box reaches an obstacle footprint.
+    """
+
+    def __init__(self, capacity=256, separation_cell=48, separation_strength=400.0,
+                 avoid_radius=80, avoid_strength=250.0, field_cell=16):
+        """
+        Args:
+            capacity: Initial array capacity (grows as needed)
+            separation_cell: Cell size (pixels) of the crowd density grid
+            separation_strength: Push per unit of density gradient
+            avoid_radius: Obstacle repulsion radius, as in Enemy.update
+            avoid_strength: Obstacle repulsion strength, as in Enemy.update
+            field_cell: Resolution (pixels) of the precomputed obstacle repulsion field
+        """
+        if np is None:
+            raise RuntimeError("HordeEngine requires numpy")
+        self.count = 0
+        self.entities = []
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.speed = np.zeros(capacity)
+        self.half_size = np.zeros((capacity, 2))
+        self.type_id = np.zeros(capacity, dtype=np.int32)
+        self._type_ids = {}
+
+        self.separation_cell = separation_cell
+        self.separation_strength = separation_strength
+        self.avoid_radius = avoid_radius
+        self.avoid_strength = avoid_strength
+        self.field_cell = field_cell
+        self._field = None  # (H, W, 2) obstacle repulsion vectors
+        self._field_origin = (0.0, 0.0)
+        self._footprint_sums = None  # (H+1, W+1) summed-area table of footprint cells
+        self._footprint_origin = (0, 0)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        cap = max(16, len(self.pos) * 2)
+        for name in ("pos", "vel", "half_size"):
+            arr = np.zeros((cap, 2))
+            arr[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, arr)
+        for name in ("speed", "type_id"):
+            old = getattr(self, name)
+            arr = np.zeros(cap, dtype=old.dtype)
+            arr[:self.count] = old[:self.count]
+            setattr(self, name, arr)
+
+    def add(self, enemy):
+        """Register an enemy; its movement is driven by `step` from now on."""
+        if self.count >= len(self.pos):
+            self._grow()
+        i = self.count
+        self.pos[i] = (enemy.pos.x, enemy.pos.y)
+        self.vel[i] = (0.0, 0.0)
+        self.speed[i] = enemy.speed
+        self.half_size[i] = enemy.get_mask().get_size()
+        self.half_size[i] /= 2
+        key = (type(enemy).__name__, getattr(enemy, 'type', None))
+        self.type_id[i] = self._type_ids.setdefault(key, len(self._type_ids))
+        self.entities.append(enemy)
+        self.count += 1
+        return i
+
+    def move_to(self, enemy, pos):
+        """Place a registered enemy at `pos` (e.g. out of scenery that loaded on top of it)."""
+        i = self.entities.index(enemy)
+        self.pos[i] = (pos.x, pos.y)
+        self.vel[i] = (0.0, 0.0)
+        enemy.pos.update(pos)
+
+    def _remove_at(self, i):
+        """Swap-remove entity i (keeps the arrays dense)."""
+        last = self.count - 1
+        if i != last:
+            for arr in (self.pos, self.vel, self.speed, self.half_size, self.type_id):
+                arr[i] = arr[last]
+            self.entities[i] = self.entities[last]
+        self.entities.pop()
+        self.count -= 1
+
+    def set_obstacles(self, objects, obstacle_map=None):
+        """Precompute the obstacle repulsion field from static objects' positions.
+
+        Matches Enemy.update's avoidance term: each object within
+        `avoid_radius` pushes away with strength falling off linearly.
+        With `obstacle_map`, also index its footprint rects so `step` knows
+        which enemies need the exact collision test.
+        """
+        self._set_footprints(obstacle_map.footprints.rects() if obstacle_map is not None else None)
+        if not objects:
+            self._field = None
+            return
+        pts = np.array([(o.pos.x, o.pos.y) for o in objects])
+        r = self.avoid_radius
+        fc = self.field_cell
+        x0, y0 = pts.min(axis=0) - r
+        x1, y1 = pts.max(axis=0) + r
+        w = int((x1 - x0) // fc) + 2
+        h = int((y1 - y0) // fc) + 2
+        field = np.zeros((h, w, 2))
+        span = int(r // fc) + 1
+        for ox, oy in pts:
+            cx = int((ox - x0) // fc)
+            cy = int((oy - y0) // fc)
+            xs = slice(max(0, cx - span), min(w, cx + span + 1))
+            ys = slice(max(0, cy - span), min(h, cy + span + 1))
+            gx = x0 + (np.arange(xs.start, xs.stop) + 0.5) * fc - ox
+            gy = y0 + (np.arange(ys.start, ys.stop) + 0.5) * fc - oy
+            dx, dy = np.meshgrid(gx, gy)
+            d = np.hypot(dx, dy)
+            inside = (d > 0) & (d <= r)
+            scale = np.where(inside, self.avoid_strength * (r - d) / r / np.where(d > 0, d, 1), 0.0)
+            field[ys, xs, 0] += dx * scale
+            field[ys, xs, 1] += dy * scale
+        self._field = field
+        self._field_origin = (x0, y0)
+
+    def _set_footprints(self, rects):
+        """Mark the field cells covered by each footprint rect, as a summed-area table."""
+        self._footprint_sums = None
+        if rects is None:
+            return
+        fc = self.field_cell
+        if not rects:
+            self._footprint_sums = np.zeros((1, 1), dtype=np.int32)
+            return
+        r = np.array(rects, dtype=np.int64)
+        first = r[:, :2] // fc
+        last = (r[:, :2] + r[:, 2:] - 1) // fc
+        x0, y0 = first.min(axis=0)
+        w, h = last.max(axis=0) - (x0, y0) + 1
+        # Each rect adds +1/-1 at its corners; the 2D prefix sum of that is the coverage count
+        corners = np.zeros((h + 1, w + 1), dtype=np.int32)
+        fx, fy = first[:, 0] - x0, first[:, 1] - y0
+        lx, ly = last[:, 0] - x0 + 1, last[:, 1] - y0 + 1
+        np.add.at(corners, (fy, fx), 1)
+        np.add.at(corners, (fy, lx), -1)
+        np.add.at(corners, (ly, fx), -1)
+        np.add.at(corners, (ly, lx), 1)
+        covered = (corners.cumsum(axis=0).cumsum(axis=1)[:h, :w] > 0).astype(np.int32)
+        sums = np.zeros((h + 1, w + 1), dtype=np.int32)
+        sums[1:, 1:] = covered.cumsum(axis=0).cumsum(axis=1)
+        self._footprint_sums = sums
+        self._footprint_origin = (int(x0), int(y0))
+
+    def _touching_footprints(self, pos, half_size):
+        """Indices of enemies whose mask box at `pos` shares a field cell with a footprint.
+
+        The boxes are placed like CollisionBitmap.overlaps places a mask, so
+        this never misses an enemy the exact test would block.
+        """
+        sums = self._footprint_sums
+        if sums is None:
+            return np.arange(len(pos))
+        h, w = sums.shape[0] - 1, sums.shape[1] - 1
+        fc = self.field_cell
+        size = half_size * 2
+        top_left = np.trunc(pos - half_size)
+        first = (top_left // fc).astype(np.int64) - self._footprint_origin
+        last = ((top_left + size - 1) // fc).astype(np.int64) - self._footprint_origin
+        x0 = np.clip(first[:, 0], 0, w)
+        y0 = np.clip(first[:, 1], 0, h)
+        x1 = np.clip(last[:, 0] + 1, 0, w)
+        y1 = np.clip(last[:, 1] + 1, 0, h)
+        count = sums[y1, x1] - sums[y0, x1] - sums[y1, x0] + sums[y0, x0]
+        return np.nonzero(count > 0)[0]
+
+    def _sample_field(self, pos):
+        field = self._field
+        if field is None:
+            return np.zeros_like(pos)
+        h, w, _ = field.shape
+        ix = ((pos[:, 0] - self._field_origin[0]) // self.field_cell).astype(np.int64)
+        iy = ((pos[:, 1] - self._field_origin[1]) // self.field_cell).astype(np.int64)
+        inside = (ix >= 0) & (ix < w) & (iy >= 0) & (iy < h)
+        out = np.zeros_like(pos)
+        out[inside] = field[iy[inside], ix[inside]]
+        return out
+
+    def _separation(self, pos):
+        """Push away from crowded cells using the gradient of a density grid."""
+        cs = self.separation_cell
+        origin = pos.min(axis=0) - cs
+        idx = ((pos - origin) // cs).astype(np.int64)
+        w = int(idx[:, 0].max()) + 2
+        h = int(idx[:, 1].max()) + 2
+        density = np.bincount(idx[:, 1] * w + idx[:, 0], minlength=w * h).reshape(h, w).astype(float)
+        grad_y, grad_x = np.gradient(density)
+        force = np.empty_like(pos)
+        force[:, 0] = -grad_x[idx[:, 1], idx[:, 0]]
+        force[:, 1] = -grad_y[idx[:, 1], idx[:, 0]]
+        return force * self.separation_strength
+
+    def step(self, dt, target_pos, obstacle_map=None, flow_field=None):
+        """Advance every live horde enemy by `dt` toward `target_pos`.
+
+        Dead enemies are dropped first. If `obstacle_map` is given, enemies
+        whose new position would touch a tree/bush footprint follow
+        `flow_field` (if given) or stay put, like a blocked Enemy.update.
+        """
+        # Drop enemies killed since the last step
+        for i in range(self.count - 1, -1, -1):
+            if self.entities[i].dead:
+                self._remove_at(i)
+        n = self.count
+        if n == 0:
+            return
+
+        pos = self.pos[:n]
+        speed = self.speed[:n]
+
+        to_target = np.array((target_pos.x, target_pos.y)) - pos
+        dist = np.hypot(to_target[:, 0], to_target[:, 1])
+        seek = np.zeros_like(pos)
+        moving = dist > 0
+        seek[moving] = to_target[moving] / dist[moving, None] * speed[moving, None]
+
+        avoidance = self._sample_field(pos)
+        steer = seek + avoidance + self._separation(pos)
+        length = np.hypot(steer[:, 0], steer[:, 1])
+        step_len = np.where(length > 0, speed * dt / np.where(length > 0, length, 1), 0.0)
+        vel = steer * step_len[:, None]
+        new_pos = pos + vel
+
+        # Exact obstacle collision, only for enemies whose box reaches a footprint
+        if obstacle_map is not None:
+            near = self._touching_footprints(new_pos, self.half_size[:n])
+            test = pygame.Vector2()
+            for i in near:
+                e = self.entities[i]
+                test.update(new_pos[i, 0], new_pos[i, 1])
+                mask = e.get_mask()
+                if not obstacle_map.enemy_blocked(mask, test):
+                    continue
+                new_pos[i] = pos[i]
+                vel[i] = 0.0
+                if flow_field is not None:
+                    flow_dir = flow_field.direction(e.pos)
+                    if flow_dir is not None:
+                        test.update(pos[i, 0] + flow_dir.x * speed[i] * dt,
+                                    pos[i, 1] + flow_dir.y * speed[i] * dt)
+                        if not obstacle_map.enemy_blocked(mask, test):
+                            new_pos[i] = (test.x, test.y)
+                            vel[i] = new_pos[i] - pos[i]
+
+        self.pos[:n] = new_pos
+        self.vel[:n] = vel
+
+        # Write results back so the rest of the game sees ordinary Enemy objects
+        for i, e in enumerate(self.entities):
+            e.pos.update(new_pos[i, 0], new_pos[i, 1])
+            e.tilt_time += dt
@@ -60,6 +60,7 @@ That's it! The item will automatically:
 - Apply/remove effects when picked up/unequipped
 """
 import pygame
+import sprite_cache
 
 
 class Item:
@@ -84,11 +85,14 @@ class Item:
         self._image = None
     
     def get_image(self, size=40):
-        """Get item icon image, loading and caching if needed."""
-        if self._image is None and self.image_path:
-            try:
-                self._image = pygame.image.load(self.image_path).convert_alpha()
-            except Exception:
+        """Get item icon image at `size` x `size`, loading and caching if needed."""
+        if self.image_path:
+            # Shared per size and scaled from the original icon (possibly preloaded
+            # or baked, see asset_preloader / asset_bake)
+            img = sprite_cache.get_surface(self.image_path, size=(size, size))
+            if img is not None:
+                return img
+            if self._image is None:
                 self._image = pygame.Surface((size, size), pygame.SRCALPHA)
                 pygame.draw.rect(self._image, (100, 100, 100), (0, 0, size, size))
         
@@ -1,93 +1,71 @@
 import pygame
+import multiprocessing
 import os
 import random
-import time
-import tkinter as tk
 import sys
-from camera import Camera
-from Characters.player import Player
+import time
+import profiler
+import counters
+import replay
+import timestep
+import sprite_cache
+import asset_bake
+from asset_preloader import AssetPreloader, warm_sprites
+from render_target import RENDER_SCALES, RenderTarget, scale_from_env, surface_size
 from Characters.ninjircle import Ninjircle
 from Characters.triangle_wizard import Tridolf
 from Characters.sqwerewolf import Sqwerewolf
 from Characters.starficer import Starficer
-from Objects.tree import Tree
-from Objects.bush import Bush
-from Objects.pie import Pie
-from Objects.item_drop import ItemDrop
-from Objects.Equipment.quicks import Quicks
-from Objects.Weapons.ninja_stars import NinjaStars
-from Objects.Weapons.wizard_confetti import WizardConfetti
-from Objects.Weapons.squirrel_burst import SquirrelBurst
 from pause_menu import PauseMenu
-from spatial_grid import SpatialGrid
-from Characters.minion import Minion
-from Characters.mini_boss import MiniBoss
-from Characters.attack_robot import AttackRobot
-from projectile import Projectile
-from radius_weapon import RadiusWeapon
-from asset_manager import get_asset_path
+from asset_manager import get_asset_path, load_image
+from background import BackgroundRenderer
+from game_session import GameSession, BG_TILE_PATH, USE_HORDE_ENGINE, get_player_class, view_size_for_display
 from title_screen import TitleScreen
-from ui import InventoryUI, PauseMenuInventoryUI
+from ui import InventoryUI, PauseMenuInventoryUI, PerformanceOverlay
 from inventory import Item
 
 
-pygame.font.init()
-
-root = tk.Tk()
-WIDTH = root.winfo_screenwidth()
-HEIGHT = root.winfo_screenheight()
-
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("PaperTrail: Escape from this Dimension")
-
-
-# World size (bigger than screen so player can move through environment)
-WORLD_W = int(WIDTH * 3.75)
-WORLD_H = int(HEIGHT * 3.75)
-
-# Border distance from world edge (player radius = 40)
-BORDER_DISTANCE = 40
+def init_display():
+    """Open the fullscreen-sized game window. Returns (screen, width, height)."""
+    pygame.font.init()
+    pygame.init()
+    # Desktop resolution, read before a window exists
+    info = pygame.display.Info()
+    width, height = info.current_w, info.current_h
+    screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption("PaperTrail: Escape from this Dimension")
+    return screen, width, height
 
-# Load background tile (do not scale) and get tile size
-BG_TILE = pygame.image.load(get_asset_path("paper_bg_3.png")).convert()
-TILE_W, TILE_H = BG_TILE.get_size()
 
-# Object spawn density per tile (0.0 to 1.0)
-TREE_DENSITY = 0.25
-BUSH_DENSITY = 0.20
-
-
-def generate_objects_in_tile(tile_x, tile_y, seed_offset=0):
-    """Generate tree and bush objects for a tile based on seeded randomness."""
-    objects = []
-
-    # Use tile coordinates as part of the seed for consistency
-    tile_seed = hash((tile_x, tile_y, seed_offset)) % (2**32)
-    rng = random.Random(tile_seed)
-
-    # Spawn trees
-    if rng.random() < TREE_DENSITY:
-        x = tile_x + rng.uniform(10, TILE_W - 10)
-        y = tile_y + rng.uniform(10, TILE_H - 10)
-        objects.append(Tree((x, y)))
+def main():
+    FPS = 60
+    clock = pygame.time.Clock()
+    screen, WIDTH, HEIGHT = init_display()
 
-    # Spawn bushes
-    if rng.random() < BUSH_DENSITY:
-        x = tile_x + rng.uniform(10, TILE_W - 10)
-        y = tile_y + rng.uniform(10, TILE_H - 10)
-        objects.append(Bush((x, y)))
+    # PAPERTRAIL_TRACE=<frames> records a zone trace from startup
+    profiler.start_from_env()
+    # PAPERTRAIL_COUNTERS=<csv path> counts collision/grid/cache work and dumps it at exit
+    counting_from_env = counters.start_from_env()
+    # PAPERTRAIL_RECORD=<file> records each run's inputs (the file holds the latest run);
+    # PAPERTRAIL_REPLAY=<file> plays a recording back instead of reading the mouse/keyboard
+    record_path = os.environ.get("PAPERTRAIL_RECORD")
+    replay_reader = None
+    if os.environ.get("PAPERTRAIL_REPLAY"):
+        replay_reader = replay.ReplayReader(os.environ["PAPERTRAIL_REPLAY"])
 
-    return objects
+    # Load background tile (do not scale)
+    BG_TILE = load_image(BG_TILE_PATH).convert()
 
+    # Scaled sprites and collision masks baked offline (python asset_bake.py), if present
+    asset_bake.load()
 
-def main():
-    FPS = 60
-    clock = pygame.time.Clock()
+    # Decode every other image in the background while the menus are up
+    title_screen = TitleScreen(WIDTH, HEIGHT) if replay_reader is None else None
+    preloader = AssetPreloader().start()
 
     # Show title screen first
-    title_screen = TitleScreen(WIDTH, HEIGHT)
-    title_screen.run(screen)
+    if title_screen is not None:
+        title_screen.run(screen, preloader)
 
     # Character selection screen before starting
     def character_selection_screen(screen):
@@ -100,9 +78,8 @@ def main():
         imgs = []
         max_size = 180
         for name, path, cls in choices:
-            try:
-                img = pygame.image.load(path).convert_alpha()
-            except Exception:
+            img = sprite_cache.get_surface(path)
+            if img is None:
                 img = pygame.Surface((max_size, max_size), pygame.SRCALPHA)
                 pygame.draw.circle(img, (200, 200, 200), (max_size//2, max_size//2), max_size//2)
 
@@ -137,465 +114,221 @@ def main():
                 cy = HEIGHT // 2
                 rect = img.get_rect(center=(cx, cy))
                 screen.blit(img, rect)
+            if not preloader.done:
+                preloader.pump()
+                preloader.draw_progress(screen)
 
             pygame.display.flip()
 
+    # Simulation runs at a fixed rate (PAPERTRAIL_SIM_HZ) independent of the frame rate
+    stepper = timestep.from_env()
+
+    # The world can be drawn below native resolution (F4 cycles the scale); the HUD stays native
+    render_target = RenderTarget(screen, scale_from_env())
+
+    # F3 toggles the performance overlay; it persists across runs
+    perf_overlay = PerformanceOverlay(WIDTH, HEIGHT)
+    last_frame_ms = 0.0
+
+    # Create font for timer display
+    timer_font = pygame.font.Font(None, 56)
+
     # Outer game loop to allow restarting after character selection
+    background = None
+    sprites_ready = False
     game_running = True
     while game_running:
-        SelectedClass = character_selection_screen(screen)
-        
+        # The view covers the same world area on every display; only its aspect ratio follows the screen
+        view_size = view_size_for_display((WIDTH, HEIGHT))
+        use_horde = USE_HORDE_ENGINE
+        # PAPERTRAIL_ENDLESS=1: scenery streams in forever, no world edges
+        endless = os.environ.get("PAPERTRAIL_ENDLESS", "0") == "1"
+        replay_frames = recorder = None
+        if replay_reader is not None:
+            # Same character, seed and spawn distances as the recorded run
+            SelectedClass = get_player_class(replay_reader.player_class_name)
+            seed = replay_reader.seed
+            view_size = replay_reader.view_size
+            use_horde = replay_reader.use_horde
+            endless = replay_reader.endless
+            replay_frames = iter(replay_reader)
+        else:
+            SelectedClass = character_selection_screen(screen)
+            # Every run is seeded so it can be recorded and replayed exactly
+            seed = random.randrange(2 ** 63)
+        if not sprites_ready:
+            # Whatever the menus didn't cover, so gameplay never reads from disk;
+            # the camera scale is the world surface width over the view width
+            preloader.finish()
+            render_scales = set(RENDER_SCALES) | {render_target.scale}
+            warm_sprites([surface_size((WIDTH, HEIGHT), s)[0] / view_size[0] for s in render_scales])
+            sprites_ready = True
+
+        # Initialize UI
+        inventory_ui = InventoryUI(WIDTH, HEIGHT)
+        pause_inventory_ui = PauseMenuInventoryUI(WIDTH, HEIGHT)
+
         # Initialize game state for this run
-        # Place player at center of the world so they appear centered on the world
-        player = SelectedClass((WORLD_W / 2, WORLD_H / 2))
-        camera = Camera((WIDTH, HEIGHT), (WORLD_W, WORLD_H))
+        session = GameSession(SelectedClass, view_size, tile_size=BG_TILE.get_size(), seed=seed,
+                              use_horde=use_horde, on_item_pickup=inventory_ui.add_item_notification,
+                              interpolate=stepper.fixed, endless=endless)
+        player = session.player
+        if record_path:
+            recorder = replay.ReplayWriter(record_path, seed, SelectedClass.__name__, view_size,
+                                           use_horde, endless)
+        if background is None or background.bounded == endless:
+            # Background chunks are baked lazily and reused across runs
+            background = BackgroundRenderer(BG_TILE, session.world.size, view_size)
         pause_menu = PauseMenu(WIDTH, HEIGHT)
         pause_menu.add_button(get_asset_path("Menu-Button.png"), "menu")
         pause_menu.add_button(get_asset_path("Exit-Button.png"), "exit")
-        
-        # Initialize UI
-        inventory_ui = InventoryUI(WIDTH, HEIGHT)
-        pause_inventory_ui = PauseMenuInventoryUI(WIDTH, HEIGHT)
 
-        # Pre-generate all world objects for the entire world (fresh generation each game)
-        world_objects = []
-        for tile_y in range(0, WORLD_H, TILE_H):
-            for tile_x in range(0, WORLD_W, TILE_W):
-                world_objects.extend(generate_objects_in_tile(tile_x, tile_y))
-
-        # Initialize spatial grid for efficient collision detection
-        spatial_grid = SpatialGrid(WORLD_W, WORLD_H, cell_size=256)
-        for obj in world_objects:
-            spatial_grid.insert(obj)
-
-        # Spawn 3 pie health items scattered randomly around the world
-        pies = []
-        PIE_COUNT = 3
-        attempts = 0
-        while len(pies) < PIE_COUNT and attempts < 200:
-            attempts += 1
-            x = random.randint(0, WORLD_W)
-            y = random.randint(0, WORLD_H)
-            pos = pygame.Vector2(x, y)
-            # Avoid spawning too close to center so player has to find them
-            if pos.distance_to(pygame.Vector2(WORLD_W / 2, WORLD_H / 2)) < max(WIDTH, HEIGHT) // 2:
-                continue
-            pie = Pie((x, y))
-            pies.append(pie)
-            world_objects.append(pie)
-            spatial_grid.insert(pie)
-        
-        # Spawn sample items for pickup
-        item_drops = []
-        # Build item pool, excluding the player's starting weapon
-        all_items = [
-            NinjaStars(),
-            WizardConfetti(),
-            SquirrelBurst(),
-            Quicks(),
-        ]
-        
-        # Filter out the player's starting weapon from the pool
-        sample_items = []
-        if hasattr(player, 'starting_weapon_class') and player.starting_weapon_class:
-            starting_weapon_type = player.starting_weapon_class
-            for item in all_items:
-                if type(item) != starting_weapon_type:
-                    sample_items.append(item)
-        else:
-            sample_items = all_items
-        
-        ITEM_DROP_COUNT = 6
-        item_attempts = 0
-        while len(item_drops) < ITEM_DROP_COUNT and item_attempts < 200:
-            item_attempts += 1
-            x = random.randint(0, WORLD_W)
-            y = random.randint(0, WORLD_H)
-            pos = pygame.Vector2(x, y)
-            # Avoid spawning too close to center
-            if pos.distance_to(pygame.Vector2(WORLD_W / 2, WORLD_H / 2)) < max(WIDTH, HEIGHT) // 2:
-                continue
-            item = random.choice(sample_items)
-            item_drop = ItemDrop((x, y), item)
-            item_drops.append(item_drop)
-            world_objects.append(item_drop)
-            spatial_grid.insert(item_drop)
-        
-        # Enemy list
-        enemies = []
-        
-        # Wave system: list of (wave_time_seconds, wave_minion_count, wave_miniboss_count)
-        waves = [
-            (0.0, 30, 0),      # Initial wave at 0:00 with 30 minions
-            (10.0, 50, 0),     # Second wave at 0:10 with 50 minions
-            (25.0, 50, 5),     # Third wave at 0:25 with 50 minions and 5 mini bosses
-        ]
-        wave_index = 0
-        wave_spawn_time = 0.0
-        wave_spawn_duration = 10.0  # Spawn each wave over 10 seconds
-        wave_spawn_count = 0
-        wave_miniboss_count = 0
-        enemies_spawned = 0
-        minibosses_spawned = 0
-
-        def spawn_minion():
-            """Spawn a single minion outside player's view."""
-            attempts = 0
-            while attempts < 50:
-                attempts += 1
-                x = random.randint(0, WORLD_W)
-                y = random.randint(0, WORLD_H)
-                pos = pygame.Vector2(x, y)
-                # Require spawn outside player's view (at least one screen away)
-                if pos.distance_to(pygame.Vector2(WORLD_W / 2, WORLD_H / 2)) > max(WIDTH, HEIGHT):
-                    minion_type = random.choice(["multiply", "positive", "divisive"])
-                    enemies.append(Minion((x, y), minion_type=minion_type))
-                    return True
-            return False
-
-        def spawn_miniboss():
-            """Spawn a single mini boss outside player's view."""
-            attempts = 0
-            while attempts < 50:
-                attempts += 1
-                x = random.randint(0, WORLD_W)
-                y = random.randint(0, WORLD_H)
-                pos = pygame.Vector2(x, y)
-                # Require spawn outside player's view (at least one screen away)
-                if pos.distance_to(pygame.Vector2(WORLD_W / 2, WORLD_H / 2)) > max(WIDTH, HEIGHT):
-                    miniboss_type = random.choice(["starficer", "attack_robot", "illuminawty"])
-                    enemies.append(MiniBoss((x, y), miniboss_type=miniboss_type))
-                    return True
-            return False
-
-        # Projectiles list
-        projectiles = []
-        
-        # Game timer
-        game_timer = 0.0  # Elapsed time in seconds
-        MAX_GAME_TIME = 20 * 60  # 20 minutes in seconds
-        
-        # Create font for timer display
-        timer_font = pygame.font.Font(None, 56)
+        # Click attacks wait here for the next simulation step
+        attacks = []
+        # Don't count the time spent on the selection screen
+        stepper.reset()
+        clock.tick(FPS)
 
         # Inner game loop for current game session
         running = True
         while running:
             dt = clock.tick(FPS) / 1000.0
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                    break
-
-                # Toggle pause on ESC
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    if not pause_menu.paused:
-                        pause_menu.enter(screen)
-                    else:
+            frame_start = time.perf_counter()
+            timings = {} if perf_overlay.visible else None
+
+            with profiler.zone("input"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        running = False
+                        break
+
+                    # F9: record a zone trace of the next frames
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_F9 and not profiler.is_recording():
+                        profiler.start()
+
+                    # F3: toggle the performance overlay
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                        perf_overlay.toggle()
+                        # The overlay shows the work counters; count only while it is up
+                        if perf_overlay.visible:
+                            counters.enable()
+                        elif not counting_from_env:
+                            counters.disable()
+
+                    # F4: cycle the internal render scale
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                        render_target.cycle()
+
+                    # Toggle pause on ESC
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                        if not pause_menu.paused:
+                            pause_menu.enter(screen)
+                        else:
+                            pause_menu.exit()
+
+                    # Handle mouse click for attacks (a replay supplies its own)
+                    if (event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and not pause_menu.paused
+                            and replay_frames is None):
+                        mouse_pos = pygame.mouse.get_pos()
+                        # Calculate direction from player to mouse
+                        screen_center = pygame.Vector2(WIDTH / 2, HEIGHT / 2)
+                        # Rounded to what a recording stores, so replays match exactly
+                        attacks.append(replay.quantize_direction(mouse_pos - screen_center))
+
+                    # Let pause menu handle click events when paused
+                    result = pause_menu.handle_event(event)
+                    if result == "exit":
+                        if recorder is not None:
+                            recorder.close()
+                        pygame.quit()
+                        sys.exit()
+                    elif result == "menu":
+                        # Menu button: return to character selection and restart game
                         pause_menu.exit()
-
-                # Handle mouse click for attacks
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and not pause_menu.paused:
-                    mouse_pos = pygame.mouse.get_pos()
-                    # Calculate direction from player to mouse
-                    screen_center = pygame.Vector2(WIDTH / 2, HEIGHT / 2)
-                    direction = mouse_pos - screen_center
-                    if direction.length() > 0:
-                        direction = direction.normalize()
-                        # Try to attack
-                        if player.try_attack(dt) and player.can_fire_weapon():
-                            weapon_type = getattr(player, 'weapon_type', None)
-                            if weapon_type == 'radius':
-                                weapon = player.fire_radius_weapon()
-                                if weapon:
-                                    projectiles.append(weapon)
-                                    player.weapon_last_fire = 0.0
-                            else:
-                                projectiles.append(player.fire_projectile(direction))
-                                player.weapon_last_fire = 0.0
-
-                # Let pause menu handle click events when paused
-                result = pause_menu.handle_event(event)
-                if result == "exit":
-                    pygame.quit()
-                    sys.exit()
-                elif result == "menu":
-                    # Menu button: return to character selection and restart game
-                    pause_menu.exit()
-                    running = False
+                        running = False
 
             if not pause_menu.paused:
-                # Update game timer (only when not paused)
-                game_timer += dt
-                if game_timer > MAX_GAME_TIME:
-                    game_timer = MAX_GAME_TIME
-                
-                # Check if a new wave should start
-                if wave_index < len(waves):
-                    wave_data = waves[wave_index]
-                    wave_start_time = wave_data[0]
-                    wave_minion_count = wave_data[1]
-                    wave_miniboss_count = wave_data[2] if len(wave_data) > 2 else 0
-                    
-                    if game_timer >= wave_start_time:
-                        # Wave has started, spawn minions and mini bosses
-                        time_into_wave = game_timer - wave_start_time
-                        if time_into_wave >= 0:
-                            # Spawn minions
-                            target_minions_spawned = int((time_into_wave / wave_spawn_duration) * wave_minion_count)
-                            while enemies_spawned < target_minions_spawned and enemies_spawned < wave_minion_count:
-                                spawn_minion()
-                                enemies_spawned += 1
-                            
-                            # Spawn mini bosses
-                            target_minibosses_spawned = int((time_into_wave / wave_spawn_duration) * wave_miniboss_count)
-                            while minibosses_spawned < target_minibosses_spawned and minibosses_spawned < wave_miniboss_count:
-                                spawn_miniboss()
-                                minibosses_spawned += 1
-                            
-                            # Check if wave is complete
-                            if enemies_spawned >= wave_minion_count and minibosses_spawned >= wave_miniboss_count and time_into_wave > wave_spawn_duration:
-                                wave_index += 1
-                                enemies_spawned = 0
-                                minibosses_spawned = 0
-                
-                player.handle_input(dt, world_objects, spatial_grid)
-                
-                # Apply border collision - keep player within map bounds
-                player.pos.x = max(BORDER_DISTANCE, min(WORLD_W - BORDER_DISTANCE, player.pos.x))
-                player.pos.y = max(BORDER_DISTANCE, min(WORLD_H - BORDER_DISTANCE, player.pos.y))
-                
-                camera.update(player.pos)
-                # Advance player's weapon cooldown timer
-                player.update_weapon_timer(dt)
-
-                # Check for nearby Pie pickups
-                try:
-                    nearby_for_pickup = spatial_grid.get_nearby(player.pos, radius=1)
-                    for obj in nearby_for_pickup:
-                        if isinstance(obj, Pie) and not getattr(obj, 'picked', False):
-                            if obj.overlaps(player.pos, player.get_mask()):
-                                # Pickup: increase health by 10, capped at max_health
-                                player.health = min(player.max_health, player.health + 10)
-                                obj.picked = True
-                                # Remove from world_objects so it's no longer considered
-                                try:
-                                    if obj in world_objects:
-                                        world_objects.remove(obj)
-                                except Exception:
-                                    pass
-                                try:
-                                    if obj in pies:
-                                        pies.remove(obj)
-                                except Exception:
-                                    pass
-                        
-                        # Check for item drop pickups
-                        if isinstance(obj, ItemDrop) and not obj.picked:
-                            if obj.can_pickup(player.pos):
-                                # Check if weapon uniqueness constraint is met
-                                from Objects.Weapons.weapon import Weapon
-                                if isinstance(obj.item, Weapon):
-                                    # Check if player already has this weapon type
-                                    weapon_name = obj.item.name
-                                    already_has = any(w.name == weapon_name for w in player.inventory.weapons)
-                                    if already_has:
-                                        # Skip this weapon, don't pick up
-                                        continue
-                                
-                                # Try to add to inventory
-                                if player.inventory.add_item(obj.item):
-                                    inventory_ui.add_item_notification(obj.item)
-                                    obj.picked = True
-                                    
-                                    # Apply equipment/weapon effects immediately
-                                    if hasattr(obj.item, 'apply_effect'):
-                                        try:
-                                            obj.item.apply_effect(player)
-                                        except Exception:
-                                            pass
-                                    
-                                    # If this is a weapon, remove all duplicates from the ground
-                                    if isinstance(obj.item, Weapon):
-                                        weapon_name = obj.item.name
-                                        for drop in item_drops[:]:
-                                            if not drop.picked and isinstance(drop.item, Weapon):
-                                                if drop.item.name == weapon_name:
-                                                    drop.picked = True
-                                                    try:
-                                                        if drop in world_objects:
-                                                            world_objects.remove(drop)
-                                                    except Exception:
-                                                        pass
-                                    
-                                    # Remove from world
-                                    try:
-                                        if obj in world_objects:
-                                            world_objects.remove(obj)
-                                    except Exception:
-                                        pass
-                                    try:
-                                        if obj in item_drops:
-                                            item_drops.remove(obj)
-                                    except Exception:
-                                        pass
-                except Exception:
-                    pass
-                
-                # Update inventory UI
-                inventory_ui.update(dt)
-
-                # Update projectiles and radius weapons
-                for p in projectiles[:]:  # Iterate over copy to allow removal
-                    # Handle radius weapons vs projectiles
-                    if isinstance(p, RadiusWeapon):
-                        p.update(dt, player.pos)
-                    else:
-                        p.update(dt)
-
-                    # Check collision with enemies
-                    for e in enemies[:]:
-                        if p.check_collision_with_enemy(e):
-                            e.take_damage(p.damage)
-                            # Only mark as dead on collision for projectiles
-                            if not isinstance(p, RadiusWeapon):
-                                p.dead = True
+                for _ in range(stepper.advance(dt)):
+                    step_dt = stepper.step_dt
+                    keys = None
+                    if replay_frames is not None:
+                        frame = next(replay_frames, None)
+                        if frame is None:
+                            # End of the recording
+                            running = game_running = False
                             break
+                        step_dt = frame.dt
+                        keys = replay.KeyState(frame.keys)
+                        attacks = frame.attacks
+                    for direction in attacks:
+                        session.attack(direction, step_dt)
+                    if recorder is not None:
+                        if keys is None:
+                            keys = replay.KeyState(replay.keys_to_mask(pygame.key.get_pressed()))
+                        # A replay being re-recorded writes the replayed inputs
+                        recorder.write_frame(step_dt, keys.mask, attacks)
+                    attacks = []
+                    session.step(step_dt, timings, keys)
 
-                    # Remove dead projectiles/weapons
-                    if p.dead:
-                        projectiles.remove(p)
-
-                # Auto-fire player weapons
-                player.auto_fire(dt, enemies, projectiles)
-                
-                # Update item drops
-                for item_drop in item_drops:
-                    if not item_drop.picked:
-                        item_drop.update(dt)
-
-                # Update enemies
-                for e in enemies:
-                    e.update(dt, player, world_objects, spatial_grid, enemies)
-                    # check collision with player (mask-based)
-                    try:
-                        if e.overlaps(player.pos, player.get_mask()):
-                            # Apply contact damage with cooldown per enemy
-                            now = pygame.time.get_ticks() / 1000.0
-                            if now - getattr(e, 'last_contact_time', -9999.0) >= getattr(e, 'contact_cooldown', 0.7):
-                                e.last_contact_time = now
-                                player.take_damage(getattr(e, 'contact_damage', 1))
-                    except Exception:
-                        pass
-
-                # Draw world: tile the background image to cover the visible world area
-                offset = camera.offset
-
-                # Determine first tile coordinates (world space) to draw
-                first_tile_x = (int(offset.x) // TILE_W) * TILE_W
-                first_tile_y = (int(offset.y) // TILE_H) * TILE_H
-
-                # Number of tiles needed to cover the screen (add 2 for buffer)
-                tiles_x = WIDTH // TILE_W + 3
-                tiles_y = HEIGHT // TILE_H + 3
-
-                for ix in range(tiles_x):
-                    for iy in range(tiles_y):
-                        tile_x = first_tile_x + ix * TILE_W
-                        tile_y = first_tile_y + iy * TILE_H
-
-                        # Skip tiles outside the defined world bounds
-                        if tile_x + TILE_W < 0 or tile_x > WORLD_W:
-                            continue
-                        if tile_y + TILE_H < 0 or tile_y > WORLD_H:
-                            continue
-
-                        screen_x = tile_x - offset.x
-                        screen_y = tile_y - offset.y
-                        screen.blit(BG_TILE, (int(screen_x), int(screen_y)))
-
-                        # Draw semi-transparent 1px border around each tile to match thin grid lines
-                        border_surface = pygame.Surface((TILE_W, TILE_H), pygame.SRCALPHA)
-                        pygame.draw.rect(border_surface, (0, 0, 0, 50), (0, 0, TILE_W, TILE_H), 1)
-                        screen.blit(border_surface, (int(screen_x), int(screen_y)))
-
-                # Draw world objects and player sorted by depth (y-coordinate of bottom edge)
-                # Collect visible renderable entities with their depth
-                render_list = []
-                
-                # Get nearby objects for rendering (larger radius for better render distance)
-                nearby_render_objs = spatial_grid.get_nearby(camera.offset + pygame.Vector2(WIDTH / 2, HEIGHT / 2), radius=5)
-                
-                for obj in nearby_render_objs:
-                    # Only include if on-screen
-                    if getattr(obj, 'picked', False):
-                        continue
-                    screen_x = obj.pos.x - offset.x
-                    screen_y = obj.pos.y - offset.y
-                    if -200 < screen_x < WIDTH + 200 and -200 < screen_y < HEIGHT + 200:
-                        depth = obj.get_bottom_y()
-                        render_list.append((depth, obj, "object"))
-
-                # Add player to render list
-                player_depth = player.pos.y + player.get_image().get_height() / 2
-                render_list.append((player_depth, player, "player"))
-
-                # Remove dead enemies before rendering
-                enemies[:] = [en for en in enemies if not en.dead]
-
-                # Include visible enemies in render list
-                for e in enemies:
-                    screen_x = e.pos.x - offset.x
-                    screen_y = e.pos.y - offset.y
-                    if -200 < screen_x < WIDTH + 200 and -200 < screen_y < HEIGHT + 200:
-                        render_list.append((e.pos.y + e.get_image().get_height() / 2, e, "enemy"))
-
-                # Include projectiles in render list
-                for p in projectiles:
-                    screen_x = p.pos.x - offset.x
-                    screen_y = p.pos.y - offset.y
-                    if -200 < screen_x < WIDTH + 200 and -200 < screen_y < HEIGHT + 200:
-                        render_list.append((p.pos.y, p, "projectile"))
-
-                # Sort by depth (y-coordinate of bottom edge)
-                render_list.sort(key=lambda x: x[0])
-
-                # Render all entities in depth order
-                for depth, entity, entity_type in render_list:
-                    if entity_type == "object":
-                        entity.draw(screen, camera)
-                    elif entity_type == "player":
-                        entity.draw(screen, camera)
-                    elif entity_type == "enemy":
-                        entity.draw(screen, camera)
-                    elif entity_type == "projectile":
-                        entity.draw(screen, camera)
-                
-                # Draw inventory UI (weapons and equipment at top)
-                inventory_ui.draw_inventory_bars(screen, player.inventory)
-                
-                # Draw recently added item notifications
-                inventory_ui.draw_notifications(screen)
-                
-                # Draw game timer at top center
-                minutes = int(game_timer) // 60
-                seconds = int(game_timer) % 60
-                timer_text = f"{minutes:02d}:{seconds:02d}"
-                timer_surface = timer_font.render(timer_text, True, (0, 0, 0))
-                timer_rect = timer_surface.get_rect(center=(WIDTH // 2, 30))
-                screen.blit(timer_surface, timer_rect)
+                # Update inventory UI
+                inventory_ui.update(dt)
 
-                pygame.display.flip()
+                # Draw world: background chunks, then scenery/player/enemies by depth
+                session.draw(render_target.surface, background, timings, stepper.alpha)
+                with profiler.zone("upscale"):
+                    upscale_start = time.perf_counter()
+                    render_target.present()
+                    if timings is not None:
+                        timings["upscale"] = time.perf_counter() - upscale_start
+
+                with profiler.zone("hud"):
+                    # Draw inventory UI (weapons and equipment at top)
+                    inventory_ui.draw_inventory_bars(screen, player.inventory)
+
+                    # Draw recently added item notifications
+                    inventory_ui.draw_notifications(screen)
+
+                    # Draw game timer at top center
+                    minutes = int(session.game_timer) // 60
+                    seconds = int(session.game_timer) % 60
+                    timer_text = f"{minutes:02d}:{seconds:02d}"
+                    timer_surface = timer_font.render(timer_text, True, (0, 0, 0))
+                    timer_rect = timer_surface.get_rect(center=(WIDTH // 2, 30))
+                    screen.blit(timer_surface, timer_rect)
+
+                    if timings is not None:
+                        rotations = sprite_cache.get_rotation_stats()
+                        perf_overlay.update(dt, last_frame_ms, clock.get_fps(), {
+                            "enemies": len(session.enemies),
+                            "projectiles": len(session.projectiles),
+                            "world_objects": len(session.world_objects),
+                            "visible": session.visible_count,
+                            "render scale": f"{render_target.scale:g}x",
+                            "rotation frames": f"{rotations['frames']} in {rotations['tables']} "
+                                               f"({rotations['memory_bytes'] / 1e6:.1f} MB)",
+                        }, timings, counters.latest())
+                        perf_overlay.draw(screen)
+
+                with profiler.zone("flip"):
+                    pygame.display.flip()
             else:
                 # Paused: render paused menu (blurred snapshot + exit button)
                 pause_menu.render(screen)
-                
+
                 # Draw full inventory on pause screen
                 pause_inventory_ui.draw(screen, player.inventory, pause_menu_alpha=200)
-                
+
                 pygame.display.flip()
 
+            last_frame_ms = (time.perf_counter() - frame_start) * 1000.0
+            profiler.frame_end()
+            counters.end_frame()
+
+        if recorder is not None:
+            recorder.close()
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Frozen builds need this before starting world generation worker processes
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,155 @@
+from collections import deque
+import pygame
+
+
+class FlowField:
+    """Coarse distance field toward the player over the static obstacle bitmap.
+
+    The world is divided into `cell_size` cells; a cell is blocked when the
+    obstacle footprints (see ObstacleMap) touch it, padded by `clearance`.
+    Whenever the player enters a new cell, a breadth-first search from the
+    player's cell refills the step distances within `radius_cells`. Moving
+    the target one cell shifts nearly every distance by one, so the search
+    is redone in full; what carries over between searches is each cell's
+    blocked flag and list of passable neighbours, since obstacles are static. Enemies
+    then read the direction toward the neighbouring cell closest to the player
+    in O(1) instead of probing rotated moves against the obstacles.
+    """
+
+    # 8-connected neighbourhood (dc, dr)
+    NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+    def __init__(self, obstacle_map, cell_size=64, radius_cells=30, clearance=24):
+        """
+        Args:
+            obstacle_map: ObstacleMap whose `footprints` bitmap defines blocked space
+            cell_size: Size of a navigation cell in world pixels
+            radius_cells: Cells around the player covered by the field
+            clearance: Extra padding (pixels) around each cell when testing for obstacles
+        """
+        self.bitmap = obstacle_map.footprints
+        self.cell_size = cell_size
+        self.radius_cells = radius_cells
+        self._probe = pygame.mask.Mask((cell_size + 2 * clearance,) * 2, fill=True)
+        self._blocked = {}  # (col, row) -> bool; obstacles are static so this only grows
+        self._links = {}  # (col, row) -> passable neighbour cells, built from _blocked
+        self.dist = {}  # (col, row) -> steps to the target cell
+        self.target_cell = None
+        self.rebuilds = 0
+
+    def cell_of(self, pos):
+        return (int(pos.x // self.cell_size), int(pos.y // self.cell_size))
+
+    def is_blocked(self, cell):
+        blocked = self._blocked.get(cell)
+        if blocked is None:
+            cs = self.cell_size
+            center = pygame.Vector2((cell[0] + 0.5) * cs, (cell[1] + 0.5) * cs)
+            blocked = self.bitmap.overlaps(self._probe, center)
+            self._blocked[cell] = blocked
+        return blocked
+
+    def invalidate(self, rect=None):
+        """Forget cached blocked cells (call after obstacles are added or removed).
+
+        With `rect` (x, y, w, h in world pixels), only cells touching that area
+        are forgotten; the field is rebuilt on the next `update` either way.
+        """
+        self.target_cell = None
+        if rect is None:
+            self._blocked.clear()
+            self._links.clear()
+            return
+        x, y, w, h = rect
+        first_c, first_r = self.cell_of(pygame.Vector2(x, y))
+        last_c, last_r = self.cell_of(pygame.Vector2(x + w, y + h))
+        blocked = self._blocked
+        links = self._links
+        # Links of the cells around the area depend on it too
+        for r in range(first_r - 1, last_r + 2):
+            for c in range(first_c - 1, last_c + 2):
+                links.pop((c, r), None)
+                if first_c <= c <= last_c and first_r <= r <= last_r:
+                    blocked.pop((c, r), None)
+
+    def update(self, target_pos):
+        """Rebuild the field if `target_pos` moved into a different cell.
+
+        Returns True if the field was rebuilt.
+        """
+        cell = self.cell_of(target_pos)
+        if cell == self.target_cell:
+            return False
+        self.target_cell = cell
+        self._rebuild(cell)
+        return True
+
+    def links(self, cell):
+        """Neighbours reachable in one step from `cell` (cached, like is_blocked)."""
+        links = self._links.get(cell)
+        if links is None:
+            c, r = cell
+            is_blocked = self.is_blocked
+            links = []
+            for dc, dr in self.NEIGHBOURS:
+                nxt = (c + dc, r + dr)
+                if is_blocked(nxt):
+                    continue
+                # Don't cut corners past a blocked cell
+                if dc and dr and (is_blocked((c + dc, r)) or is_blocked((c, r + dr))):
+                    continue
+                links.append(nxt)
+            links = self._links[cell] = tuple(links)
+        return links
+
+    def _rebuild(self, start):
+        tc, tr = start
+        radius = self.radius_cells
+        min_c, max_c, min_r, max_r = tc - radius, tc + radius, tr - radius, tr + radius
+        dist = {start: 0}
+        queue = deque([start])
+        all_links = self._links
+        links = self.links
+        while queue:
+            cell = queue.popleft()
+            d = dist[cell] + 1
+            cell_links = all_links.get(cell)
+            if cell_links is None:
+                cell_links = links(cell)
+            for nxt in cell_links:
+                if nxt in dist:
+                    continue
+                nc, nr = nxt
+                if nc < min_c or nc > max_c or nr < min_r or nr > max_r:
+                    continue
+                dist[nxt] = d
+                queue.append(nxt)
+        self.dist = dist
+        self.rebuilds += 1
+
+    def direction(self, pos):
+        """Unit vector from `pos` toward the player along the field, or None.
+
+        None means `pos` is outside the field (or unreachable), or already in
+        the player's cell; callers should fall back to seeking directly.
+        """
+        cell = self.cell_of(pos)
+        dist = self.dist
+        best = dist.get(cell)
+        best_cell = None
+        # Only the steps the search itself may take (no corner cutting)
+        for nxt in self.links(cell):
+            d = dist.get(nxt)
+            if d is not None and (best is None or d < best):
+                best = d
+                best_cell = nxt
+        if best_cell is None:
+            return None
+        dc, dr = best_cell[0] - cell[0], best_cell[1] - cell[1]
+        cs = self.cell_size
+        # Aim at the centre of the next cell so enemies stay off cell corners
+        target = pygame.Vector2((best_cell[0] + 0.5) * cs, (best_cell[1] + 0.5) * cs)
+        heading = target - pos
+        if heading.length_squared() == 0:
+            return pygame.Vector2(dc, dr).normalize()
+        return heading.normalize()
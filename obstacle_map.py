@@ -0,0 +1,185 @@
+import pygame
+import counters
+
+
+class CollisionBitmap:
+    """World-space collision bitmap stored as fixed-size chunks of pygame masks.
+
+    Masks are stamped in once at their world position; afterwards "does this
+    mask overlap anything?" is one `Mask.overlap` call per chunk the query
+    touches (usually one) instead of one call per nearby object. Chunks are
+    created on demand, so the bitmap has no fixed bounds.
+    """
+
+    def __init__(self, chunk_size=1024):
+        self.chunk_size = chunk_size
+        self.chunks = {}  # (cx, cy) -> pygame.mask.Mask
+        self._stamps = {}  # key -> (mask, x, y)
+        self._chunk_keys = {}  # (cx, cy) -> set of stamp keys touching that chunk
+
+    def _chunk_range(self, x, y, w, h):
+        cs = self.chunk_size
+        for cy in range(y // cs, (y + h - 1) // cs + 1):
+            for cx in range(x // cs, (x + w - 1) // cs + 1):
+                yield cx, cy
+
+    def _draw(self, mask, x, y):
+        w, h = mask.get_size()
+        cs = self.chunk_size
+        for cx, cy in self._chunk_range(x, y, w, h):
+            chunk = self.chunks.get((cx, cy))
+            if chunk is None:
+                chunk = pygame.mask.Mask((cs, cs))
+                self.chunks[(cx, cy)] = chunk
+            chunk.draw(mask, (x - cx * cs, y - cy * cs))
+
+    def stamp(self, key, mask, x, y):
+        """Add `mask` with its top-left corner at world (x, y), remembered under `key`."""
+        x, y = int(x), int(y)
+        self._stamps[key] = (mask, x, y)
+        w, h = mask.get_size()
+        for chunk_key in self._chunk_range(x, y, w, h):
+            self._chunk_keys.setdefault(chunk_key, set()).add(key)
+        self._draw(mask, x, y)
+
+    def unstamp(self, key):
+        """Remove a previously stamped mask. Returns True if `key` was present."""
+        entry = self._stamps.pop(key, None)
+        if entry is None:
+            return False
+        mask, x, y = entry
+        w, h = mask.get_size()
+        cs = self.chunk_size
+        rect = pygame.Rect(x, y, w, h)
+        neighbours = set()
+        for chunk_key in self._chunk_range(x, y, w, h):
+            keys = self._chunk_keys.get(chunk_key)
+            if keys is not None:
+                keys.discard(key)
+                neighbours.update(keys)
+                if not keys:
+                    # Nothing left in this chunk: drop it entirely
+                    del self._chunk_keys[chunk_key]
+                    self.chunks.pop(chunk_key, None)
+                    continue
+            chunk = self.chunks.get(chunk_key)
+            if chunk is not None:
+                chunk.erase(mask, (x - chunk_key[0] * cs, y - chunk_key[1] * cs))
+        # Erasing may have cleared bits shared with overlapping stamps; redraw those
+        for other in neighbours:
+            o_mask, ox, oy = self._stamps[other]
+            if rect.colliderect(pygame.Rect(ox, oy, *o_mask.get_size())):
+                self._draw(o_mask, ox, oy)
+        return True
+
+    def rects(self):
+        """(x, y, w, h) world rects of every stamped mask."""
+        return [(x, y) + mask.get_size() for mask, x, y in self._stamps.values()]
+
+    def clear(self):
+        self.chunks.clear()
+        self._stamps.clear()
+        self._chunk_keys.clear()
+
+    def overlaps(self, mask, pos):
+        """Check `mask` centered at `pos` against the bitmap.
+
+        The mask is placed exactly like the "other" mask in
+        `collision.mask_vs_object`.
+        """
+        if counters.enabled:
+            counters.incr("bitmap.queries")
+        w, h = mask.get_size()
+        x = int(pos.x - w / 2)
+        y = int(pos.y - h / 2)
+        cs = self.chunk_size
+        for cx, cy in self._chunk_range(x, y, w, h):
+            chunk = self.chunks.get((cx, cy))
+            if chunk is not None and chunk.overlap(mask, (x - cx * cs, y - cy * cs)) is not None:
+                return True
+        return False
+
+
+class ObstacleMap:
+    """Collision bitmaps for the static trees and bushes of a world.
+
+    Obstacles never move after world generation, so their masks are stamped
+    once into world-space bitmaps and movement tests become a single overlap:
+
+    - `footprints`: bottom-third masks of every tree and bush (enemy movement)
+    - `tree_footprints` / `bush_solids`: tree bottom thirds and full bush masks,
+      matching how the player collides with each kind.
+
+    Placement mirrors `collision.mask_vs_object`, so results are identical to
+    testing each nearby object one at a time.
+    """
+
+    BLOCKING = ("Tree", "Bush")
+
+    def __init__(self, chunk_size=1024):
+        self.footprints = CollisionBitmap(chunk_size)
+        self.tree_footprints = CollisionBitmap(chunk_size)
+        self.bush_solids = CollisionBitmap(chunk_size)
+
+    @classmethod
+    def from_objects(cls, objects, chunk_size=1024):
+        """Build a map from the blocking objects in `objects` (others are ignored)."""
+        obstacle_map = cls(chunk_size)
+        for obj in objects:
+            obstacle_map.add(obj)
+        return obstacle_map
+
+    @staticmethod
+    def _placement(obj, partial):
+        img = obj.get_image()
+        w, h = img.get_size()
+        x = int(obj.pos.x) - w // 2
+        if partial:
+            return obj.get_partial_mask_bottom_third(), x, int(obj.pos.y + h / 3)
+        return obj.get_mask(), x, int(obj.pos.y) - h // 2
+
+    def add(self, obj):
+        """Stamp a tree or bush into the bitmaps. Returns False for other objects."""
+        kind = obj.__class__.__name__
+        if kind not in self.BLOCKING:
+            return False
+        mask, x, y = self._placement(obj, partial=True)
+        self.footprints.stamp(obj, mask, x, y)
+        if kind == "Tree":
+            self.tree_footprints.stamp(obj, mask, x, y)
+        else:
+            mask, x, y = self._placement(obj, partial=False)
+            self.bush_solids.stamp(obj, mask, x, y)
+        return True
+
+    def remove(self, obj):
+        """Remove an obstacle from the bitmaps."""
+        self.footprints.unstamp(obj)
+        self.tree_footprints.unstamp(obj)
+        self.bush_solids.unstamp(obj)
+
+    def enemy_blocked(self, enemy_mask, pos):
+        """True if an enemy mask centered at `pos` touches any obstacle footprint."""
+        return self.footprints.overlaps(enemy_mask, pos)
+
+    def free_enemy_position(self, enemy_mask, pos, step=16, max_distance=512):
+        """Nearest position to `pos` where the enemy mask touches no footprint, or None.
+
+        Searches rings `step` apart (16 directions each) out to `max_distance`;
+        `pos` itself is returned when it is already free.
+        """
+        if not self.enemy_blocked(enemy_mask, pos):
+            return pygame.Vector2(pos)
+        test = pygame.Vector2()
+        for i in range(1, int(max_distance // step) + 1):
+            for angle in range(0, 360, 360 // 16):
+                test.from_polar((i * step, angle))
+                test += pos
+                if not self.enemy_blocked(enemy_mask, test):
+                    return test
+        return None
+
+    def player_blocked(self, partial_mask, full_mask, pos):
+        """True if the player at `pos` touches a tree base or a bush."""
+        return (self.tree_footprints.overlaps(partial_mask, pos)
+                or self.bush_solids.overlaps(full_mask, pos))
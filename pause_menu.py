@@ -1,7 +1,6 @@
 import pygame
-import os
 import sys
-from asset_manager import get_asset_path
+import sprite_cache
 
 
 class PauseMenu:
@@ -25,13 +24,11 @@ class PauseMenu:
     
     def add_button(self, image_path, button_id):
         """Add a button to the pause menu. Buttons are arranged top-to-bottom."""
-        if not os.path.isabs(image_path) and not os.path.exists(image_path):
-            image_path = get_asset_path(os.path.basename(image_path))
-        try:
-            img = pygame.image.load(image_path).convert_alpha()
-            self.buttons.append((img, button_id))
-        except Exception as e:
-            print(f"Failed to load button image {image_path}: {e}")
+        img = sprite_cache.get_surface(image_path)
+        if img is None:
+            print(f"Failed to load button image {image_path}")
+            return
+        self.buttons.append((img, button_id))
     
     def _calculate_button_positions(self):
         """Calculate positions for all buttons with even vertical spacing, centered on X."""
@@ -0,0 +1,170 @@
+"""Named timing zones with Chrome/Perfetto trace export.
+
+Wrap a phase of the frame in a zone:
+
+    import profiler
+    with profiler.zone("enemy_ai"):
+        ...
+
+While no recording is running, `zone()` returns a shared no-op context
+manager, so zones cost one function call. `start(frames)` records the next
+`frames` frames (call `frame_end()` once per frame) and then writes a
+trace-event JSON file that chrome://tracing or https://ui.perfetto.dev can
+open.
+
+Recording can also be started from the environment: PAPERTRAIL_TRACE=<frames>
+records that many frames from startup, and PAPERTRAIL_TRACE_FILE sets the
+output path (default: papertrail_trace.json).
+"""
+import json
+import os
+from time import perf_counter_ns
+
+DEFAULT_TRACE_FILE = "papertrail_trace.json"
+DEFAULT_TRACE_FRAMES = 300
+
+
+class _NullZone:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_ZONE = _NullZone()
+
+
+class _Zone:
+    __slots__ = ("events", "name", "start")
+
+    def __init__(self, events, name):
+        self.events = events
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.events.append((self.name, self.start, perf_counter_ns()))
+        return False
+
+
+class Tracer:
+    """Records zones for a fixed number of frames, then writes a trace file."""
+
+    def __init__(self):
+        self.enabled = False
+        self.path = DEFAULT_TRACE_FILE
+        self.frames_left = 0
+        self.frame = 0
+        self.last_path = None
+        self._events = []  # (name, start_ns, end_ns)
+        self._counters = []  # (name, ns, value)
+        self._frame_start = None
+        self._origin = 0
+
+    def start(self, frames=DEFAULT_TRACE_FRAMES, path=None):
+        """Begin recording the next `frames` frames (restarts a running recording)."""
+        self.path = path or self.path
+        self.frames_left = frames
+        self.frame = 0
+        self._events = []
+        self._counters = []
+        self._origin = perf_counter_ns()
+        self._frame_start = self._origin
+        self.enabled = True
+
+    def stop(self):
+        """Stop recording and write what was captured. Returns the file path."""
+        if not self.enabled:
+            return None
+        self.enabled = False
+        self.last_path = self.write(self.path)
+        return self.last_path
+
+    def zone(self, name):
+        if not self.enabled:
+            return _NULL_ZONE
+        return _Zone(self._events, name)
+
+    def counter(self, name, value):
+        """Record a counter sample (e.g. enemy count) shown as a graph track."""
+        if self.enabled:
+            self._counters.append((name, perf_counter_ns(), value))
+
+    def frame_end(self):
+        """Mark the end of a frame; stops and writes once the requested frames are recorded."""
+        if not self.enabled:
+            return
+        now = perf_counter_ns()
+        self._events.append(("frame", self._frame_start, now))
+        self._frame_start = now
+        self.frame += 1
+        self.frames_left -= 1
+        if self.frames_left <= 0:
+            self.stop()
+
+    def to_chrome(self):
+        """Trace-event JSON object ("X" complete events and "C" counters, microseconds)."""
+        origin = self._origin
+        events = [{"name": "process_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "PaperTrail"}}]
+        for name, start, end in self._events:
+            events.append({
+                "name": name, "cat": "frame" if name == "frame" else "zone", "ph": "X",
+                "ts": (start - origin) / 1000.0, "dur": (end - start) / 1000.0,
+                "pid": 1, "tid": 1,
+            })
+        for name, ts, value in self._counters:
+            events.append({
+                "name": name, "ph": "C", "ts": (ts - origin) / 1000.0,
+                "pid": 1, "tid": 1, "args": {name: value},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_chrome(), f)
+        return path
+
+
+TRACER = Tracer()
+
+
+def zone(name):
+    """Context manager timing `name` on the global tracer (no-op unless recording)."""
+    if not TRACER.enabled:
+        return _NULL_ZONE
+    return _Zone(TRACER._events, name)
+
+
+def counter(name, value):
+    TRACER.counter(name, value)
+
+
+def frame_end():
+    TRACER.frame_end()
+
+
+def start(frames=DEFAULT_TRACE_FRAMES, path=None):
+    TRACER.start(frames, path)
+
+
+def is_recording():
+    return TRACER.enabled
+
+
+def start_from_env():
+    """Start recording if PAPERTRAIL_TRACE is set. Returns True if recording started."""
+    value = os.environ.get("PAPERTRAIL_TRACE")
+    if not value:
+        return False
+    try:
+        frames = int(value)
+    except ValueError:
+        frames = DEFAULT_TRACE_FRAMES
+    TRACER.start(frames, os.environ.get("PAPERTRAIL_TRACE_FILE") or DEFAULT_TRACE_FILE)
+    return True
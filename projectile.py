@@ -1,5 +1,6 @@
 import pygame
 import math
+import sprite_cache
 
 
 class Projectile:
@@ -32,13 +33,9 @@ class Projectile:
         except Exception:
             self.radius = int(radius)
         self.dead = False
-        self.image = None
         self.image_path = image_path
-        if image_path:
-            try:
-                self.image = pygame.image.load(image_path).convert_alpha()
-            except Exception:
-                self.image = None
+        # Shared surface: every star/confetti shot reuses the same decoded image
+        self.image = sprite_cache.get_surface(image_path) if image_path else None
 
     def update(self, dt):
         """Update projectile position and lifetime."""
@@ -58,15 +55,18 @@ class Projectile:
         """Draw projectile as a simple circle."""
         screen_pos = camera.apply(self.pos)
         if self.image:
-            img = self.image
+            img = camera.scaled(self.image)
             rect = img.get_rect(center=(int(screen_pos.x), int(screen_pos.y)))
             surface.blit(img, rect)
         else:
-            pygame.draw.circle(surface, (255, 255, 0), (int(screen_pos.x), int(screen_pos.y)), self.radius)
+            pygame.draw.circle(surface, (255, 255, 0), (int(screen_pos.x), int(screen_pos.y)),
+                               max(1, int(self.radius * camera.scale)))
+
+    def get_collision_radius(self):
+        """Radius used for circular hit tests."""
+        return self.radius
 
     def check_collision_with_enemy(self, enemy):
         """Check if projectile hits an enemy (simple circular collision)."""
         dist = self.pos.distance_to(enemy.pos)
-        enemy_img = enemy.get_image()
-        enemy_radius = max(enemy_img.get_width(), enemy_img.get_height()) / 2
-        return dist < (self.radius + enemy_radius)
+        return dist < (self.radius + enemy.get_collision_radius())
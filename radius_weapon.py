@@ -1,5 +1,6 @@
 import pygame
 import math
+import sprite_cache
 
 
 class RadiusWeapon:
@@ -46,17 +47,10 @@ class RadiusWeapon:
         self.angle = 0.0  # Current angle in radians
         self.dead = False
         
-        # Load image
+        # Load image (shared and pre-scaled to object_size by the sprite cache)
         self.image = None
         if image_path:
-            try:
-                self.image = pygame.image.load(image_path).convert_alpha()
-                # Scale if needed
-                w, h = self.image.get_size()
-                if w != object_size or h != object_size:
-                    self.image = pygame.transform.scale(self.image, (object_size, object_size))
-            except Exception:
-                self.image = None
+            self.image = sprite_cache.get_surface(image_path, size=(object_size, object_size))
 
     @property
     def pos(self):
@@ -110,12 +104,17 @@ class RadiusWeapon:
         screen_pos = camera.apply(pos)
 
         if self.image:
-            rect = self.image.get_rect(center=(int(screen_pos.x), int(screen_pos.y)))
-            surface.blit(self.image, rect)
+            img = camera.scaled(self.image)
+            rect = img.get_rect(center=(int(screen_pos.x), int(screen_pos.y)))
+            surface.blit(img, rect)
         else:
             # Fallback: draw circle
             pygame.draw.circle(surface, (200, 100, 50), (int(screen_pos.x), int(screen_pos.y)), 
-                             self.object_size // 2)
+                             max(1, int(self.object_size / 2 * camera.scale)))
+
+    def get_collision_radius(self):
+        """Radius used for circular hit tests."""
+        return self.object_size / 2
 
     def check_collision_with_enemy(self, enemy):
         """Check if weapon hits an enemy (circular collision)."""
@@ -124,7 +123,5 @@ class RadiusWeapon:
             return False
         pos = self.get_position()
         dist = pos.distance_to(enemy.pos)
-        enemy_img = enemy.get_image()
-        enemy_radius = max(enemy_img.get_width(), enemy_img.get_height()) / 2
         weapon_radius = self.object_size / 2
-        return dist < (weapon_radius + enemy_radius)
+        return dist < (weapon_radius + enemy.get_collision_radius())
@@ -0,0 +1,192 @@
+"""Record and replay a run's inputs for reproducible (profiling) sessions.
+
+A GameSession is deterministic given its seed and, per stepped frame, the
+`dt`, the held movement keys and any click attacks. A replay file stores
+exactly that, gzip-compressed:
+
+    header: b"PTRP", u16 version, u64 seed, u16 view width, u16 view height,
+            u8 flags (bit 0: horde engine, bit 1: endless world), u8 name length + player class name (utf-8)
+    frame:  f64 dt, u8 movement-key bitmask, u8 attack count,
+            then attack count x (f32, f32) attack directions
+
+Attack directions are rounded to float32 *before* the live game uses them
+(see `quantize_direction`), so the replay reproduces the run bit-for-bit.
+
+Record from the game with PAPERTRAIL_RECORD=<file>; replay in the game with
+PAPERTRAIL_REPLAY=<file>, or headless with:
+
+    python replay.py <file> [--render] [--trace FRAMES]
+"""
+import gzip
+import hashlib
+import struct
+from collections import namedtuple
+
+import pygame
+
+MAGIC = b"PTRP"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHQHHBB")
+_FLAG_HORDE = 1
+_FLAG_ENDLESS = 2
+_FRAME = struct.Struct("<dBB")
+_ATTACK = struct.Struct("<ff")
+
+# Keys that Player.handle_input reads, in bitmask order
+MOVEMENT_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+
+InputFrame = namedtuple("InputFrame", "dt keys attacks")
+
+
+class KeyState:
+    """Stand-in for pygame.key.get_pressed() built from a movement-key bitmask."""
+
+    __slots__ = ("mask",)
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        try:
+            return bool(self.mask & (1 << MOVEMENT_KEYS.index(key)))
+        except ValueError:
+            return False
+
+
+def keys_to_mask(pressed):
+    """Bitmask of the movement keys held in `pressed` (a get_pressed() result)."""
+    mask = 0
+    for bit, key in enumerate(MOVEMENT_KEYS):
+        if pressed[key]:
+            mask |= 1 << bit
+    return mask
+
+
+def quantize_direction(direction):
+    """Round a direction to the float32 precision stored in replay files."""
+    x, y = _ATTACK.unpack(_ATTACK.pack(direction[0], direction[1]))
+    return pygame.Vector2(x, y)
+
+
+class ReplayWriter:
+    """Streams a run's per-frame inputs to a replay file."""
+
+    def __init__(self, path, seed, player_class_name, view_size, use_horde=False, endless=False):
+        self.path = path
+        self.frames = 0
+        self._file = gzip.open(path, "wb")
+        name = player_class_name.encode("utf-8")
+        flags = (_FLAG_HORDE if use_horde else 0) | (_FLAG_ENDLESS if endless else 0)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, seed, view_size[0], view_size[1], flags, len(name)))
+        self._file.write(name)
+
+    def write_frame(self, dt, keys, attacks=()):
+        """Record one stepped frame: dt, movement-key bitmask and quantized attack directions."""
+        self._file.write(_FRAME.pack(dt, keys, len(attacks)))
+        for direction in attacks:
+            self._file.write(_ATTACK.pack(direction[0], direction[1]))
+        self.frames += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ReplayReader:
+    """Reads a replay file; iterate it for InputFrame(dt, keys, attacks) tuples."""
+
+    def __init__(self, path):
+        self.path = path
+        with gzip.open(path, "rb") as f:
+            data = f.read()
+        magic, version, self.seed, width, height, flags, name_len = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a PaperTrail replay")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        self.view_size = (width, height)
+        self.use_horde = bool(flags & _FLAG_HORDE)
+        self.endless = bool(flags & _FLAG_ENDLESS)
+        offset = _HEADER.size
+        self.player_class_name = data[offset:offset + name_len].decode("utf-8")
+        self._data = data
+        self._start = offset + name_len
+
+    def __iter__(self):
+        data = self._data
+        offset = self._start
+        end = len(data)
+        while offset < end:
+            dt, keys, attack_count = _FRAME.unpack_from(data, offset)
+            offset += _FRAME.size
+            attacks = []
+            for _ in range(attack_count):
+                attacks.append(pygame.Vector2(_ATTACK.unpack_from(data, offset)))
+                offset += _ATTACK.size
+            yield InputFrame(dt, keys, attacks)
+
+
+def state_digest(session):
+    """Short hash of the simulation state, for checking that a replay matched."""
+    h = hashlib.sha1()
+    player = session.player
+    h.update(struct.pack("<dddd", player.pos.x, player.pos.y, float(player.health), session.game_timer))
+    for e in session.enemies:
+        h.update(struct.pack("<ddd", e.pos.x, e.pos.y, float(e.health)))
+    for p in session.projectiles:
+        h.update(struct.pack("<dd", p.pos.x, p.pos.y))
+    return h.hexdigest()[:16]
+
+
+def play(session, reader, on_frame=None):
+    """Drive `session` with every frame of `reader`. Returns the number of frames."""
+    frames = 0
+    for frame in reader:
+        for direction in frame.attacks:
+            session.attack(direction, frame.dt)
+        session.step(frame.dt, keys=KeyState(frame.keys))
+        if on_frame is not None:
+            on_frame(session)
+        frames += 1
+    return frames
+
+
+def main(argv=None):
+    import argparse
+    import time
+    import profiler
+    from game_session import init_headless, GameSession, get_player_class
+
+    parser = argparse.ArgumentParser(description="Replay a recorded run headless and report its cost.")
+    parser.add_argument("path")
+    parser.add_argument("--render", action="store_true", help="also run the render pass")
+    parser.add_argument("--trace", type=int, metavar="FRAMES", help="record a zone trace of the first FRAMES frames")
+    args = parser.parse_args(argv)
+
+    init_headless()
+    reader = ReplayReader(args.path)
+    session = GameSession(get_player_class(reader.player_class_name), reader.view_size,
+                          seed=reader.seed, use_horde=reader.use_horde, endless=reader.endless)
+    screen = pygame.Surface(reader.view_size) if args.render else None
+
+    def on_frame(session):
+        if screen is not None:
+            session.draw(screen)
+        profiler.frame_end()
+
+    if args.trace:
+        profiler.start(args.trace)
+    start = time.perf_counter()
+    frames = play(session, reader, on_frame)
+    elapsed = time.perf_counter() - start
+    profiler.TRACER.stop()
+    print(f"{frames} frames in {elapsed:.2f}s ({1000 * elapsed / max(1, frames):.2f} ms/frame), "
+          f"state {state_digest(session)}")
+    if args.trace:
+        print(f"wrote {profiler.TRACER.last_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,11 @@
 import pygame
+import counters
+
+
+def _count_query(cells_scanned, objects_returned):
+    counters.incr("grid.queries")
+    counters.incr("grid.cells_scanned", cells_scanned)
+    counters.incr("grid.objects_returned", objects_returned)
 
 
 class SpatialGrid:
@@ -46,8 +53,162 @@ class SpatialGrid:
         row = y // self.cell_size
 
         nearby = []
-        for r in range(max(0, row - radius), min(self.rows, row + radius + 1)):
-            for c in range(max(0, col - radius), min(self.cols, col + radius + 1)):
+        rows = range(max(0, row - radius), min(self.rows, row + radius + 1))
+        cols = range(max(0, col - radius), min(self.cols, col + radius + 1))
+        for r in rows:
+            for c in cols:
                 nearby.extend(self.grid[r][c])
 
+        if counters.enabled:
+            _count_query(len(rows) * len(cols), len(nearby))
+        return nearby
+
+
+class DynamicSpatialGrid:
+    """Spatial hash for moving objects (enemies, projectiles, pickups).
+
+    Cells are stored sparsely in a dict keyed by (col, row), so the grid has no
+    fixed bounds. Each object's current cell is tracked, which lets `move`
+    skip objects that stayed in the same cell and lets `remove` go straight to
+    the right bucket.
+    """
+
+    def __init__(self, cell_size=256):
+        self.cell_size = cell_size
+        self.cells = {}  # (col, row) -> list of objects
+        self._obj_cells = {}  # obj -> (col, row)
+
+    def _cell_of(self, pos):
+        return (int(pos.x) // self.cell_size, int(pos.y) // self.cell_size)
+
+    def __len__(self):
+        return len(self._obj_cells)
+
+    def __contains__(self, obj):
+        return obj in self._obj_cells
+
+    def clear(self):
+        """Remove all objects from the grid."""
+        self.cells.clear()
+        self._obj_cells.clear()
+
+    def insert(self, obj):
+        """Insert an object at its current position (moves it if already present)."""
+        if obj in self._obj_cells:
+            self.move(obj)
+            return
+        key = self._cell_of(obj.pos)
+        self.cells.setdefault(key, []).append(obj)
+        self._obj_cells[obj] = key
+
+    def move(self, obj):
+        """Update an object's cell after its position changed.
+
+        Returns True if the object changed cells, False otherwise.
+        """
+        old_key = self._obj_cells.get(obj)
+        if old_key is None:
+            self.insert(obj)
+            return True
+        key = self._cell_of(obj.pos)
+        if key == old_key:
+            return False
+        self._remove_from_cell(obj, old_key)
+        self.cells.setdefault(key, []).append(obj)
+        self._obj_cells[obj] = key
+        return True
+
+    def remove(self, obj):
+        """Remove an object from the grid. Returns True if it was present."""
+        key = self._obj_cells.pop(obj, None)
+        if key is None:
+            return False
+        self._remove_from_cell(obj, key)
+        return True
+
+    def _remove_from_cell(self, obj, key):
+        cell = self.cells.get(key)
+        if cell is None:
+            return
+        try:
+            cell.remove(obj)
+        except ValueError:
+            pass
+        if not cell:
+            del self.cells[key]
+
+    def get_nearby(self, pos, radius=1):
+        """Get all objects in cells near the given position (within radius cells).
+
+        Same contract as `SpatialGrid.get_nearby`.
+        """
+        col, row = self._cell_of(pos)
+        cells = self.cells
+        nearby = []
+        for r in range(row - radius, row + radius + 1):
+            for c in range(col - radius, col + radius + 1):
+                cell = cells.get((c, r))
+                if cell:
+                    nearby.extend(cell)
+        if counters.enabled:
+            _count_query((2 * radius + 1) ** 2, len(nearby))
+        return nearby
+
+    def get_in_range(self, pos, distance):
+        """Get all objects in cells overlapping the square of half-size `distance` around pos."""
+        cs = self.cell_size
+        c0 = int(pos.x - distance) // cs
+        c1 = int(pos.x + distance) // cs
+        r0 = int(pos.y - distance) // cs
+        r1 = int(pos.y + distance) // cs
+        cells = self.cells
+        nearby = []
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                cell = cells.get((c, r))
+                if cell:
+                    nearby.extend(cell)
+        if counters.enabled:
+            _count_query((r1 - r0 + 1) * (c1 - c0 + 1), len(nearby))
         return nearby
+
+
+class LayeredSpatialGrid:
+    """A set of named DynamicSpatialGrid layers, e.g. enemies / projectiles / pickups.
+
+    Keeping entity kinds in separate layers means an enemy-vs-enemy query never
+    walks projectiles and a projectile-vs-enemy query never walks pickups.
+    """
+
+    DEFAULT_LAYERS = ("enemies", "projectiles", "pickups")
+
+    def __init__(self, cell_size=256, layers=DEFAULT_LAYERS):
+        """
+        Args:
+            cell_size: Cell size for every layer, or a dict of layer name -> cell size
+            layers: Names of the layers to create
+        """
+        self.layers = {}
+        for name in layers:
+            size = cell_size.get(name, 256) if isinstance(cell_size, dict) else cell_size
+            self.layers[name] = DynamicSpatialGrid(size)
+
+    def __getitem__(self, name):
+        return self.layers[name]
+
+    def clear(self):
+        """Clear every layer."""
+        for layer in self.layers.values():
+            layer.clear()
+
+    def insert(self, layer, obj):
+        self.layers[layer].insert(obj)
+
+    def move(self, layer, obj):
+        return self.layers[layer].move(obj)
+
+    def remove(self, layer, obj):
+        return self.layers[layer].remove(obj)
+
+    def get_nearby(self, layer, pos, radius=1):
+        return self.layers[layer].get_nearby(pos, radius)
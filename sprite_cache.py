@@ -0,0 +1,309 @@
+"""Process-wide cache for decoded sprite surfaces and their collision masks.
+
+Every entity that draws the same PNG shares one Surface (and one Mask) instead
+of decoding the file again per instance. Entries are keyed by the resolved
+asset path plus the transform applied to it (target size, scale factor,
+smoothing and flips), so e.g. the 1.5x mini boss robot and the plain
+AttackRobot are cached separately.
+
+Surfaces returned from here are shared: treat them as read-only and `copy()`
+before drawing onto one.
+"""
+import os
+import time
+import pygame
+import counters
+from asset_manager import get_asset_path, load_image
+
+# (resolved_path, size, scale, smooth, flip_x, flip_y) -> Surface (or None if the load failed)
+_surfaces = {}
+# Same keys as _surfaces -> pygame.mask.Mask
+_masks = {}
+# (id(full_mask), fraction) -> (full_mask, bottom-portion mask)
+_partial_masks = {}
+# (diameter, color) -> (Surface, Mask) used when a sprite fails to load
+_placeholders = {}
+
+# (id(surface), amplitude, step) -> (surface, RotationTable)
+_rotation_tables = {}
+
+# (id(surface), scale) -> (surface, scaled copy) for the render scale
+_scaled = {}
+
+# Default angle quantization (degrees) for rotation tables
+ROTATION_STEP = 1.0
+
+_hits = 0
+_misses = 0
+
+
+def resolve_path(path):
+    """Resolve an image path the same way the entity loaders always have.
+
+    Relative paths that do not exist from the working directory are looked up
+    by basename through `get_asset_path` (needed for PyInstaller bundles).
+    """
+    if (not os.path.isabs(path)) and (not os.path.exists(path)):
+        path = get_asset_path(os.path.basename(path))
+    return os.path.abspath(path)
+
+
+def _make_key(path, size=None, scale=None, smooth=False, flip_x=False, flip_y=False):
+    if size is not None:
+        size = (int(size[0]), int(size[1]))
+    if scale is not None:
+        scale = float(scale)
+        if scale == 1.0:
+            scale = None
+    return (resolve_path(path), size, scale, bool(smooth), bool(flip_x), bool(flip_y))
+
+
+def _build_surface(key):
+    """Decode and transform the surface described by `key`. Returns None on failure."""
+    path, size, scale, smooth, flip_x, flip_y = key
+    if size is not None or scale is not None or flip_x or flip_y:
+        # Derive transformed variants from the cached base image
+        img = _get((path, None, None, False, False, False))
+        if img is None:
+            return None
+    else:
+        try:
+            return load_image(path).convert_alpha()
+        except Exception:
+            return None
+
+    transform = pygame.transform.smoothscale if smooth else pygame.transform.scale
+    if scale is not None:
+        w, h = img.get_size()
+        img = transform(img, (int(w * scale), int(h * scale)))
+    if size is not None and img.get_size() != size:
+        img = transform(img, size)
+    if flip_x or flip_y:
+        img = pygame.transform.flip(img, flip_x, flip_y)
+    return img
+
+
+def _get(key):
+    global _hits, _misses
+    if key in _surfaces:
+        _hits += 1
+        if counters.enabled:
+            counters.incr("sprite_cache.hit")
+        return _surfaces[key]
+    _misses += 1
+    if counters.enabled:
+        counters.incr("sprite_cache.miss")
+    img = _build_surface(key)
+    # Failed loads are cached too so a missing file is only probed once
+    _surfaces[key] = img
+    return img
+
+
+def get_surface(path, size=None, scale=None, smooth=False, flip_x=False, flip_y=False):
+    """Return the shared Surface for `path` with the given transform, or None.
+
+    Args:
+        path: Image path (absolute, relative, or bare asset filename)
+        size: Optional (w, h) to scale to; skipped when already that size
+        scale: Optional uniform scale factor applied before `size`
+        smooth: Use smoothscale instead of scale
+        flip_x, flip_y: Flip the image horizontally / vertically
+    """
+    if not path:
+        return None
+    return _get(_make_key(path, size, scale, smooth, flip_x, flip_y))
+
+
+def get_mask(path, size=None, scale=None, smooth=False, flip_x=False, flip_y=False):
+    """Return the shared Mask for the given sprite, or None if it can't be loaded."""
+    if not path:
+        return None
+    key = _make_key(path, size, scale, smooth, flip_x, flip_y)
+    mask = _masks.get(key)
+    if mask is not None:
+        return mask
+    img = _get(key)
+    if img is None:
+        return None
+    mask = pygame.mask.from_surface(img)
+    _masks[key] = mask
+    return mask
+
+
+def get_sprite(path, size=None, scale=None, smooth=False, flip_x=False, flip_y=False):
+    """Return `(surface, mask)` for the given sprite, or `(None, None)`."""
+    img = get_surface(path, size, scale, smooth, flip_x, flip_y)
+    if img is None:
+        return None, None
+    return img, get_mask(path, size, scale, smooth, flip_x, flip_y)
+
+
+def add_surface(path, surface, size=None, scale=None, smooth=False):
+    """Seed the cache with an image decoded or baked elsewhere (asset_preloader, asset_bake).
+
+    `size`/`scale`/`smooth` name the transformed variant `surface` is (as in
+    get_surface). `surface` is converted with convert_alpha() here, so call
+    this from the main thread. None records a failed load. Existing entries
+    are kept.
+    """
+    key = _make_key(path, size, scale, smooth)
+    if key in _surfaces:
+        return
+    _surfaces[key] = surface.convert_alpha() if surface is not None else None
+
+
+def add_mask(path, mask, size=None, scale=None, smooth=False):
+    """Seed the cache with a prebuilt mask for the given sprite variant."""
+    _masks.setdefault(_make_key(path, size, scale, smooth), mask)
+
+
+def add_partial_mask(mask, partial, fraction=1/3):
+    """Seed the bottom-portion mask of a shared full `mask` (see get_partial_mask)."""
+    _partial_masks.setdefault((id(mask), fraction), (mask, partial))
+
+
+def is_cached(path):
+    """True if the untransformed image for `path` has been loaded (or failed to load)."""
+    return bool(path) and _make_key(path) in _surfaces
+
+
+def get_partial_mask(mask, fraction=1/3):
+    """Return a shared mask holding the bottom `fraction` of `mask`'s rows.
+
+    Meant for masks that are themselves shared (from this module), since every
+    distinct mask adds an entry; the full mask is kept alive alongside its
+    partial so the id-based key stays valid.
+    """
+    key = (id(mask), fraction)
+    entry = _partial_masks.get(key)
+    if entry is not None:
+        return entry[1]
+    w, h = mask.get_size()
+    part_h = max(1, int(h * fraction))
+    partial = pygame.mask.Mask((w, part_h))
+    # Copy the bottom rows in one C call (offset shifts them to the top)
+    partial.draw(mask, (0, part_h - h))
+    _partial_masks[key] = (mask, partial)
+    return partial
+
+
+def get_placeholder(diameter, color):
+    """Return a shared `(surface, mask)` circle used when a sprite can't be loaded."""
+    key = (int(diameter), tuple(color))
+    entry = _placeholders.get(key)
+    if entry is None:
+        d = key[0]
+        img = pygame.Surface((d, d), pygame.SRCALPHA)
+        pygame.draw.circle(img, color, (d // 2, d // 2), d // 2)
+        entry = (img, pygame.mask.from_surface(img))
+        _placeholders[key] = entry
+    return entry
+
+
+class RotationTable:
+    """Pre-rotated copies of one surface across [-amplitude, +amplitude] degrees.
+
+    Angles are quantized to `step` degrees; `lookup` returns the nearest frame.
+    """
+
+    def __init__(self, surface, amplitude, step=ROTATION_STEP):
+        self.amplitude = float(amplitude)
+        self.step = max(0.01, float(step))
+        start = time.perf_counter()
+        count = int(round(2 * self.amplitude / self.step)) + 1
+        self.frames = [
+            pygame.transform.rotate(surface, -self.amplitude + i * self.step)
+            for i in range(count)
+        ]
+        self.build_time = time.perf_counter() - start
+        self.memory_bytes = sum(
+            f.get_width() * f.get_height() * f.get_bytesize() for f in self.frames
+        )
+
+    def lookup(self, angle):
+        """Return the pre-rotated frame closest to `angle` (degrees)."""
+        i = int(round((angle + self.amplitude) / self.step))
+        if i < 0:
+            i = 0
+        elif i >= len(self.frames):
+            i = len(self.frames) - 1
+        return self.frames[i]
+
+
+def get_rotation_table(surface, amplitude, step=None):
+    """Return the shared RotationTable for a (shared) surface.
+
+    Like `get_partial_mask`, only pass surfaces that come from this module.
+    """
+    if step is None:
+        step = ROTATION_STEP
+    key = (id(surface), float(amplitude), float(step))
+    entry = _rotation_tables.get(key)
+    if entry is None:
+        if counters.enabled:
+            counters.incr("sprite_cache.rotation_miss")
+        entry = (surface, RotationTable(surface, amplitude, step))
+        _rotation_tables[key] = entry
+    elif counters.enabled:
+        counters.incr("sprite_cache.rotation_hit")
+    return entry[1]
+
+
+def get_scaled(surface, scale):
+    """Return a shared copy of a (shared) surface scaled by `scale`, e.g. for the render scale.
+
+    Like `get_partial_mask`, only pass surfaces that come from this module
+    (or are otherwise kept alive), since entries are keyed by id.
+    """
+    key = (id(surface), round(float(scale), 4))
+    entry = _scaled.get(key)
+    if entry is None:
+        w, h = surface.get_size()
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+        try:
+            scaled = pygame.transform.smoothscale(surface, size)
+        except ValueError:
+            # smoothscale only handles 24/32-bit surfaces
+            scaled = pygame.transform.scale(surface, size)
+        entry = (surface, scaled)
+        _scaled[key] = entry
+    return entry[1]
+
+
+def get_rotation_stats():
+    """Return the number of rotation tables, frames, bytes held and total build time."""
+    tables = [entry[1] for entry in _rotation_tables.values()]
+    return {
+        "tables": len(tables),
+        "frames": sum(len(t.frames) for t in tables),
+        "memory_bytes": sum(t.memory_bytes for t in tables),
+        "build_time": sum(t.build_time for t in tables),
+    }
+
+
+def get_stats():
+    """Return cache counters: hits, misses and number of cached surfaces/masks."""
+    return {
+        "hits": _hits,
+        "misses": _misses,
+        "surfaces": sum(1 for s in _surfaces.values() if s is not None),
+        "masks": len(_masks),
+        "partial_masks": len(_partial_masks),
+        "scaled": len(_scaled),
+    }
+
+
+def clear():
+    """Drop every cached surface and mask and reset the counters.
+
+    Entities that already hold a surface keep it; only new loads are affected.
+    """
+    global _hits, _misses
+    _surfaces.clear()
+    _masks.clear()
+    _partial_masks.clear()
+    _placeholders.clear()
+    _rotation_tables.clear()
+    _scaled.clear()
+    _hits = 0
+    _misses = 0
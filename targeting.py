@@ -0,0 +1,119 @@
+"""Shared nearest-enemy queries for weapon targeting.
+
+A TargetingService is built once per frame over the live enemies and then
+answers every weapon's "who do I shoot at" question with a ring search over a
+uniform grid, instead of each weapon scanning the whole enemy list.
+"""
+import heapq
+
+
+class TargetingService:
+    """Grid-bucketed snapshot of live enemy positions for one frame.
+
+    Ties between equally distant enemies resolve to the one that comes first
+    in the `enemies` list, matching the old linear scans.
+    """
+
+    def __init__(self, enemies, cell_size=256):
+        """
+        Args:
+            enemies: Enemy list; dead enemies are skipped
+            cell_size: Bucket size in world pixels
+        """
+        self.cell_size = cell_size
+        self.buckets = {}  # (col, row) -> list of (index, enemy)
+        self.count = 0
+        min_c = min_r = max_c = max_r = 0
+        for i, e in enumerate(enemies):
+            if e.dead:
+                continue
+            key = (int(e.pos.x) // cell_size, int(e.pos.y) // cell_size)
+            self.buckets.setdefault(key, []).append((i, e))
+            if self.count == 0:
+                min_c, max_c, min_r, max_r = key[0], key[0], key[1], key[1]
+            else:
+                min_c = min(min_c, key[0])
+                max_c = max(max_c, key[0])
+                min_r = min(min_r, key[1])
+                max_r = max(max_r, key[1])
+            self.count += 1
+        self._bounds = (min_c, max_c, min_r, max_r)
+
+    def __len__(self):
+        return self.count
+
+    def _ring(self, col, row, r):
+        """Yield the buckets on the square ring at Chebyshev distance r from (col, row)."""
+        buckets = self.buckets
+        if r == 0:
+            bucket = buckets.get((col, row))
+            if bucket:
+                yield bucket
+            return
+        for c in range(col - r, col + r + 1):
+            for rr in (row - r, row + r):
+                bucket = buckets.get((c, rr))
+                if bucket:
+                    yield bucket
+        for rr in range(row - r + 1, row + r):
+            for c in (col - r, col + r):
+                bucket = buckets.get((c, rr))
+                if bucket:
+                    yield bucket
+
+    def _max_ring(self, col, row):
+        """Ring index beyond which no bucket can hold an enemy."""
+        min_c, max_c, min_r, max_r = self._bounds
+        return max(abs(col - min_c), abs(col - max_c), abs(row - min_r), abs(row - max_r))
+
+    def _search(self, pos, k, max_range):
+        """Return up to k (dist_sq, index, enemy) tuples nearest to pos, sorted."""
+        if self.count == 0 or k <= 0:
+            return []
+        cs = self.cell_size
+        col = int(pos.x) // cs
+        row = int(pos.y) // cs
+        max_sq = None if max_range is None else max_range * max_range
+        found = []
+        last_ring = self._max_ring(col, row)
+        for r in range(last_ring + 1):
+            # Everything on ring r is at least (r - 1) cells away
+            if len(found) >= k:
+                bound = (r - 1) * cs
+                if bound > 0 and bound * bound > found[-1][0]:
+                    break
+            if max_sq is not None and r > 1 and ((r - 1) * cs) ** 2 > max_sq:
+                break
+            for bucket in self._ring(col, row, r):
+                for i, e in bucket:
+                    d_sq = (e.pos - pos).length_squared()
+                    if max_sq is not None and d_sq > max_sq:
+                        continue
+                    found.append((d_sq, i, e))
+            if len(found) > k:
+                found = heapq.nsmallest(k, found, key=lambda t: (t[0], t[1]))
+            else:
+                found.sort(key=lambda t: (t[0], t[1]))
+        return found
+
+    def nearest(self, pos, max_range=None):
+        """Return the live enemy closest to `pos` (optionally within max_range), or None."""
+        found = self._search(pos, 1, max_range)
+        return found[0][2] if found else None
+
+    def k_nearest(self, pos, k, max_range=None):
+        """Return up to `k` live enemies ordered by distance from `pos`."""
+        return [e for _, _, e in self._search(pos, k, max_range)]
+
+    def within_range(self, pos, radius):
+        """Return all live enemies within `radius` of `pos`, in enemy-list order."""
+        cs = self.cell_size
+        r_sq = radius * radius
+        found = []
+        for row in range(int(pos.y - radius) // cs, int(pos.y + radius) // cs + 1):
+            for col in range(int(pos.x - radius) // cs, int(pos.x + radius) // cs + 1):
+                for i, e in self.buckets.get((col, row), ()):
+                    if (e.pos - pos).length_squared() <= r_sq:
+                        found.append((i, e))
+        found.sort(key=lambda t: t[0])
+        return [e for _, e in found]
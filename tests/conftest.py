@@ -0,0 +1,9 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_session import init_headless  # noqa: E402
+
+# Image loading needs a display surface; every test runs headless
+init_headless()
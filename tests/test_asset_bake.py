@@ -0,0 +1,47 @@
+import struct
+import warnings
+
+import pytest
+
+import asset_bake
+import sprite_cache
+
+
+@pytest.fixture
+def clean_cache():
+    sprite_cache.clear()
+    yield
+    sprite_cache.clear()
+
+
+def test_baked_masks_match_runtime_masks(tmp_path, clean_cache):
+    path = str(tmp_path / "baked.cache")
+    count = asset_bake.bake(path)
+    sprite_cache.clear()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert asset_bake.load(path) == count
+
+    baked = {key: mask for key, mask in sprite_cache._masks.items()}
+    assert baked
+    sprite_cache._masks.clear()
+    for (source, size, scale, smooth, _, _), mask in baked.items():
+        built = sprite_cache.get_mask(source, size, scale, smooth)
+        assert mask.get_size() == built.get_size()
+        assert mask.overlap_area(built, (0, 0)) == mask.count() == built.count()
+
+
+def test_stale_bake_cache_warns_and_is_ignored(tmp_path, clean_cache):
+    path = tmp_path / "baked.cache"
+    path.write_bytes(struct.pack("<4sHI", asset_bake.MAGIC, asset_bake.BAKE_VERSION + 1, 0))
+    with pytest.warns(UserWarning, match="expected"):
+        assert asset_bake.load(str(path)) == 0
+    path.write_bytes(b"not a bake cache at all")
+    with pytest.warns(UserWarning, match="not a bake cache"):
+        assert asset_bake.load(str(path)) == 0
+
+
+def test_missing_bake_cache_is_silent(tmp_path, clean_cache):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert asset_bake.load(str(tmp_path / "missing.cache")) == 0
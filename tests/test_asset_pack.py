@@ -0,0 +1,90 @@
+import os
+import shutil
+
+import pygame
+import pytest
+
+import asset_pack
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSET_DIR = os.path.join(REPO_DIR, "assets")
+# An RGBA sprite, an opaque JPEG background and the bush (referenced in the wrong case before)
+SAMPLES = ("Bush2.png", "paper_bg.jpg", "tree.png")
+
+
+@pytest.fixture
+def asset_dir(tmp_path):
+    path = tmp_path / "assets"
+    path.mkdir()
+    for name in SAMPLES:
+        shutil.copy(os.path.join(ASSET_DIR, name), path / name)
+    return str(path)
+
+
+def _read(pack, name):
+    """Copy of an entry's pixels, so no view into the mapped file outlives the pack."""
+    data, size, fmt = pack.pixels(name)
+    return bytes(data), size, fmt
+
+
+def _expected(name):
+    surface = pygame.image.load(os.path.join(ASSET_DIR, name))
+    if surface.get_flags() & pygame.SRCALPHA:
+        return pygame.image.tobytes(surface, "RGBA"), surface.get_size(), "RGBA"
+    return pygame.image.tobytes(surface, "RGB"), surface.get_size(), "RGB"
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_pack_round_trips_pixels(asset_dir, tmp_path, compress):
+    out = str(tmp_path / "assets.pak")
+    asset_pack.build(asset_dir, out, compress=compress)
+    pack = asset_pack.AssetPack(out)
+    try:
+        assert pack.names() == sorted(SAMPLES)
+        for name in SAMPLES:
+            assert _read(pack, name) == _expected(name)
+    finally:
+        pack.close()
+
+
+def test_pack_names_match_in_any_case(asset_dir, tmp_path):
+    out = str(tmp_path / "assets.pak")
+    asset_pack.build(asset_dir, out)
+    pack = asset_pack.AssetPack(out)
+    try:
+        for name in ("Bush2.png".lower(), "Bush2.png".upper()):
+            assert name in pack
+            assert _read(pack, name) == _read(pack, "Bush2.png")
+        assert pack.names() == sorted(SAMPLES)
+        assert pack.pixels("missing.png") is None
+    finally:
+        pack.close()
+
+
+def test_build_rejects_references_in_the_wrong_case(asset_dir, tmp_path):
+    source = tmp_path / "game"
+    source.mkdir()
+    (source / "bush.py").write_text('image_path = "assets/' + "Bush2.png".lower() + '"\n')
+    with pytest.raises(ValueError, match="the file is named Bush2.png"):
+        asset_pack.build(asset_dir, str(tmp_path / "assets.pak"), source_dir=str(source))
+    assert not os.path.exists(tmp_path / "assets.pak")
+
+
+def test_build_rejects_names_that_differ_only_in_case(asset_dir, tmp_path):
+    shutil.copy(os.path.join(asset_dir, "tree.png"), os.path.join(asset_dir, "Tree.png"))
+    if len(os.listdir(asset_dir)) == len(SAMPLES):
+        pytest.skip("case-insensitive filesystem")
+    with pytest.raises(ValueError, match="differ only in case"):
+        asset_pack.build(asset_dir, str(tmp_path / "assets.pak"))
+
+
+def test_truncated_pack_is_rejected(asset_dir, tmp_path):
+    out = tmp_path / "assets.pak"
+    asset_pack.build(asset_dir, str(out))
+    out.write_bytes(out.read_bytes()[:-100])
+    with pytest.raises(ValueError, match="truncated"):
+        asset_pack.AssetPack(str(out))
+
+
+def test_game_image_references_resolve():
+    assert asset_pack.check_references(ASSET_DIR, REPO_DIR) == []
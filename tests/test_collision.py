@@ -0,0 +1,84 @@
+import random
+
+import pygame
+import pytest
+
+from collision import find_projectile_hits
+from spatial_grid import DynamicSpatialGrid
+from projectile import Projectile
+from radius_weapon import RadiusWeapon
+from Characters.minion import Minion
+from Characters.mini_boss import MiniBoss
+
+CELL_SIZE = 128
+
+
+def _brute_force_hits(projectiles, enemies):
+    """The nested loop find_projectile_hits replaced: first colliding enemy per projectile."""
+    hits = []
+    for p in projectiles:
+        if getattr(p, 'active', True) is False:
+            continue
+        for e in enemies:
+            if p.check_collision_with_enemy(e):
+                hits.append((p, e))
+                break
+    return hits
+
+
+def _enemies(rng, count, extent):
+    enemies = []
+    for _ in range(count):
+        pos = (rng.uniform(0, extent), rng.uniform(0, extent))
+        if rng.random() < 0.2:
+            enemies.append(MiniBoss(pos, miniboss_type=rng.choice(["starficer", "attack_robot"])))
+        else:
+            enemies.append(Minion(pos, minion_type=rng.choice(["multiply", "positive", "divisive"])))
+    # Clusters of overlapping enemies, so projectiles often hit several at once
+    for _ in range(count // 4):
+        base = enemies[rng.randrange(len(enemies))].pos
+        enemies.append(Minion((base.x + rng.uniform(-20, 20), base.y + rng.uniform(-20, 20))))
+    return enemies
+
+
+def _projectiles(rng, count, extent):
+    projectiles = []
+    for _ in range(count):
+        x, y = rng.uniform(0, extent), rng.uniform(0, extent)
+        if rng.random() < 0.4:
+            # Right on (or a hair off) a cell border
+            x = round(x / CELL_SIZE) * CELL_SIZE + rng.choice([-0.5, 0.0, 0.5])
+            y = round(y / CELL_SIZE) * CELL_SIZE + rng.choice([-0.5, 0.0, 0.5])
+        projectiles.append(Projectile((x, y), pygame.Vector2(1, 0), radius=rng.choice([4, 8, 30])))
+    for _ in range(count // 10):
+        weapon = RadiusWeapon(pygame.Vector2(rng.uniform(0, extent), rng.uniform(0, extent)),
+                              radius_size=90, object_size=60)
+        weapon.angle = rng.uniform(0, 6.3)
+        weapon.active = rng.random() < 0.7
+        projectiles.append(weapon)
+    return projectiles
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_projectile_hits_match_the_nested_loop(seed):
+    rng = random.Random(seed)
+    extent = 1200
+    enemies = _enemies(rng, 80, extent)
+    projectiles = _projectiles(rng, 400, extent)
+    grid = DynamicSpatialGrid(cell_size=CELL_SIZE)
+    # Grid insertion order must not matter: hits follow `enemies` order
+    for e in rng.sample(enemies, len(enemies)):
+        grid.insert(e)
+
+    hits = find_projectile_hits(projectiles, enemies, grid)
+    expected = _brute_force_hits(projectiles, enemies)
+    assert hits == expected
+    assert len(expected) > 20
+
+
+def test_no_hits_without_projectiles_or_enemies():
+    grid = DynamicSpatialGrid(cell_size=CELL_SIZE)
+    enemy = Minion((0, 0))
+    grid.insert(enemy)
+    assert find_projectile_hits([], [enemy], grid) == []
+    assert find_projectile_hits([Projectile((0, 0), pygame.Vector2(1, 0))], [], DynamicSpatialGrid()) == []
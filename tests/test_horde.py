@@ -0,0 +1,90 @@
+import random
+
+import pygame
+import pytest
+
+import horde
+from navigation import FlowField
+from obstacle_map import ObstacleMap
+from Objects.tree import Tree
+from Objects.bush import Bush
+from Characters.minion import Minion
+
+pytestmark = pytest.mark.skipif(not horde.HAS_NUMPY, reason="NumPy is not installed")
+
+
+def _scene(seed, obstacles=30, minions=60):
+    rng = random.Random(seed)
+    objects = [(Tree if rng.random() < 0.5 else Bush)((rng.uniform(0, 1500), rng.uniform(0, 1500)))
+               for _ in range(obstacles)]
+    obstacle_map = ObstacleMap.from_objects(objects)
+    engine = horde.HordeEngine()
+    engine.set_obstacles(objects, obstacle_map)
+    placed = []
+    while len(placed) < minions:
+        minion = Minion((rng.uniform(-200, 1700), rng.uniform(-200, 1700)),
+                        minion_type=rng.choice(["multiply", "positive", "divisive"]))
+        if not obstacle_map.enemy_blocked(minion.get_mask(), minion.pos):
+            engine.add(minion)
+            placed.append(minion)
+    return rng, obstacle_map, engine, placed
+
+
+def _edge_positions(rng, rects, half_w, half_h, count):
+    """Enemy centres whose box reaches up to 40 px into (or just short of) a footprint rect's edge."""
+    for _ in range(count):
+        x, y, w, h = rng.choice(rects)
+        depth = rng.uniform(-2, 40)
+        side = rng.randrange(4)
+        if side < 2:
+            cy = rng.uniform(y - half_h, y + h + half_h)
+            cx = x - half_w + depth if side == 0 else x + w + half_w - depth
+        else:
+            cx = rng.uniform(x - half_w, x + w + half_w)
+            cy = y - half_h + depth if side == 2 else y + h + half_h - depth
+        yield cx, cy
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_footprint_gate_never_skips_a_blocked_enemy(seed):
+    np = horde.np
+    rng, obstacle_map, engine, minions = _scene(seed)
+    rects = obstacle_map.footprints.rects()
+    mask = minions[0].get_mask()
+    half = engine.half_size[:1]
+    blocked = 0
+    for cx, cy in _edge_positions(rng, rects, half[0, 0], half[0, 1], 3000):
+        if not obstacle_map.enemy_blocked(mask, pygame.Vector2(cx, cy)):
+            continue
+        blocked += 1
+        assert len(engine._touching_footprints(np.array([(cx, cy)]), half)) == 1
+    assert blocked > 100
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_horde_step_keeps_enemies_out_of_obstacles(seed):
+    _, obstacle_map, engine, minions = _scene(seed)
+    flow_field = FlowField(obstacle_map)
+    target = pygame.Vector2(750, 750)
+    start = [m.pos.copy() for m in minions]
+    for _ in range(240):
+        flow_field.update(target)
+        engine.step(1 / 60, target, obstacle_map, flow_field)
+        for m in minions:
+            assert not obstacle_map.enemy_blocked(m.get_mask(), m.pos)
+    assert sum(m.pos.distance_to(p) > 100 for m, p in zip(minions, start)) > len(minions) // 2
+
+
+def test_dead_enemies_are_dropped_and_move_to_places_the_rest():
+    _, obstacle_map, engine, minions = _scene(0, minions=5)
+    minions[1].dead = True
+    engine.step(1 / 60, pygame.Vector2(0, 0))
+    assert len(engine) == 4 and minions[1] not in engine.entities
+    for i, e in enumerate(engine.entities):
+        assert (engine.pos[i, 0], engine.pos[i, 1]) == (e.pos.x, e.pos.y)
+        assert tuple(engine.half_size[i] * 2) == e.get_mask().get_size()
+    engine.move_to(minions[3], pygame.Vector2(10, 20))
+    assert minions[3].pos == (10, 20)
+    engine.step(1 / 60, pygame.Vector2(10, 20))
+    # Stepping continues from the new place, not the old array entry
+    assert minions[3].pos.distance_to((10, 20)) < 5
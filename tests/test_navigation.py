@@ -0,0 +1,83 @@
+import pygame
+
+from navigation import FlowField
+from obstacle_map import ObstacleMap
+
+CELL = 64
+
+
+def _field(blocked_cells, **kwargs):
+    """FlowField over an ObstacleMap whose footprints fill exactly `blocked_cells`."""
+    obstacle_map = ObstacleMap()
+    block = pygame.mask.Mask((CELL, CELL), fill=True)
+    for c, r in blocked_cells:
+        obstacle_map.footprints.stamp((c, r), block, c * CELL, r * CELL)
+    return FlowField(obstacle_map, cell_size=CELL, radius_cells=12, clearance=0, **kwargs)
+
+
+def _centre(cell):
+    return pygame.Vector2((cell[0] + 0.5) * CELL, (cell[1] + 0.5) * CELL)
+
+
+def _step(field, cell):
+    """The neighbouring cell `direction` heads for from the centre of `cell`, or None."""
+    heading = field.direction(_centre(cell))
+    if heading is None:
+        return None
+    scale = max(abs(heading.x), abs(heading.y))
+    return cell[0] + round(heading.x / scale), cell[1] + round(heading.y / scale)
+
+
+def _cuts_corner(field, cell, nxt):
+    dc, dr = nxt[0] - cell[0], nxt[1] - cell[1]
+    return bool(dc and dr) and (field.is_blocked((cell[0] + dc, cell[1])) or field.is_blocked((cell[0], cell[1] + dr)))
+
+
+def test_field_routes_around_a_wall():
+    wall = [(5, r) for r in range(-3, 4)]
+    field = _field(wall)
+    target, start = (8, 0), (2, 0)
+    field.update(_centre(target))
+    # Straight through would be 6 steps; around the wall's end takes longer
+    assert field.dist[start] > 6
+    assert not any(cell in field.dist for cell in wall)
+
+    cell, path = start, [start]
+    while cell != target:
+        nxt = _step(field, cell)
+        assert nxt is not None and not field.is_blocked(nxt)
+        assert not _cuts_corner(field, cell, nxt)
+        assert field.dist[nxt] == field.dist[cell] - 1
+        cell = nxt
+        path.append(cell)
+    assert len(path) - 1 == field.dist[start]
+
+
+def test_field_never_steps_diagonally_past_a_blocked_cell():
+    # A checkerboard-ish scatter of single blocked cells: every free cell sits next to some
+    blocked = {(c, r) for c in range(-8, 9) for r in range(-8, 9) if (c * 7 + r * 3) % 5 == 0 and (c, r) != (0, 0)}
+    field = _field(blocked)
+    field.update(_centre((0, 0)))
+    assert len(field.dist) > 100
+    for cell in list(field.dist):
+        for nxt in field.links(cell):
+            assert not field.is_blocked(nxt) and not _cuts_corner(field, cell, nxt)
+        nxt = _step(field, cell)
+        if cell == (0, 0):
+            assert nxt is None
+            continue
+        assert not _cuts_corner(field, cell, nxt)
+        assert field.dist[nxt] < field.dist[cell]
+
+
+def test_invalidate_picks_up_new_obstacles():
+    field = _field([])
+    field.update(_centre((0, 0)))
+    assert field.dist[(3, 0)] == 3
+    block = pygame.mask.Mask((CELL, CELL), fill=True)
+    for r in range(-2, 3):
+        field.bitmap.stamp((2, r), block, 2 * CELL, r * CELL)
+    field.invalidate((2 * CELL, -2 * CELL, CELL, 5 * CELL))
+    field.update(_centre((0, 0)))
+    assert (2, 0) not in field.dist
+    assert field.dist[(3, 0)] > 3
@@ -0,0 +1,74 @@
+import random
+
+import pygame
+import pytest
+
+from collision import mask_vs_object
+from obstacle_map import ObstacleMap
+from Objects.tree import Tree
+from Objects.bush import Bush
+from Characters.minion import Minion
+from Characters.ninjircle import Ninjircle
+
+
+def _obstacles(rng, count):
+    # Dense enough that footprints overlap and stamps straddle bitmap chunks (and the origin)
+    return [(Tree if rng.random() < 0.5 else Bush)((rng.uniform(-400, 800), rng.uniform(-400, 800)))
+            for _ in range(count)]
+
+
+def _queries(rng, obstacles, count):
+    for _ in range(count):
+        base = rng.choice(obstacles).pos
+        yield pygame.Vector2(base.x + rng.uniform(-150, 150), base.y + rng.uniform(-150, 250))
+
+
+def _enemy_blocked(obstacles, mask, pos):
+    """Enemy.update's old per-object test: bottom third of every tree and bush."""
+    return any(mask_vs_object(mask, pos, obj, use_obj_partial=True) for obj in obstacles)
+
+
+def _player_blocked(obstacles, partial_mask, full_mask, pos):
+    """Player.handle_input's old per-object test: tree bottom thirds, full bush masks."""
+    for obj in obstacles:
+        if isinstance(obj, Tree) and mask_vs_object(partial_mask, pos, obj, use_obj_partial=True):
+            return True
+        if isinstance(obj, Bush) and mask_vs_object(full_mask, pos, obj):
+            return True
+    return False
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_obstacle_map_matches_per_object_tests(seed):
+    rng = random.Random(seed)
+    obstacles = _obstacles(rng, 40)
+    obstacle_map = ObstacleMap.from_objects(obstacles + [Minion((0, 0))], chunk_size=256)
+    enemy_mask = Minion((0, 0)).get_mask()
+    player = Ninjircle((0, 0))
+    partial_mask, full_mask = player.get_partial_mask_bottom_third(), player.get_mask()
+
+    def check():
+        outcomes = set()
+        for pos in _queries(rng, obstacles, 300):
+            blocked = obstacle_map.enemy_blocked(enemy_mask, pos)
+            assert blocked == _enemy_blocked(obstacles, enemy_mask, pos)
+            assert (obstacle_map.player_blocked(partial_mask, full_mask, pos)
+                    == _player_blocked(obstacles, partial_mask, full_mask, pos))
+            outcomes.add(blocked)
+        assert outcomes == {True, False}
+
+    check()
+    # Removing obstacles must not erase the bits of overlapping neighbours
+    for obj in rng.sample(obstacles, 15):
+        obstacle_map.remove(obj)
+        obstacles.remove(obj)
+    check()
+
+
+def test_only_trees_and_bushes_are_stamped():
+    obstacle_map = ObstacleMap()
+    assert obstacle_map.add(Minion((0, 0))) is False
+    assert not obstacle_map.footprints.rects()
+    assert obstacle_map.add(Tree((0, 0))) is True
+    assert len(obstacle_map.tree_footprints.rects()) == 1
+    assert not obstacle_map.bush_solids.rects()
@@ -0,0 +1,61 @@
+import random
+
+import pygame
+
+import replay
+from game_session import GameSession, get_player_class
+
+SEED = 1234
+VIEW_SIZE = (960, 540)
+FRAMES = 600
+DT = 1.0 / 60
+
+
+def _record(path, use_horde):
+    """Play FRAMES scripted frames while recording them. Returns the final state digest."""
+    cls = get_player_class("Ninjircle")
+    session = GameSession(cls, VIEW_SIZE, seed=SEED, use_horde=use_horde)
+    writer = replay.ReplayWriter(path, SEED, cls.__name__, VIEW_SIZE, use_horde=use_horde)
+    inputs = random.Random(7)
+    keys = 0
+    for frame in range(FRAMES):
+        if frame % 20 == 0:
+            keys = inputs.randrange(16)
+        attacks = []
+        if inputs.random() < 0.1:
+            direction = pygame.Vector2(inputs.uniform(-1, 1), inputs.uniform(-1, 1))
+            if direction.length_squared() > 0:
+                attacks.append(replay.quantize_direction(direction.normalize()))
+        for direction in attacks:
+            session.attack(direction, DT)
+        session.step(DT, keys=replay.KeyState(keys))
+        writer.write_frame(DT, keys, attacks)
+    writer.close()
+    return replay.state_digest(session)
+
+
+def _replay(path):
+    reader = replay.ReplayReader(path)
+    session = GameSession(get_player_class(reader.player_class_name), reader.view_size,
+                          seed=reader.seed, use_horde=reader.use_horde, endless=reader.endless)
+    frames = replay.play(session, reader)
+    return frames, replay.state_digest(session)
+
+
+def test_replay_reproduces_the_recorded_run(tmp_path):
+    path = str(tmp_path / "run.ptr")
+    digest = _record(path, use_horde=False)
+    assert _replay(path) == (FRAMES, digest)
+
+
+def test_replay_reproduces_a_horde_run(tmp_path):
+    path = str(tmp_path / "horde.ptr")
+    digest = _record(path, use_horde=True)
+    assert _replay(path) == (FRAMES, digest)
+
+
+def test_key_state_reads_the_movement_mask():
+    keys = replay.KeyState(0b0101)
+    assert keys[pygame.K_w] and keys[pygame.K_s]
+    assert not keys[pygame.K_a] and not keys[pygame.K_d]
+    assert not keys[pygame.K_SPACE]
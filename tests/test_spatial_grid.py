@@ -0,0 +1,92 @@
+import random
+
+import pygame
+
+from spatial_grid import DynamicSpatialGrid, LayeredSpatialGrid
+
+CELL_SIZE = 64
+
+
+class _Body:
+    def __init__(self, x, y):
+        self.pos = pygame.Vector2(x, y)
+
+
+def _cell(pos):
+    return int(pos.x) // CELL_SIZE, int(pos.y) // CELL_SIZE
+
+
+def _expected_nearby(bodies, pos, radius):
+    col, row = _cell(pos)
+    return {id(b) for b in bodies
+            if abs(_cell(b.pos)[0] - col) <= radius and abs(_cell(b.pos)[1] - row) <= radius}
+
+
+def _expected_in_range(bodies, pos, distance):
+    c0, c1 = int(pos.x - distance) // CELL_SIZE, int(pos.x + distance) // CELL_SIZE
+    r0, r1 = int(pos.y - distance) // CELL_SIZE, int(pos.y + distance) // CELL_SIZE
+    return {id(b) for b in bodies if c0 <= _cell(b.pos)[0] <= c1 and r0 <= _cell(b.pos)[1] <= r1}
+
+
+def _check_queries(grid, bodies, rng):
+    assert len(grid) == len(bodies)
+    for _ in range(50):
+        pos = pygame.Vector2(rng.uniform(-200, 800), rng.uniform(-200, 800))
+        radius = rng.choice([0, 1, 2])
+        nearby = grid.get_nearby(pos, radius)
+        assert len(nearby) == len({id(b) for b in nearby})
+        assert {id(b) for b in nearby} == _expected_nearby(bodies, pos, radius)
+        distance = rng.uniform(0, 150)
+        assert {id(b) for b in grid.get_in_range(pos, distance)} == _expected_in_range(bodies, pos, distance)
+
+
+def test_insert_move_and_remove_keep_queries_exact():
+    rng = random.Random(4)
+    grid = DynamicSpatialGrid(cell_size=CELL_SIZE)
+    # Negative coordinates too: the grid has no bounds
+    bodies = [_Body(rng.uniform(-150, 700), rng.uniform(-150, 700)) for _ in range(300)]
+    for b in bodies:
+        grid.insert(b)
+    _check_queries(grid, bodies, rng)
+
+    for _ in range(5):
+        for b in bodies:
+            b.pos += (rng.uniform(-40, 40), rng.uniform(-40, 40))
+            grid.move(b)
+        for b in rng.sample(bodies, 20):
+            assert grid.remove(b)
+            bodies.remove(b)
+        for _ in range(10):
+            b = _Body(rng.uniform(-150, 700), rng.uniform(-150, 700))
+            grid.insert(b)
+            bodies.append(b)
+        _check_queries(grid, bodies, rng)
+
+
+def test_move_reports_cell_changes_and_remove_is_idempotent():
+    grid = DynamicSpatialGrid(cell_size=CELL_SIZE)
+    b = _Body(10, 10)
+    grid.insert(b)
+    b.pos.x = 20
+    assert grid.move(b) is False
+    b.pos.x = CELL_SIZE + 1
+    assert grid.move(b) is True
+    assert grid.get_nearby(pygame.Vector2(CELL_SIZE + 5, 5), 0) == [b]
+    assert grid.get_nearby(pygame.Vector2(5, 5), 0) == []
+    assert grid.remove(b) is True
+    assert grid.remove(b) is False
+    assert b not in grid and not grid.cells
+
+
+def test_layers_are_independent():
+    grid = LayeredSpatialGrid(cell_size={"enemies": 64, "pickups": 128})
+    enemy, pickup = _Body(10, 10), _Body(12, 12)
+    grid.insert("enemies", enemy)
+    grid.insert("pickups", pickup)
+    assert grid["enemies"].cell_size == 64 and grid["pickups"].cell_size == 128
+    assert grid.get_nearby("enemies", pygame.Vector2(10, 10)) == [enemy]
+    assert grid.get_nearby("pickups", pygame.Vector2(10, 10)) == [pickup]
+    assert grid.get_nearby("projectiles", pygame.Vector2(10, 10)) == []
+    grid.remove("enemies", enemy)
+    assert grid.get_nearby("enemies", pygame.Vector2(10, 10)) == []
+    assert grid.get_nearby("pickups", pygame.Vector2(10, 10)) == [pickup]
@@ -0,0 +1,82 @@
+import random
+
+import pygame
+import pytest
+
+from targeting import TargetingService
+
+
+class _Enemy:
+    def __init__(self, x, y, dead=False):
+        self.pos = pygame.Vector2(x, y)
+        self.dead = dead
+
+
+def _closest_enemy(enemies, pos, max_range=None):
+    """The linear scan weapons used before TargetingService (first of equally close enemies wins)."""
+    best = None
+    best_d = None
+    for e in enemies:
+        if e.dead:
+            continue
+        d = (e.pos - pos).length()
+        if max_range is not None and d > max_range:
+            continue
+        if best is None or d < best_d:
+            best = e
+            best_d = d
+    return best
+
+
+def _scene(rng, count):
+    # Coarse integer positions, so many enemies are exactly as far from a query as another
+    return [_Enemy(rng.randrange(-20, 40) * 25, rng.randrange(-20, 40) * 25, dead=rng.random() < 0.1)
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_nearest_matches_a_linear_scan(seed):
+    rng = random.Random(seed)
+    enemies = _scene(rng, 200)
+    service = TargetingService(enemies, cell_size=128)
+    assert len(service) == sum(not e.dead for e in enemies)
+    for _ in range(300):
+        pos = pygame.Vector2(rng.randrange(-60, 120) * 12.5, rng.randrange(-60, 120) * 12.5)
+        max_range = rng.choice([None, 0, 25, 100, 300, 2000])
+        assert service.nearest(pos, max_range) is _closest_enemy(enemies, pos, max_range)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_k_nearest_and_within_range_match_a_linear_scan(seed):
+    rng = random.Random(seed)
+    enemies = _scene(rng, 150)
+    live = [(i, e) for i, e in enumerate(enemies) if not e.dead]
+    service = TargetingService(enemies, cell_size=128)
+    for _ in range(100):
+        pos = pygame.Vector2(rng.uniform(-600, 1100), rng.uniform(-600, 1100))
+        k = rng.choice([1, 3, 10])
+        max_range = rng.choice([None, 150, 400])
+        ranked = sorted((((e.pos - pos).length_squared(), i), e) for i, e in live
+                        if max_range is None or (e.pos - pos).length_squared() <= max_range * max_range)
+        assert service.k_nearest(pos, k, max_range) == [e for _, e in ranked[:k]]
+        radius = rng.uniform(0, 500)
+        assert service.within_range(pos, radius) == [e for _, e in live
+                                                     if (e.pos - pos).length_squared() <= radius * radius]
+
+
+def test_ties_resolve_to_the_first_enemy_in_list_order():
+    # Four enemies the same distance from the origin, in four different cells
+    enemies = [_Enemy(300, 0), _Enemy(0, -300), _Enemy(-300, 0), _Enemy(0, 300)]
+    origin = pygame.Vector2(0, 0)
+    assert TargetingService(enemies).nearest(origin) is enemies[0]
+    assert TargetingService(enemies[::-1]).nearest(origin) is enemies[3]
+    assert TargetingService(enemies).nearest(origin, max_range=300) is enemies[0]
+    assert TargetingService(enemies).nearest(origin, max_range=299.9) is None
+
+
+def test_dead_and_missing_enemies():
+    assert TargetingService([]).nearest(pygame.Vector2(0, 0)) is None
+    enemies = [_Enemy(0, 0, dead=True), _Enemy(5000, 5000)]
+    service = TargetingService(enemies)
+    assert service.nearest(pygame.Vector2(0, 0)) is enemies[1]
+    assert service.k_nearest(pygame.Vector2(0, 0), 5) == [enemies[1]]
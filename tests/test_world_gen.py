@@ -0,0 +1,61 @@
+import math
+
+import pytest
+
+import world_gen
+
+TILE_SIZE = (512, 512)
+CHUNKS = [(cx, cy) for cx in range(-2, 3) for cy in range(-2, 3)]
+
+
+def _as_lists(layout):
+    return layout.kinds.tolist(), layout.xs.tolist(), layout.ys.tolist()
+
+
+def _python_layouts(monkeypatch, **kwargs):
+    with monkeypatch.context() as m:
+        m.setattr(world_gen, "np", None)
+        return {key: _as_lists(world_gen.generate_chunk_layout(key[0], key[1], TILE_SIZE, **kwargs))
+                for key in CHUNKS}
+
+
+@pytest.mark.skipif(not world_gen.HAS_NUMPY, reason="NumPy is not installed")
+@pytest.mark.parametrize("bounds", [None, (2048, 1536)])
+def test_numpy_and_python_layouts_match(monkeypatch, bounds):
+    expected = _python_layouts(monkeypatch, seed_offset=99, bounds=bounds)
+    layouts = {key: _as_lists(world_gen.generate_chunk_layout(key[0], key[1], TILE_SIZE, 99, bounds))
+               for key in CHUNKS}
+    assert layouts == expected
+    assert any(kinds for kinds, _, _ in layouts.values())
+
+
+def test_layouts_depend_on_the_seed():
+    first = _as_lists(world_gen.generate_chunk_layout(0, 0, TILE_SIZE, seed_offset=1))
+    assert first == _as_lists(world_gen.generate_chunk_layout(0, 0, TILE_SIZE, seed_offset=1))
+    assert first != _as_lists(world_gen.generate_chunk_layout(0, 0, TILE_SIZE, seed_offset=2))
+
+
+def test_footprints_keep_the_minimum_gap():
+    layouts = world_gen.generate_layouts(CHUNKS, TILE_SIZE, seed_offset=5)
+    placed = []
+    for layout in layouts.values():
+        for kind, x, y in zip(*_as_lists(layout)):
+            dx, dy, radius = world_gen.FOOTPRINTS[kind]
+            placed.append((x + dx, y + dy, radius))
+    assert len(placed) > 10
+    for i, (ax, ay, ar) in enumerate(placed):
+        for bx, by, br in placed[i + 1:]:
+            assert math.hypot(ax - bx, ay - by) >= ar + br + world_gen.MIN_GAP - 1e-9
+
+
+def test_packed_layouts_round_trip():
+    layouts = world_gen.generate_layouts(CHUNKS, TILE_SIZE, seed_offset=3)
+    unpacked = world_gen.unpack_layouts(world_gen.pack_layouts(layouts))
+    assert list(unpacked) == list(layouts)
+    assert {k: _as_lists(v) for k, v in unpacked.items()} == {k: _as_lists(v) for k, v in layouts.items()}
+
+
+def test_parallel_generation_matches_serial():
+    serial = world_gen.generate_layouts(CHUNKS, TILE_SIZE, seed_offset=8)
+    parallel = world_gen.generate_layouts(CHUNKS, TILE_SIZE, seed_offset=8, workers=2)
+    assert {k: _as_lists(v) for k, v in parallel.items()} == {k: _as_lists(v) for k, v in serial.items()}
@@ -0,0 +1,72 @@
+"""Fixed-timestep accumulator that decouples the simulation rate from the frame rate.
+
+Each rendered frame adds its real duration to an accumulator; the game then
+runs as many fixed `step_dt` simulation steps as fit and renders with
+`alpha` (the leftover fraction of a step) to interpolate positions:
+
+    steps = stepper.advance(frame_dt)
+    for _ in range(steps):
+        session.step(stepper.step_dt)
+    session.draw(screen, alpha=stepper.alpha)
+
+At most `max_steps` steps run per frame; time beyond that is dropped, so a
+slow frame slows the game down instead of making the next frame heavier.
+
+PAPERTRAIL_SIM_HZ sets the rate (default 60); 0 steps once per frame with
+the frame's own dt, as before.
+"""
+import os
+
+DEFAULT_SIM_HZ = 60
+DEFAULT_MAX_STEPS = 5
+
+
+class FixedTimestep:
+    def __init__(self, hz=DEFAULT_SIM_HZ, max_steps=DEFAULT_MAX_STEPS):
+        """
+        Args:
+            hz: Simulation steps per second; 0 (or None) for one variable step per frame
+            max_steps: Most steps run for a single frame
+        """
+        self.hz = hz or 0
+        self.max_steps = max_steps
+        self.step_dt = 1.0 / hz if hz else 0.0
+        self.accumulator = 0.0
+
+    @property
+    def fixed(self):
+        return self.hz > 0
+
+    @property
+    def alpha(self):
+        """How far (0..1) the current frame is between the last two simulation steps."""
+        if not self.fixed:
+            return 1.0
+        return max(0.0, min(1.0, self.accumulator / self.step_dt))
+
+    def advance(self, frame_dt):
+        """Add a frame's duration. Returns the number of steps to simulate now."""
+        if not self.fixed:
+            self.step_dt = frame_dt
+            return 1
+        self.accumulator += frame_dt
+        # The epsilon keeps e.g. three 1/60 frames from counting as 2.999 steps
+        steps = int(self.accumulator / self.step_dt + 1e-9)
+        if steps > self.max_steps:
+            # Drop the backlog rather than spiralling into ever longer frames
+            steps = self.max_steps
+            self.accumulator = self.step_dt * steps
+        self.accumulator -= self.step_dt * steps
+        return steps
+
+    def reset(self):
+        self.accumulator = 0.0
+
+
+def from_env():
+    """FixedTimestep at PAPERTRAIL_SIM_HZ (default DEFAULT_SIM_HZ)."""
+    try:
+        hz = int(os.environ.get("PAPERTRAIL_SIM_HZ", DEFAULT_SIM_HZ))
+    except ValueError:
+        hz = DEFAULT_SIM_HZ
+    return FixedTimestep(max(0, hz))
@@ -1,5 +1,6 @@
 import pygame
 import sys
+import sprite_cache
 from asset_manager import get_asset_path
 
 
@@ -11,18 +12,17 @@ class TitleScreen:
         self.height = height
 
         # Load and scale title screen background to fill screen
-        try:
-            self.background = pygame.image.load(get_asset_path("Title_Screen.png")).convert()
-            self.background = pygame.transform.scale(self.background, (width, height))
-        except Exception:
+        background = sprite_cache.get_surface(get_asset_path("Title_Screen.png"))
+        if background is not None:
+            self.background = pygame.transform.scale(background, (width, height)).convert()
+        else:
             # Fallback if image not found
             self.background = pygame.Surface((width, height))
             self.background.fill((20, 20, 20))
 
         # Load start button image
-        try:
-            self.start_button_img = pygame.image.load(get_asset_path("Start-Button.png")).convert_alpha()
-        except Exception:
+        self.start_button_img = sprite_cache.get_surface(get_asset_path("Start-Button.png"))
+        if self.start_button_img is None:
             # Fallback if image not found
             self.start_button_img = pygame.Surface((200, 80), pygame.SRCALPHA)
             pygame.draw.rect(self.start_button_img, (100, 200, 100), (0, 0, 200, 80))
@@ -56,8 +56,12 @@ class TitleScreen:
         screen.blit(self.background, (0, 0))
         screen.blit(self.start_button_img, self.button_rect)
 
-    def run(self, screen):
-        """Run title screen loop. Returns when player clicks start."""
+    def run(self, screen, preloader=None):
+        """Run title screen loop. Returns when player clicks start.
+
+        If `preloader` (an AssetPreloader) is given, it is pumped every frame
+        and its progress shown along the bottom edge.
+        """
         clock = pygame.time.Clock()
         fps = 60
 
@@ -70,5 +74,8 @@ class TitleScreen:
                     return  # Start button clicked, exit title screen
 
             self.draw(screen)
+            if preloader is not None:
+                preloader.pump()
+                preloader.draw_progress(screen)
             pygame.display.flip()
             clock.tick(fps)
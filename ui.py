@@ -136,6 +136,135 @@ class InventoryUI:
             y += notification_height + self.gap
 
 
+class PerformanceOverlay:
+    """Toggleable performance HUD: frame-time graph, FPS, entity counts and phase times.
+
+    Like InventoryUI it draws straight onto the game surface each frame, but
+    everything is cached: text surfaces are re-rendered only when the shown
+    string changes (values refresh a few times per second), and the frame
+    graph is a persistent surface scrolled by one pixel per frame.
+    """
+
+    def __init__(self, width, height, padding=10, graph_width=240, graph_height=60,
+                 budget_ms=1000.0 / 60, refresh_interval=0.25):
+        """
+        Args:
+            width: Screen width
+            height: Screen height
+            padding: Padding from edges
+            graph_width: Frame graph width in pixels (= number of frames shown)
+            graph_height: Frame graph height in pixels
+            budget_ms: Frame budget; the graph's top is 2x this
+            refresh_interval: Seconds between text refreshes
+        """
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.budget_ms = budget_ms
+        self.refresh_interval = refresh_interval
+        self.visible = False
+
+        self.font_small = pygame.font.Font(None, 20)
+        self.line_height = self.font_small.get_linesize()
+
+        self.graph = pygame.Surface((graph_width, graph_height), pygame.SRCALPHA)
+        self.graph.fill((0, 0, 0, 0))
+        self.frame_times = []  # recent frame times (ms), at most graph_width
+        self._since_refresh = refresh_interval
+        self._lines = []  # (key, label, value, color) shown until the next refresh
+        self._text_cache = {}  # key -> (text, color, surface)
+        self._panel = None
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def update(self, dt, frame_ms, fps, counts, phases, work_counters=None):
+        """Feed one frame of measurements.
+
+        Args:
+            dt: Seconds since the last update (drives the text refresh)
+            frame_ms: Time spent on the last frame's work, in milliseconds
+            fps: Current frames per second
+            counts: Ordered mapping of label -> count (enemies, projectiles, ...)
+            phases: Ordered mapping of phase -> seconds spent this frame
+            work_counters: Optional mapping of counter -> count for the last
+                frame (see counters.py)
+        """
+        if not self.visible:
+            return
+        self._add_graph_sample(frame_ms)
+        self._since_refresh += dt
+        if self._since_refresh < self.refresh_interval:
+            return
+        self._since_refresh = 0.0
+
+        recent = self.frame_times
+        avg = sum(recent) / len(recent) if recent else 0.0
+        worst = max(recent) if recent else 0.0
+        lines = [
+            ("fps", f"FPS {fps:.1f}", f"{avg:.2f} / {worst:.2f} ms", (255, 255, 255)),
+        ]
+        for name, value in counts.items():
+            lines.append(("count:" + name, name, str(value), (200, 200, 200)))
+        for name, seconds in phases.items():
+            ms = seconds * 1000.0
+            color = (255, 120, 120) if ms > self.budget_ms / 2 else (170, 220, 170)
+            lines.append(("phase:" + name, name, f"{ms:.2f} ms", color))
+        for name in sorted(work_counters or ()):
+            lines.append(("counter:" + name, name, str(work_counters[name]), (170, 190, 240)))
+        self._lines = lines
+
+    def _add_graph_sample(self, frame_ms):
+        graph = self.graph
+        gw, gh = graph.get_size()
+        self.frame_times.append(frame_ms)
+        if len(self.frame_times) > gw:
+            del self.frame_times[0]
+        # Scroll left one pixel and draw the newest sample in the last column
+        graph.scroll(-1, 0)
+        graph.fill((0, 0, 0, 0), (gw - 1, 0, 1, gh))
+        bar = min(gh, int(gh * frame_ms / (2 * self.budget_ms)))
+        color = (120, 220, 120) if frame_ms <= self.budget_ms else (240, 90, 90)
+        if bar > 0:
+            graph.fill(color, (gw - 1, gh - bar, 1, bar))
+
+    def _text(self, key, text, color):
+        cached = self._text_cache.get(key)
+        if cached is not None and cached[0] == text and cached[1] == color:
+            return cached[2]
+        surf = self.font_small.render(text, True, color)
+        self._text_cache[key] = (text, color, surf)
+        return surf
+
+    def draw(self, surface):
+        if not self.visible:
+            return
+        gw, gh = self.graph.get_size()
+        panel_w = gw + 2 * self.padding
+        panel_h = gh + len(self._lines) * self.line_height + 3 * self.padding
+        if self._panel is None or self._panel.get_size() != (panel_w, panel_h):
+            self._panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
+            self._panel.fill((20, 20, 20, 180))
+
+        x = self.padding
+        y = self.height - panel_h - self.padding
+        surface.blit(self._panel, (x, y))
+
+        gx = x + self.padding
+        gy = y + self.padding
+        surface.blit(self.graph, (gx, gy))
+        # Frame budget line at half height (the graph top is 2x budget)
+        pygame.draw.line(surface, (255, 255, 255), (gx, gy + gh // 2), (gx + gw - 1, gy + gh // 2))
+
+        ty = gy + gh + self.padding
+        for key, label, value, color in self._lines:
+            surface.blit(self._text(key + ":label", label, color), (gx, ty))
+            # Values are right-aligned to the graph's right edge
+            value_surf = self._text(key, value, color)
+            surface.blit(value_surf, (gx + gw - value_surf.get_width(), ty))
+            ty += self.line_height
+
+
 class PauseMenuInventoryUI:
     """Renders full inventory details on pause screen."""
     
@@ -0,0 +1,582 @@
+"""Chunked, on-demand world generation.
+
+The world is split into chunks of CHUNK_TILES x CHUNK_TILES background
+tiles. A chunk's trees and bushes depend only on its coordinates and the
+world seed, so a chunk can be generated whenever it is needed, thrown away,
+and generated again later with identical contents.
+
+Obstacles are placed by `scatter_region`: one seeded stream per region, a
+minimum-spacing (Poisson-disk) constraint so footprints never overlap or
+leave gaps narrower than MIN_GAP, and the result returned as a compact
+Layout of parallel kind/x/y arrays. NumPy is optional; without it the same
+layouts are produced in pure Python.
+
+`World.update(focus)` (called every step with the player position) loads
+the chunks around the view of an endless world and evicts the least
+recently used chunks once more than `max_chunks` are held; enemies spawn
+further out than that, so `World.ensure_loaded` loads the chunks around a
+spawn point before it is tested. Loaded objects
+are registered with the spatial grid and the obstacle bitmaps and
+unregistered on eviction. A bounded world is small (a few dozen chunks), so
+its first update loads every chunk and nothing is evicted: enemies roam the
+whole world and must never walk into scenery that has not been loaded yet.
+"""
+import math
+import random
+import struct
+from array import array
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import pygame
+import sprite_cache
+from asset_manager import load_image
+from Objects.tree import Tree
+from Objects.bush import Bush
+from spatial_grid import DynamicSpatialGrid
+from obstacle_map import ObstacleMap
+from navigation import FlowField
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Object spawn density per tile (0.0 to 1.0)
+TREE_DENSITY = 0.25
+BUSH_DENSITY = 0.20
+
+# Background tiles per chunk side
+CHUNK_TILES = 2
+# Chunks are loaded this far (world units) beyond the edges of the view
+LOAD_MARGIN = 1024
+# Chunks kept before the least recently used ones are evicted
+MAX_CHUNKS = 64
+# How far (world units) an object's footprint may reach outside its chunk
+CHUNK_OVERHANG = 256
+
+# Obstacle kinds in a Layout, and the classes they become
+KIND_TREE = 0
+KIND_BUSH = 1
+KIND_CLASSES = (Tree, Bush)
+KIND_DENSITY = (TREE_DENSITY, BUSH_DENSITY)
+# Whether a kind blocks with the bottom third of its mask (trees) or all of it
+# (bushes, which the player can't walk through), as in ObstacleMap
+KIND_PARTIAL = (True, False)
+# Clear space kept between any two footprints: a minion (90 wide) fits through
+MIN_GAP = 96
+# Positions tried per obstacle before it is dropped
+PLACEMENT_ATTEMPTS = 8
+
+# Obstacles of a region as parallel arrays: kind (KIND_*), x, y
+Layout = namedtuple("Layout", "kinds xs ys")
+# A kind's collision footprint as a circle: centre offset from the object's position, radius
+Footprint = namedtuple("Footprint", "dx dy radius")
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+# Stream values per slot: the spawn roll, then an (x, y) pair per attempt
+_STRIDE = 1 + 2 * PLACEMENT_ATTEMPTS
+
+
+def measure_footprint(cls, partial):
+    """Footprint circle of an obstacle class, measured from its sprite's mask.
+
+    The circle is centred on the bounding box of the blocking pixels (placed
+    like ObstacleMap places them) and reaches its corners, plus a pixel for
+    the whole-pixel rounding of placement. Uses the decoded image, not the
+    display-converted sprite, so worker processes measure the same.
+    """
+    try:
+        image = load_image(sprite_cache.resolve_path(cls.image_path))
+    except (pygame.error, OSError):
+        # GameObject draws a 40px placeholder circle instead
+        return Footprint(0.0, 0.0, 21.0)
+    w, h = image.get_size()
+    mask = pygame.mask.from_surface(image)
+    if partial:
+        mask = sprite_cache.get_partial_mask(mask)
+        top = h / 3
+    else:
+        top = -(h // 2)
+    rects = mask.get_bounding_rects()
+    if not rects:
+        return Footprint(0.0, 0.0, 0.0)
+    box = rects[0].unionall(rects[1:])
+    return Footprint(box.x + box.w / 2 - w // 2, top + box.y + box.h / 2, math.hypot(box.w, box.h) / 2 + 1)
+
+
+FOOTPRINTS = tuple(measure_footprint(cls, partial) for cls, partial in zip(KIND_CLASSES, KIND_PARTIAL))
+# Lookup cell of the spacing test: the largest spacing, so only adjacent cells can conflict
+_CELL = 2 * max(f.radius for f in FOOTPRINTS) + MIN_GAP
+
+
+def _mix64(z):
+    """splitmix64 finalizer."""
+    z = ((z ^ (z >> 30)) * _MIX1) & _MASK64
+    z = ((z ^ (z >> 27)) * _MIX2) & _MASK64
+    return z ^ (z >> 31)
+
+
+def region_key(cx, cy, seed_offset=0):
+    """64-bit stream key of chunk (cx, cy); the same in every process and run."""
+    key = _mix64((seed_offset + _GOLDEN) & _MASK64)
+    key = _mix64(((key ^ (cx & _MASK64)) + _GOLDEN) & _MASK64)
+    return _mix64(((key ^ (cy & _MASK64)) + _GOLDEN) & _MASK64)
+
+
+def _uniforms(key, count):
+    """The first `count` values in [0, 1) of the splitmix64 stream `key`."""
+    if np is not None:
+        z = np.arange(1, count + 1, dtype=np.uint64) * np.uint64(_GOLDEN) + np.uint64(key)
+        z ^= z >> np.uint64(30)
+        z *= np.uint64(_MIX1)
+        z ^= z >> np.uint64(27)
+        z *= np.uint64(_MIX2)
+        z ^= z >> np.uint64(31)
+        return (z >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+    return [(_mix64((key + i * _GOLDEN) & _MASK64) >> 11) * 2.0 ** -53 for i in range(1, count + 1)]
+
+
+def scatter_region(x, y, w, h, key, slots):
+    """Place obstacles in the rect (x, y, w, h) with a minimum-spacing (Poisson-disk) constraint.
+
+    Each of `slots` slots alternates between a tree and a bush and spawns with
+    that kind's density. A spawning obstacle takes the first of its
+    PLACEMENT_ATTEMPTS candidate positions that keeps MIN_GAP between its
+    footprint (see FOOTPRINTS) and every obstacle placed before it, or is
+    dropped. Footprints also stay MIN_GAP / 2 clear of the rect's edges, so
+    neighbouring regions generated independently keep the spacing too.
+    Candidates are drawn as footprint centres; the Layout holds the object
+    positions.
+
+    Every random value comes from one counter-based stream seeded by `key`
+    (see `region_key`); the NumPy and pure Python paths produce identical
+    layouts.
+    """
+    values = _uniforms(key, slots * _STRIDE)
+    if np is not None:
+        return _scatter_numpy(x, y, w, h, values, slots)
+    return _scatter_python(x, y, w, h, values, slots)
+
+
+def _scatter_numpy(x, y, w, h, values, slots):
+    values = values.reshape(slots, _STRIDE)
+    kinds = np.arange(slots, dtype=np.uint8) % 2
+    spawn = values[:, 0] < np.asarray(KIND_DENSITY)[kinds]
+    footprints = np.asarray(FOOTPRINTS, dtype=np.float64)[kinds]
+    radius = footprints[:, 2]
+    margin = radius + MIN_GAP / 2
+    xs = (x + margin)[:, None] + values[:, 1::2] * (w - 2 * margin)[:, None]
+    ys = (y + margin)[:, None] + values[:, 2::2] * (h - 2 * margin)[:, None]
+
+    placed = []
+    placed_x = np.empty(slots)
+    placed_y = np.empty(slots)
+    placed_r = np.empty(slots)
+    grid = {}
+    cells_x = (xs // _CELL).astype(np.int64).tolist()
+    cells_y = (ys // _CELL).astype(np.int64).tolist()
+    for i in np.flatnonzero(spawn).tolist():
+        cand_x, cand_y = xs[i], ys[i]
+        near = _near(grid, zip(cells_x[i], cells_y[i]))
+        if near:
+            # Every attempt against every nearby obstacle at once
+            near = np.asarray(near, dtype=np.intp)
+            dx = cand_x[:, None] - placed_x[near]
+            dy = cand_y[:, None] - placed_y[near]
+            spacing = placed_r[near] + (radius[i] + MIN_GAP)
+            ok = (dx * dx + dy * dy >= spacing * spacing).all(axis=1)
+            if not ok.any():
+                continue
+            attempt = int(ok.argmax())
+        else:
+            attempt = 0
+        n = len(placed)
+        placed_x[n] = cand_x[attempt]
+        placed_y[n] = cand_y[attempt]
+        placed_r[n] = radius[i]
+        placed.append(i)
+        grid.setdefault((cells_x[i][attempt], cells_y[i][attempt]), []).append(n)
+    placed = np.asarray(placed, dtype=np.intp)
+    n = len(placed)
+    return Layout(kinds[placed], placed_x[:n] - footprints[placed, 0], placed_y[:n] - footprints[placed, 1])
+
+
+def _scatter_python(x, y, w, h, values, slots):
+    kinds = array("B")
+    xs = array("d")
+    ys = array("d")
+    centres_x = []
+    centres_y = []
+    radii = []
+    grid = {}
+    for i in range(slots):
+        base = i * _STRIDE
+        kind = i % 2
+        if not values[base] < KIND_DENSITY[kind]:
+            continue
+        dx, dy, radius = FOOTPRINTS[kind]
+        margin = radius + MIN_GAP / 2
+        span_w = w - 2 * margin
+        span_h = h - 2 * margin
+        for attempt in range(PLACEMENT_ATTEMPTS):
+            px = x + margin + values[base + 1 + 2 * attempt] * span_w
+            py = y + margin + values[base + 2 + 2 * attempt] * span_h
+            for j in _near(grid, ((int(px // _CELL), int(py // _CELL)),)):
+                gap_x = px - centres_x[j]
+                gap_y = py - centres_y[j]
+                spacing = radii[j] + (radius + MIN_GAP)
+                if gap_x * gap_x + gap_y * gap_y < spacing * spacing:
+                    break
+            else:
+                grid.setdefault((int(px // _CELL), int(py // _CELL)), []).append(len(kinds))
+                kinds.append(kind)
+                centres_x.append(px)
+                centres_y.append(py)
+                xs.append(px - dx)
+                ys.append(py - dy)
+                radii.append(radius)
+                break
+    return Layout(kinds, xs, ys)
+
+
+def _near(grid, cells):
+    """Indices of the obstacles in `grid` within one cell of any of `cells`."""
+    near = []
+    seen = set()
+    for cx, cy in cells:
+        for ny in (cy - 1, cy, cy + 1):
+            for nx in (cx - 1, cx, cx + 1):
+                key = (nx, ny)
+                if key in seen:
+                    continue
+                seen.add(key)
+                near.extend(grid.get(key, ()))
+    return near
+
+
+def generate_chunk_layout(cx, cy, tile_size, seed_offset=0, bounds=None):
+    """Obstacle Layout of chunk (cx, cy).
+
+    Args:
+        tile_size: (width, height) of a generation tile
+        seed_offset: World seed; varies the layout
+        bounds: Optional (width, height); obstacles outside it are dropped
+    """
+    chunk_w = tile_size[0] * CHUNK_TILES
+    chunk_h = tile_size[1] * CHUNK_TILES
+    # A tree slot and a bush slot per tile, as the old per-tile rolls had
+    slots = 2 * CHUNK_TILES * CHUNK_TILES
+    layout = scatter_region(cx * chunk_w, cy * chunk_h, chunk_w, chunk_h,
+                            region_key(cx, cy, seed_offset), slots)
+    if bounds is None:
+        return layout
+    keep = [i for i in range(len(layout.kinds))
+            if 0 <= layout.xs[i] < bounds[0] and 0 <= layout.ys[i] < bounds[1]]
+    if len(keep) == len(layout.kinds):
+        return layout
+    if np is not None:
+        keep = np.asarray(keep, dtype=np.intp)
+        return Layout(layout.kinds[keep], layout.xs[keep], layout.ys[keep])
+    return Layout(array("B", (layout.kinds[i] for i in keep)), array("d", (layout.xs[i] for i in keep)),
+                  array("d", (layout.ys[i] for i in keep)))
+
+
+def layout_objects(layout):
+    """Tree and Bush objects for the entries of a Layout."""
+    return [KIND_CLASSES[kind]((x, y)) for kind, x, y in zip(layout.kinds.tolist(), layout.xs.tolist(),
+                                                               layout.ys.tolist())]
+
+
+def generate_chunk(cx, cy, tile_size, seed_offset=0, bounds=None):
+    """Generate the trees and bushes of chunk (cx, cy) (see generate_chunk_layout)."""
+    return layout_objects(generate_chunk_layout(cx, cy, tile_size, seed_offset, bounds))
+
+
+# Packed layout record: cx, cy, obstacle count; then count kind bytes, count f64 xs, count f64 ys
+_PACKED_HEADER = struct.Struct("<iiI")
+# Regions handed to each worker process (smaller regions balance better)
+REGIONS_PER_WORKER = 4
+
+
+def pack_layouts(layouts):
+    """Serialize {(cx, cy): Layout} to bytes (see unpack_layouts)."""
+    parts = []
+    for (cx, cy), layout in layouts.items():
+        parts.append(_PACKED_HEADER.pack(cx, cy, len(layout.kinds)))
+        parts.append(layout.kinds.tobytes())
+        parts.append(layout.xs.tobytes())
+        parts.append(layout.ys.tobytes())
+    return b"".join(parts)
+
+
+def unpack_layouts(data):
+    """{(cx, cy): Layout} from pack_layouts() bytes; coordinates round-trip exactly."""
+    layouts = {}
+    offset = 0
+    end = len(data)
+    while offset < end:
+        cx, cy, count = _PACKED_HEADER.unpack_from(data, offset)
+        offset += _PACKED_HEADER.size
+        kinds = data[offset:offset + count]
+        offset += count
+        xs = data[offset:offset + 8 * count]
+        offset += 8 * count
+        ys = data[offset:offset + 8 * count]
+        offset += 8 * count
+        if np is not None:
+            layouts[(cx, cy)] = Layout(np.frombuffer(kinds, dtype=np.uint8), np.frombuffer(xs, dtype=np.float64),
+                                       np.frombuffer(ys, dtype=np.float64))
+        else:
+            layout = Layout(array("B"), array("d"), array("d"))
+            layout.kinds.frombytes(kinds)
+            layout.xs.frombytes(xs)
+            layout.ys.frombytes(ys)
+            layouts[(cx, cy)] = layout
+    return layouts
+
+
+def _generate_region(args):
+    """Worker entry point: packed layouts of a list of chunks."""
+    keys, tile_size, seed_offset, bounds = args
+    return pack_layouts({key: generate_chunk_layout(key[0], key[1], tile_size, seed_offset, bounds)
+                         for key in keys})
+
+
+def generate_layouts(keys, tile_size, seed_offset=0, bounds=None, workers=0):
+    """Layouts of many chunks, optionally generated in parallel.
+
+    With `workers` > 1 the chunks are split into contiguous regions that
+    worker processes generate and send back packed (see pack_layouts).
+    Chunks only depend on their own key, so the result is identical to
+    generating them one by one.
+
+    Returns {(cx, cy): Layout}.
+    """
+    keys = list(keys)
+    if workers <= 1 or len(keys) < 2:
+        return {key: generate_chunk_layout(key[0], key[1], tile_size, seed_offset, bounds) for key in keys}
+    count = min(len(keys), workers * REGIONS_PER_WORKER)
+    size = -(-len(keys) // count)
+    regions = [(keys[i:i + size], tile_size, seed_offset, bounds) for i in range(0, len(keys), size)]
+    layouts = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for data in pool.map(_generate_region, regions):
+            layouts.update(unpack_layouts(data))
+    return layouts
+
+
+class World:
+    """Scenery generated chunk by chunk, plus placed pickups.
+
+    Keeps `objects` (everything drawn as scenery), the spatial grid used for
+    rendering and avoidance, and the ObstacleMap/FlowField used for movement
+    collision, all covering the loaded chunks: every chunk of a bounded
+    world, or those around the player in an endless one.
+    """
+
+    def __init__(self, world_size, tile_size, view_size, seed_offset=0, endless=False,
+                 max_chunks=MAX_CHUNKS):
+        """
+        Args:
+            world_size: (width, height) in world units; also the spawn area of an endless world
+            tile_size: (width, height) of a generation tile
+            view_size: (width, height) of the view; chunks covering it (plus LOAD_MARGIN) are loaded
+            seed_offset: World seed; the layout is a function of (chunk, seed_offset)
+            endless: No edges: chunks are generated in every direction
+            max_chunks: Most chunks an endless world holds before the least recently used are evicted
+        """
+        self.width, self.height = world_size
+        self.tile_size = tile_size
+        self.view_w, self.view_h = view_size
+        self.seed_offset = seed_offset
+        self.endless = endless
+        self.chunk_w = tile_size[0] * CHUNK_TILES
+        self.chunk_h = tile_size[1] * CHUNK_TILES
+        self.objects = []
+
+        self.spatial_grid = DynamicSpatialGrid(cell_size=256)
+        # Collision bitmaps for the loaded trees/bushes
+        self.obstacle_map = ObstacleMap()
+        # Distance field toward the player for routing blocked enemies
+        self.flow_field = FlowField(self.obstacle_map)
+
+        self._chunks = OrderedDict()  # (cx, cy) -> objects, least recently used first
+        self._layouts = {}  # (cx, cy) -> Layout generated ahead of time (see pregenerate)
+        self._loaded_keys = []  # chunks loaded since the last take_loaded_chunks()
+        # Bumped whenever chunks are loaded or evicted
+        self.revision = 0
+        self.chunks_generated = 0
+        self.max_chunks = max_chunks
+        self.focus = self.center_of_bounds
+
+    @property
+    def size(self):
+        """(width, height), or None for an endless world."""
+        return None if self.endless else (self.width, self.height)
+
+    @property
+    def center_of_bounds(self):
+        return pygame.Vector2(self.width / 2, self.height / 2)
+
+    @property
+    def center(self):
+        """Reference point for spawn distances: the world's middle, or the player in an endless world."""
+        return self.focus.copy() if self.endless else self.center_of_bounds
+
+    def obstacles(self):
+        """Loaded trees and bushes (the objects that block movement)."""
+        return [o for o in self.objects if isinstance(o, (Tree, Bush))]
+
+    def add_object(self, obj):
+        """Add a non-blocking object (e.g. a pickup) to the scenery."""
+        self.objects.append(obj)
+        self.spatial_grid.insert(obj)
+
+    def remove_object(self, obj):
+        """Remove an object (e.g. a picked-up pie) from the scenery."""
+        try:
+            if obj in self.objects:
+                self.objects.remove(obj)
+        except Exception:
+            pass
+        self.spatial_grid.remove(obj)
+
+    def random_point(self):
+        if self.endless:
+            # A world-sized area around the player
+            return pygame.Vector2(self.focus.x + random.randint(-self.width // 2, self.width // 2),
+                                  self.focus.y + random.randint(-self.height // 2, self.height // 2))
+        return pygame.Vector2(random.randint(0, self.width), random.randint(0, self.height))
+
+    # ------------------------------------------------------------- streaming
+
+    def _wanted_chunks(self, focus):
+        half_w = self.view_w / 2 + LOAD_MARGIN
+        half_h = self.view_h / 2 + LOAD_MARGIN
+        first_cx = int((focus.x - half_w) // self.chunk_w)
+        last_cx = int((focus.x + half_w) // self.chunk_w)
+        first_cy = int((focus.y - half_h) // self.chunk_h)
+        last_cy = int((focus.y + half_h) // self.chunk_h)
+        return [(cx, cy) for cy in range(first_cy, last_cy + 1) for cx in range(first_cx, last_cx + 1)]
+
+    def update(self, focus):
+        """Load the chunks around `focus` and evict old ones. Returns True if any changed.
+
+        A bounded world loads all of its chunks on the first call and keeps them.
+        """
+        self.focus = pygame.Vector2(focus)
+        chunks = self._chunks
+        if self.endless:
+            wanted = self._wanted_chunks(self.focus)
+        elif chunks:
+            return False
+        else:
+            wanted = self.all_chunks()
+        changed = []
+        for key in wanted:
+            if key in chunks:
+                chunks.move_to_end(key)
+            else:
+                self._load_chunk(key)
+                changed.append(key)
+        if self.endless and len(chunks) > self.max_chunks:
+            keep = set(wanted)
+            evict = [key for key in chunks if key not in keep][:len(chunks) - self.max_chunks]
+            if evict:
+                self._evict_chunks(evict)
+                changed.extend(evict)
+        return self._changed(changed)
+
+    def ensure_loaded(self, pos, margin=0):
+        """Load every chunk whose obstacles could reach within `margin` of `pos`.
+
+        Used before testing a spawn point of an endless world, which is
+        usually outside the chunks `update` keeps loaded. Returns True if any
+        chunk was loaded.
+        """
+        if not self.endless:
+            return False  # every chunk of a bounded world is already loaded
+        reach = margin + CHUNK_OVERHANG
+        first_cx = int((pos.x - reach) // self.chunk_w)
+        last_cx = int((pos.x + reach) // self.chunk_w)
+        first_cy = int((pos.y - reach) // self.chunk_h)
+        last_cy = int((pos.y + reach) // self.chunk_h)
+        loaded = []
+        for cy in range(first_cy, last_cy + 1):
+            for cx in range(first_cx, last_cx + 1):
+                if (cx, cy) in self._chunks:
+                    self._chunks.move_to_end((cx, cy))
+                else:
+                    self._load_chunk((cx, cy))
+                    loaded.append((cx, cy))
+        return self._changed(loaded)
+
+    def _changed(self, keys):
+        if not keys:
+            return False
+        self.revision += 1
+        # Only navigation cells near the changed chunks need re-testing
+        pad = CHUNK_OVERHANG
+        for key in keys:
+            x, y, w, h = self.chunk_rect(key)
+            self.flow_field.invalidate((x - pad, y - pad, w + 2 * pad, h + 2 * pad))
+        return True
+
+    def chunk_rect(self, key):
+        """(x, y, w, h) of chunk `key` in world units."""
+        return (key[0] * self.chunk_w, key[1] * self.chunk_h, self.chunk_w, self.chunk_h)
+
+    def take_loaded_chunks(self):
+        """Keys of the chunks loaded since the last call (their scenery may now cover enemies)."""
+        keys = self._loaded_keys
+        self._loaded_keys = []
+        return keys
+
+    def all_chunks(self):
+        """Keys of every chunk of a bounded world, row by row (empty for an endless world)."""
+        if self.endless:
+            return []
+        return [(cx, cy) for cy in range((self.height - 1) // self.chunk_h + 1)
+                for cx in range((self.width - 1) // self.chunk_w + 1)]
+
+    def pregenerate(self, workers=0):
+        """Generate the layout of every chunk of a bounded world up front.
+
+        Loading a chunk then only builds its objects. `workers` > 1 spreads
+        the generation over that many processes. Returns the number of
+        layouts generated.
+        """
+        keys = [key for key in self.all_chunks() if key not in self._layouts]
+        self._layouts.update(generate_layouts(keys, self.tile_size, self.seed_offset, self.size, workers))
+        return len(keys)
+
+    def _load_chunk(self, key):
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = generate_chunk_layout(key[0], key[1], self.tile_size, self.seed_offset, self.size)
+        objects = layout_objects(layout)
+        self._chunks[key] = objects
+        self._loaded_keys.append(key)
+        self.chunks_generated += 1
+        for obj in objects:
+            self.objects.append(obj)
+            self.spatial_grid.insert(obj)
+            self.obstacle_map.add(obj)
+
+    def _evict_chunks(self, keys):
+        evicted = set()
+        for key in keys:
+            for obj in self._chunks.pop(key):
+                evicted.add(id(obj))
+                self.spatial_grid.remove(obj)
+                self.obstacle_map.remove(obj)
+        self.objects[:] = [o for o in self.objects if id(o) not in evicted]
+
+    @property
+    def loaded_chunks(self):
+        return len(self._chunks)